@@ -4,8 +4,11 @@ import pytest
 pytest_plugins = [
     # Plugins
     'pytest_plugins.auto_vault',
+    'pytest_plugins.contenthost_prefetch',
     'pytest_plugins.disable_rp_params',
+    'pytest_plugins.duration_scheduling',
     'pytest_plugins.external_logging',
+    'pytest_plugins.fixture_profiler',
     'pytest_plugins.fixture_markers',
     'pytest_plugins.infra_dependent_markers',
     'pytest_plugins.issue_handlers',
@@ -14,6 +17,7 @@ pytest_plugins = [
     'pytest_plugins.marker_deselection',
     'pytest_plugins.markers',
     'pytest_plugins.metadata_markers',
+    'pytest_plugins.offline_collection',
     'pytest_plugins.settings_skip',
     'pytest_plugins.rerun_rp.rerun_rp',
     'pytest_plugins.fspath_plugins',
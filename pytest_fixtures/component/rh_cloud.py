@@ -1,6 +1,7 @@
 import pytest
 
 from robottelo.constants import CAPSULE_REGISTRATION_OPTS
+from robottelo.hosts import ContentHost
 
 
 @pytest.fixture(scope='module')
@@ -33,7 +34,8 @@ def rhcloud_registered_hosts(
     rhcloud_activation_key, rhcloud_manifest_org, mod_content_hosts, module_target_sat
 ):
     """Fixture that registers content hosts to Satellite and Insights."""
-    for vm in mod_content_hosts:
+
+    def register(vm):
         vm.configure_rhai_client(
             satellite=module_target_sat,
             activation_key=rhcloud_activation_key.name,
@@ -41,6 +43,8 @@ def rhcloud_registered_hosts(
             rhel_distro=f"rhel{vm.os_version.major}",
         )
         assert vm.subscribed
+
+    ContentHost.run_on_all(mod_content_hosts, register)
     return mod_content_hosts
 
 
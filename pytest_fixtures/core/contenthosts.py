@@ -4,13 +4,19 @@ This module is to define pytest functions for content hosts
 The functions in this module are read in the pytest_plugins/fixture_markers.py module
 All functions in this module will be treated as fixtures that apply the contenthost mark
 """
+from contextlib import contextmanager
+
 from broker import Broker
+from broker.broker import _try_teardown
 import pytest
 
 from robottelo import constants
 from robottelo.config import settings
+from robottelo.host_helpers.host_pool import HostPrefetcher
 from robottelo.hosts import ContentHost, Satellite
 
+prefetcher_key = pytest.StashKey[HostPrefetcher]()
+
 
 def host_conf(request):
     """A function that returns arguments for Broker host deployment"""
@@ -36,19 +42,57 @@ def host_conf(request):
     return conf
 
 
+def start_prefetcher(config, lookahead):
+    """Check out the content hosts of upcoming tests in the background, see
+    ``pytest_plugins/contenthost_prefetch.py``"""
+    config.stash[prefetcher_key] = HostPrefetcher(
+        checkout=lambda deploy_args: Broker(**deploy_args, host_class=ContentHost).checkout(),
+        checkin=lambda hosts: Broker(hosts=hosts).checkin(),
+        lookahead=lookahead,
+    )
+    return config.stash[prefetcher_key]
+
+
+@contextmanager
+def _single_contenthost(request):
+    """Check out a content host, or take it from the prefetcher if it checked out one already"""
+    conf = host_conf(request)
+    prefetcher = request.config.stash.get(prefetcher_key, None)
+    host = prefetcher.take(conf) if prefetcher else None
+    if host is None:
+        with Broker(**conf, host_class=ContentHost) as host:
+            yield host
+        return
+    # set up, tear down and check in the prefetched host the way the Broker context manager does
+    broker = Broker(hosts=[host])
+    try:
+        host.setup()
+    except Exception:
+        _try_teardown(host)
+        broker.checkin()
+        raise
+    try:
+        yield host
+    finally:
+        error = _try_teardown(host)
+        broker.checkin(in_context=True)
+        if error:
+            raise error
+
+
 @pytest.fixture
 def rhel_contenthost(request):
     """A function-level fixture that provides a content host object parametrized"""
     # Request should be parametrized through pytest_fixtures.fixture_markers
     # unpack params dict
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
+    with _single_contenthost(request) as host:
         yield host
 
 
 @pytest.fixture(params=[{'rhel_version': '7'}])
 def rhel7_contenthost(request):
     """A function-level fixture that provides a rhel7 content host object"""
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
+    with _single_contenthost(request) as host:
         yield host
 
 
@@ -69,7 +113,7 @@ def rhel7_contenthost_module(request):
 @pytest.fixture(params=[{'rhel_version': '8'}])
 def rhel8_contenthost(request):
     """A fixture that provides a rhel8 content host object"""
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
+    with _single_contenthost(request) as host:
         yield host
 
 
@@ -83,14 +127,14 @@ def rhel8_contenthost_module(request):
 @pytest.fixture(params=[{'rhel_version': 6}])
 def rhel6_contenthost(request):
     """A function-level fixture that provides a rhel6 content host object"""
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
+    with _single_contenthost(request) as host:
         yield host
 
 
 @pytest.fixture(params=[{'rhel_version': '9'}])
 def rhel9_contenthost(request):
     """A fixture that provides a rhel9 content host object"""
-    with Broker(**host_conf(request), host_class=ContentHost) as host:
+    with _single_contenthost(request) as host:
         yield host
 
 
@@ -114,9 +158,19 @@ def mod_content_hosts(request):
 def registered_hosts(request, target_sat, module_org, module_ak_with_cv):
     """Fixture that registers content hosts to Satellite, based on rh_cloud setup"""
     with Broker(**host_conf(request), host_class=ContentHost, _count=2) as hosts:
-        for vm in hosts:
+
+        def register(vm):
             repo = settings.repos['SATCLIENT_REPO'][f'RHEL{vm.os_version.major}']
-            vm.register(module_org, None, module_ak_with_cv.name, target_sat, repo=repo)
+            vm.register(
+                module_org,
+                None,
+                module_ak_with_cv.name,
+                target_sat,
+                repo=repo,
+                cache_command=True,
+            )
+
+        ContentHost.run_on_all(hosts, register)
         yield hosts
 
 
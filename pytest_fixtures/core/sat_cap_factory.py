@@ -6,6 +6,7 @@ import pytest
 from wait_for import wait_for
 
 from robottelo.config import configure_airgun, configure_nailgun, settings
+from robottelo.host_helpers.host_pool import HostPool
 from robottelo.hosts import (
     Capsule,
     IPAHost,
@@ -48,27 +49,116 @@ def _target_capsule_host(request, capsule_factory):
         yield
 
 
-@pytest.fixture(scope='session')
-def satellite_factory():
+def _resolve_satellite_deploy_args():
     if settings.server.get('deploy_arguments'):
         logger.debug(f'Original deploy arguments for sat: {settings.server.deploy_arguments}')
         resolved = resolve_deploy_args(settings.server.deploy_arguments)
         settings.set('server.deploy_arguments', resolved)
         logger.debug(f'Resolved deploy arguments for sat: {settings.server.deploy_arguments}')
 
-    def factory(retry_limit=3, delay=300, workflow=None, **broker_args):
-        if settings.server.deploy_arguments:
-            broker_args.update(settings.server.deploy_arguments)
-            logger.debug(f'Updated broker args for sat: {broker_args}')
 
-        vmb = Broker(
-            host_class=Satellite,
-            workflow=workflow or settings.server.deploy_workflows.product,
-            **broker_args,
+def _checkout_satellite(retry_limit=3, delay=300, workflow=None, **broker_args):
+    if settings.server.deploy_arguments:
+        broker_args.update(settings.server.deploy_arguments)
+        logger.debug(f'Updated broker args for sat: {broker_args}')
+
+    vmb = Broker(
+        host_class=Satellite,
+        workflow=workflow or settings.server.deploy_workflows.product,
+        **broker_args,
+    )
+    timeout = (1200 + delay) * retry_limit
+    sat = wait_for(vmb.checkout, timeout=timeout, delay=delay, fail_condition=[])
+    return sat.out
+
+
+def _resolve_capsule_deploy_args():
+    if settings.capsule.get('deploy_arguments'):
+        logger.debug(f'Original deploy arguments for cap: {settings.capsule.deploy_arguments}')
+        resolved = resolve_deploy_args(settings.capsule.deploy_arguments)
+        settings.set('capsule.deploy_arguments', resolved)
+        logger.debug(f'Resolved deploy arguments for cap: {settings.capsule.deploy_arguments}')
+
+
+def _checkout_capsule(retry_limit=3, delay=300, workflow=None, **broker_args):
+    if settings.capsule.deploy_arguments:
+        broker_args.update(settings.capsule.deploy_arguments)
+    vmb = Broker(
+        host_class=Capsule,
+        workflow=workflow or settings.capsule.deploy_workflows.product,
+        **broker_args,
+    )
+    timeout = (1200 + delay) * retry_limit
+    cap = wait_for(vmb.checkout, timeout=timeout, delay=delay, fail_condition=[])
+    return cap.out
+
+
+FACTORY_CHECKOUTS = {
+    'satellite_factory': (_resolve_satellite_deploy_args, _checkout_satellite),
+    'capsule_factory': (_resolve_capsule_deploy_args, _checkout_capsule),
+}
+# fixtures calling a factory with the default deployment arguments, so taking their host from
+# its pool, and whether they only do so for tests marked destructive
+POOLED_FIXTURES = {
+    'satellite_host': ('satellite_factory', False),
+    'module_satellite_host': ('satellite_factory', False),
+    'session_satellite_host': ('satellite_factory', False),
+    'parametrized_enrolled_sat': ('satellite_factory', False),
+    'target_sat': ('satellite_factory', True),
+    'class_target_sat': ('satellite_factory', True),
+    'module_target_sat': ('satellite_factory', True),
+    'session_target_sat': ('satellite_factory', True),
+    'capsule_host': ('capsule_factory', False),
+    'module_capsule_host': ('capsule_factory', False),
+    'session_capsule_host': ('capsule_factory', False),
+}
+factory_pools_key = pytest.StashKey[dict]()
+
+
+def start_factory_pools(config, demand):
+    """Start checking out the hosts the collected tests will ask the factories for
+
+    :param demand: number of hosts expected from each factory, keyed by the factory name, more
+        can be expected later with ``HostPool.expect``
+    """
+    depth = settings.performance.get('factory_pool_depth', 0)
+    pools = config.stash.setdefault(factory_pools_key, {})
+    for name, count in demand.items():
+        if not depth or name in pools:
+            continue
+        resolve, checkout = FACTORY_CHECKOUTS[name]
+        resolve()
+        logger.info(f'Checking out up to {depth} of {count} hosts for {name} in the background')
+        pools[name] = HostPool(
+            name.removesuffix('_factory'),
+            checkout=checkout,
+            checkin=lambda hosts: Broker(hosts=hosts).checkin(),
+            demand=count,
+            depth=depth,
         )
-        timeout = (1200 + delay) * retry_limit
-        sat = wait_for(vmb.checkout, timeout=timeout, delay=delay, fail_condition=[])
-        return sat.out
+
+
+def close_factory_pools(config):
+    """Check in the hosts checked out in the background which no test took"""
+    for pool in config.stash.get(factory_pools_key, {}).values():
+        pool.close()
+
+
+def _take_pooled_host(request, name, workflow, broker_args):
+    """Take a host from the pool of a factory, only for the default deployment arguments"""
+    pool = request.config.stash.get(factory_pools_key, {}).get(name)
+    if pool is None or workflow or broker_args:
+        return None
+    return pool.take()
+
+
+@pytest.fixture(scope='session')
+def satellite_factory(request):
+    _resolve_satellite_deploy_args()
+
+    def factory(retry_limit=3, delay=300, workflow=None, **broker_args):
+        sat = _take_pooled_host(request, 'satellite_factory', workflow, broker_args)
+        return sat or _checkout_satellite(retry_limit, delay, workflow, **broker_args)
 
     return factory
 
@@ -83,24 +173,12 @@ def large_capsule_host(capsule_factory):
 
 
 @pytest.fixture(scope='session')
-def capsule_factory():
-    if settings.capsule.get('deploy_arguments'):
-        logger.debug(f'Original deploy arguments for cap: {settings.capsule.deploy_arguments}')
-        resolved = resolve_deploy_args(settings.capsule.deploy_arguments)
-        settings.set('capsule.deploy_arguments', resolved)
-        logger.debug(f'Resolved deploy arguments for cap: {settings.capsule.deploy_arguments}')
+def capsule_factory(request):
+    _resolve_capsule_deploy_args()
 
     def factory(retry_limit=3, delay=300, workflow=None, **broker_args):
-        if settings.capsule.deploy_arguments:
-            broker_args.update(settings.capsule.deploy_arguments)
-        vmb = Broker(
-            host_class=Capsule,
-            workflow=workflow or settings.capsule.deploy_workflows.product,
-            **broker_args,
-        )
-        timeout = (1200 + delay) * retry_limit
-        cap = wait_for(vmb.checkout, timeout=timeout, delay=delay, fail_condition=[])
-        return cap.out
+        cap = _take_pooled_host(request, 'capsule_factory', workflow, broker_args)
+        return cap or _checkout_capsule(retry_limit, delay, workflow, **broker_args)
 
     return factory
 
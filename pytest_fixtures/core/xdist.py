@@ -7,6 +7,7 @@ import pytest
 from robottelo.config import configure_airgun, configure_nailgun, settings
 from robottelo.hosts import Satellite
 from robottelo.logging import logger
+from robottelo.utils.satellite_ledger import get_ledger, latency_tracker
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -37,6 +38,10 @@ def align_to_satellite(request, worker_id, satellite_factory):
         # attempt to align a worker to a satellite
         if settings.server.xdist_behavior == 'run-on-one' and settings.server.hostnames:
             settings.set("server.hostname", settings.server.hostnames[0])
+        elif settings.server.xdist_behavior == 'least-loaded' and settings.server.hostnames:
+            settings.set(
+                "server.hostname", get_ledger().assign(worker_id, settings.server.hostnames)
+            )
         elif settings.server.hostnames and worker_pos < len(settings.server.hostnames):
             settings.set("server.hostname", settings.server.hostnames[worker_pos])
         elif settings.server.xdist_behavior == 'balance' and settings.server.hostnames:
@@ -56,6 +61,17 @@ def align_to_satellite(request, worker_id, satellite_factory):
             configure_airgun()
             configure_nailgun()
         yield
+        if settings.server.xdist_behavior == 'least-loaded':
+            get_ledger().release(worker_id)
         if on_demand_sat and settings.server.auto_checkin:
             on_demand_sat.teardown()
             Broker(hosts=[on_demand_sat]).checkin()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def report_satellite_latency():
+    """Record the hammer latency of the Satellite of this worker in the ledger, for the
+    least-loaded assignment of the workers of the next runs"""
+    if settings.server.xdist_behavior == 'least-loaded' and settings.server.hostname:
+        hostname = settings.server.hostname
+        get_ledger().report_latency(hostname, latency_tracker.median(hostname))
@@ -0,0 +1,109 @@
+"""Check out the content hosts of upcoming tests while the current test runs.
+
+Enabled by ``settings.performance.contenthost_prefetch``, the number of upcoming tests looked at.
+Before each test, the content hosts needed by the next tests using ``rhel_contenthost`` or one of
+the ``rhelX_contenthost`` fixtures are checked out in the background, so the fixtures of those
+tests find them ready.
+"""
+from bisect import bisect_left
+from collections import Counter
+from operator import itemgetter
+from types import SimpleNamespace
+
+import pytest
+
+from robottelo.logging import collection_logger as logger
+
+PREFETCH_FIXTURES = (
+    'rhel_contenthost',
+    'rhel6_contenthost',
+    'rhel7_contenthost',
+    'rhel8_contenthost',
+    'rhel9_contenthost',
+)
+
+
+def item_deploy_args(item):
+    """Broker deployment arguments of the content host the item will ask for, None if it asks
+    for no content host the prefetcher handles"""
+    from pytest_fixtures.core.contenthosts import host_conf
+
+    name = next((name for name in PREFETCH_FIXTURES if name in item.fixturenames), None)
+    if name is None:
+        return None
+    # the part of a fixture request host_conf looks at
+    request = SimpleNamespace(config=item.config, node=item)
+    params = getattr(item, 'callspec', None) and item.callspec.params
+    if params and name in params:
+        request.param = params[name]
+    try:
+        return host_conf(request)
+    except AttributeError:
+        # no content host settings for this RHEL version, the fixture will report it
+        return None
+
+
+# (index, nodeid, deploy arguments) of the collected items needing a content host, in order
+_needs_key = pytest.StashKey[list]()
+_item_index_key = pytest.StashKey[dict]()
+_expected_key = pytest.StashKey[set]()
+
+
+def _upcoming(session, item, nextitem, lookahead):
+    """``(nodeid, deploy arguments)`` of the next ``lookahead`` items needing a content host
+    which this process will run, starting with ``item``
+
+    Under xdist a worker only knows the next item it was given, so it looks one test ahead.
+    """
+    if hasattr(session.config, 'workerinput'):
+        items = [item, nextitem] if nextitem else [item]
+        upcoming = [(it.nodeid, args) for it in items if (args := item_deploy_args(it)) is not None]
+        return upcoming[:lookahead]
+    needs = session.stash[_needs_key]
+    start = bisect_left(needs, session.stash[_item_index_key][item.nodeid], key=itemgetter(0))
+    return [(nodeid, args) for _, nodeid, args in needs[start : start + lookahead]]
+
+
+def pytest_collection_finish(session):
+    from pytest_fixtures.core.contenthosts import start_prefetcher
+    from robottelo.config import settings
+    from robottelo.utils.offline import is_offline
+
+    lookahead = settings.performance.get('contenthost_prefetch', 0)
+    if not lookahead or session.config.option.collectonly or is_offline():
+        return
+    needs = [
+        (index, item.nodeid, deploy_args)
+        for index, item in enumerate(session.items)
+        if (deploy_args := item_deploy_args(item)) is not None
+    ]
+    demand = Counter(str(deploy_args) for _, _, deploy_args in needs)
+    logger.info(f'Content hosts needed by the collected tests: {dict(demand)}')
+    session.stash[_needs_key] = needs
+    session.stash[_item_index_key] = {item.nodeid: i for i, item in enumerate(session.items)}
+    session.stash[_expected_key] = set()
+    start_prefetcher(session.config, lookahead)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Expect the content hosts of the next ``lookahead`` tests needing one"""
+    from pytest_fixtures.core.contenthosts import prefetcher_key
+
+    prefetcher = item.config.stash.get(prefetcher_key, None)
+    if prefetcher is None:
+        return
+    session = item.session
+    expected = session.stash[_expected_key]
+    for nodeid, deploy_args in _upcoming(session, item, nextitem, prefetcher.lookahead):
+        if nodeid not in expected:
+            expected.add(nodeid)
+            prefetcher.expect(deploy_args)
+
+
+def pytest_sessionfinish(session):
+    """Check in the prefetched content hosts no test took"""
+    from pytest_fixtures.core.contenthosts import prefetcher_key
+
+    if (prefetcher := session.config.stash.get(prefetcher_key, None)) is not None:
+        prefetcher.close()
@@ -0,0 +1,95 @@
+"""Record test durations and distribute modules to xdist workers longest first.
+
+``--timings-db=PATH`` keeps the setup, call and teardown durations of every test and the cost of
+module-scoped fixtures in a SQLite file. With ``--dist-by-duration`` as well, xdist hands whole
+modules to workers, so module-scoped fixtures are set up once, starting with the modules
+estimated to take longest. Every worker which runs out of work takes the longest module left,
+which is the longest-processing-time-first heuristic for a short makespan.
+"""
+from collections import OrderedDict
+
+import pytest
+from xdist.scheduler import LoadFileScheduling
+
+from robottelo.logging import logger
+from robottelo.utils.timings import TimingDB, TimingRecorder
+
+
+class _TimingReports:
+    """Hands the test reports over to a :class:`TimingRecorder`"""
+
+    def __init__(self, recorder):
+        self.recorder = recorder
+
+    def pytest_runtest_logreport(self, report):
+        # the xdist controller sets the worker a report comes from on the reports it receives
+        self.recorder.add_report(report, worker=getattr(report, 'node', None))
+
+
+def pytest_addoption(parser):
+    """Add options recording test durations and scheduling xdist workers by duration"""
+    parser.addoption(
+        '--timings-db',
+        default=None,
+        help='''
+        SQLite file to record the durations of the tests in, created when missing.
+
+        Usage: --timings-db=test_timings.db
+        ''',
+    )
+    parser.addoption(
+        '--dist-by-duration',
+        action='store_true',
+        default=False,
+        help='''
+        Send whole modules to the xdist workers, longest first, as estimated from the durations
+        recorded in --timings-db.
+
+        Usage: -n 8 --timings-db=test_timings.db --dist-by-duration
+        ''',
+    )
+
+
+def pytest_configure(config):
+    if path := config.getoption('timings_db'):
+        # only the process running the tests or the xdist controller, which receives the reports
+        # of all workers, writes to the database
+        if not hasattr(config, 'workerinput'):
+            # module fixture costs can only be told apart when a module runs on a single worker
+            dist = config.getoption('dist', 'no')
+            module_costs = config.getoption('dist_by_duration') or dist in ('no', 'loadfile')
+            config.pluginmanager.register(
+                _TimingReports(TimingRecorder(TimingDB(path), module_costs=module_costs)),
+                'robottelo_timings',
+            )
+    elif config.getoption('dist_by_duration'):
+        raise pytest.UsageError('--dist-by-duration needs --timings-db')
+
+
+class DurationScheduling(LoadFileScheduling):
+    """Load scheduling by module, handing out the longest modules first"""
+
+    def __init__(self, config, log=None, db=None):
+        super().__init__(config, log)
+        self.db = db
+        self._ordered = False
+
+    def _assign_work_unit(self, node):
+        if not self._ordered:
+            self._ordered = True
+            estimates = self.db.estimate_modules(self.collection)
+            self.workqueue = OrderedDict(
+                sorted(self.workqueue.items(), key=lambda unit: -estimates[unit[0]])
+            )
+            logger.info(
+                f'Scheduling {len(estimates)} modules, estimated to take '
+                f'{sum(estimates.values()):.0f}s, longest first'
+            )
+        super()._assign_work_unit(node)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_xdist_make_scheduler(config, log):
+    if config.getoption('dist_by_duration'):
+        return DurationScheduling(config, log, db=TimingDB(config.getoption('timings_db')))
+    return None
@@ -1,5 +1,12 @@
+from collections import Counter
 from inspect import getmembers, isfunction
 
+import pytest
+
+# nodes pytest keeps a fixture of each scope for, between function and session
+SCOPE_NODES = {'class': pytest.Class, 'module': pytest.Module, 'package': pytest.Package}
+_expected_key = pytest.StashKey[set]()
+
 
 def pytest_configure(config):
     """Register markers related to testimony tokens"""
@@ -18,3 +25,81 @@ def pytest_collection_modifyitems(session, items, config):
         has_factoryfixture = set(itemfixtures).intersection(set(factory_fixture_names))
         if has_factoryfixture:
             item.add_marker('factory_instance')
+
+
+def factory_instances(item):
+    """Instances of the pooled factory fixtures ``item`` uses, as ``(factory, instance)`` pairs
+
+    A module or session scoped fixture is one instance for all the tests of its module or of the
+    session, and the target_sat fixtures only take a host from a factory for destructive tests.
+    """
+    from pytest_fixtures.core.sat_cap_factory import POOLED_FIXTURES
+
+    callspec = getattr(item, 'callspec', None)
+    instances = set()
+    for name in item.fixturenames:
+        if name not in POOLED_FIXTURES:
+            continue
+        factory, destructive_only = POOLED_FIXTURES[name]
+        scope = item._fixtureinfo.name2fixturedefs[name][-1].scope
+        if scope == 'function':
+            node = item
+        elif scope == 'session':
+            node = item.session
+        else:
+            node = item.getparent(SCOPE_NODES[scope]) or item.getparent(pytest.Module)
+        if destructive_only and not node.get_closest_marker('destructive'):
+            continue
+        param = callspec.params.get(name) if callspec else None
+        instances.add((factory, (node.nodeid, name, repr(param))))
+    return instances
+
+
+def pytest_collection_finish(session):
+    """Start checking out the Satellites and Capsules the selected tests will need
+
+    Only when ``settings.performance.factory_pool_depth`` is set, the tests actually run and
+    the factories deploy hosts for this selection. An xdist worker does not know which of the
+    collected tests it will run, so it expects the hosts of each test as it reaches it.
+    """
+    from pytest_fixtures.core import sat_cap_factory
+    from robottelo.config import settings
+    from robottelo.utils.offline import is_offline
+
+    config = session.config
+    if (
+        not settings.performance.get('factory_pool_depth', 0)
+        or config.option.collectonly
+        or is_offline()
+        or 'sanity' in config.option.markexpr
+    ):
+        return
+    instances = set().union(*map(factory_instances, session.items))
+    if hasattr(config, 'workerinput'):
+        demand = dict.fromkeys({factory for factory, _ in instances}, 0)
+    else:
+        demand = Counter(factory for factory, _ in instances)
+    session.stash[_expected_key] = set()
+    sat_cap_factory.start_factory_pools(config, demand)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """On an xdist worker, expect the factory hosts of this test and of the next one"""
+    from pytest_fixtures.core.sat_cap_factory import factory_pools_key
+
+    pools = item.config.stash.get(factory_pools_key, None)
+    if not pools or not hasattr(item.config, 'workerinput'):
+        return
+    expected = item.session.stash[_expected_key]
+    for upcoming in filter(None, (item, nextitem)):
+        for factory, instance in factory_instances(upcoming) - expected:
+            expected.add((factory, instance))
+            pools[factory].expect()
+
+
+def pytest_sessionfinish(session):
+    """Check in the pre-provisioned hosts no test took"""
+    from pytest_fixtures.core import sat_cap_factory
+
+    sat_cap_factory.close_factory_pools(session.config)
@@ -0,0 +1,131 @@
+"""Time the setup and teardown of every fixture and report them by fixture dependency tree.
+
+``--fixture-profile=PATH`` writes a json report of the fixture durations to PATH, with the tests
+each fixture setup and teardown is attributed to, and the fixture dependency tree as collapsed
+stacks to PATH with the ``.folded`` suffix, for flamegraph tools. xdist workers send their
+measurements to the controller, which writes the merged report.
+"""
+import functools
+import time
+
+import pytest
+
+from robottelo.logging import logger
+from robottelo.utils.fixture_profile import FixtureProfile, execution
+
+WORKEROUTPUT_KEY = 'fixture_profile'
+
+
+def _stack(item, argname):
+    """Dependency chain from a fixture ``item`` requests down to the fixture ``argname``
+
+    pytest sets up the fixtures of wider scopes first, so the chain is found in the fixture
+    closure of the test rather than in the order the fixtures are set up.
+    """
+    info = item._fixtureinfo
+    seen = set()
+
+    def chain(name):
+        if name == argname:
+            return [name]
+        if name in seen or not info.name2fixturedefs.get(name):
+            return None
+        seen.add(name)
+        for dependency in info.name2fixturedefs[name][-1].argnames:
+            if found := chain(dependency):
+                return [name, *found]
+        return None
+
+    for name in info.initialnames:
+        if found := chain(name):
+            return found
+    # requested dynamically, with request.getfixturevalue
+    return [argname]
+
+
+class _FixtureProfiler:
+    """Times fixtures through the fixture setup and finalizer hooks"""
+
+    def __init__(self, worker=None):
+        self.worker = worker
+        self.profile = FixtureProfile()
+        self._item = None
+        # fixture definition -> its running execution and the start of its teardown
+        self._running = {}
+        self._teardown_started = {}
+
+    def _start_teardown(self, fixturedef):
+        # added as the last finalizer of the fixture at setup, so it runs first on teardown
+        self._teardown_started[fixturedef] = time.perf_counter()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self._item = item
+        yield
+        self._item = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        run = execution(
+            fixture=fixturedef.argname,
+            scope=fixturedef.scope,
+            location=getattr(fixturedef.func, '__module__', None),
+            stack=_stack(request._pyfuncitem, fixturedef.argname),
+            test=request._pyfuncitem.nodeid,
+            worker=self.worker,
+        )
+        started = time.perf_counter()
+        yield
+        run['setup'] = time.perf_counter() - started
+        self.profile.add(run)
+        self._running[fixturedef] = run
+        fixturedef.addfinalizer(functools.partial(self._start_teardown, fixturedef))
+
+    def pytest_fixture_post_finalizer(self, fixturedef, request):
+        started = self._teardown_started.pop(fixturedef, None)
+        run = self._running.pop(fixturedef, None)
+        if started is None or run is None:
+            return
+        run['teardown'] = time.perf_counter() - started
+        run['teardown_test'] = self._item.nodeid if self._item else None
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        self.profile.merge(getattr(node, 'workeroutput', {}).get(WORKEROUTPUT_KEY, []))
+
+
+def pytest_addoption(parser):
+    """Add an option profiling the fixtures"""
+    parser.addoption(
+        '--fixture-profile',
+        default=None,
+        help='''
+        Write the setup and teardown durations of every fixture to a json file, and the
+        fixture dependency tree as collapsed stacks to the same path with the .folded suffix.
+
+        Usage: --fixture-profile=fixture_profile.json
+        ''',
+    )
+
+
+def pytest_configure(config):
+    if config.getoption('fixture_profile'):
+        worker = config.workerinput['workerid'] if hasattr(config, 'workerinput') else None
+        config.pluginmanager.register(_FixtureProfiler(worker), 'robottelo_fixture_profiler')
+
+
+def pytest_sessionfinish(session):
+    profiler = session.config.pluginmanager.get_plugin('robottelo_fixture_profiler')
+    if profiler is None:
+        return
+    if hasattr(session.config, 'workerinput'):
+        # xdist sends the worker output to the controller once the worker session finishes
+        session.config.workeroutput[WORKEROUTPUT_KEY] = profiler.profile.executions
+        return
+    report, folded = profiler.profile.write(session.config.getoption('fixture_profile'))
+    logger.info(f'Fixture profile written to {report} and {folded}')
+    for fixture in profiler.profile.fixtures()[:10]:
+        logger.info(
+            f'{fixture["scope"]} fixture {fixture["fixture"]}: {fixture["setup"]:.1f}s setup, '
+            f'{fixture["teardown"]:.1f}s teardown over {fixture["executions"]} executions'
+        )
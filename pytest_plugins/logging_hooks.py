@@ -12,6 +12,7 @@ from robottelo.logging import (
     robottelo_log_dir,
     robottelo_log_file,
 )
+from robottelo.utils import session_pool
 
 try:
     from pytest_reportportal import RPLogger, RPLogHandler
@@ -78,3 +79,16 @@ def pytest_runtest_logreport(report):
     """Process the TestReport produced for each of the setup,
     call and teardown runtest phases of an item."""
     logger.info('Finished %s for test: %s, result: %s', report.when, report.nodeid, report.outcome)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Log how many connections the pooled nailgun sessions of this process opened and reused"""
+    if session_pool.enabled():
+        for host, metrics in session_pool.get_pool().metrics().items():
+            logger.info(
+                'nailgun session for %s: %s requests, %s connections opened, %s reused',
+                host,
+                metrics['requests'],
+                metrics['opened'],
+                metrics['reused'],
+            )
@@ -20,6 +20,12 @@ def pytest_addoption(parser):
                     '''
         parser.addoption(opt, action='store_true', default=False, help=help_text)
 
+    help_text = '''Include the benchmark tests, which compare timings and are slow
+
+        Usage: `pytest tests/robottelo --include-benchmarks`
+        '''
+    parser.addoption('--include-benchmarks', action='store_true', default=False, help=help_text)
+
     option = '--include-non-satci-tests'
     help_text = f'''Include auto uncollected non SatCI tests
 
@@ -37,6 +43,7 @@ def pytest_collection_modifyitems(items, config):
     include_libvirt = config.getoption('include_libvirt', False)
     include_eauth = config.getoption('include_external_auth', False)
     include_vlan = config.getoption('include_vlan_networking', False)
+    include_benchmarks = config.getoption('include_benchmarks', False)
     include_non_satci_tests = config.getvalue('include_non_satci_tests').split(',')
 
     selected = []
@@ -71,6 +78,10 @@ def pytest_collection_modifyitems(items, config):
         if 'vlan_networking' in item_marks:
             selected.append(item) if include_vlan else deselected.append(item)
             continue
+        # Include / Exclude the timing benchmarks of the robottelo unit tests
+        if 'benchmark' in item_marks:
+            selected.append(item) if include_benchmarks else deselected.append(item)
+            continue
         # This Plugin does not applies to this test
         selected.append(item)
     logger.debug(
@@ -24,6 +24,7 @@ def pytest_configure(config):
         "no_containers: Disable container hosts from being used in favor of VMs",
         "include_capsule: For satellite-maintain tests to run on Satellite and Capsule both",
         "capsule_only: For satellite-maintain tests to run only on Capsules",
+        "benchmark: Timing comparisons, collected only with --include-benchmarks",
     ]
     markers.extend(module_markers())
     for marker in markers:
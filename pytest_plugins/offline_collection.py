@@ -0,0 +1,30 @@
+import pytest
+
+from robottelo.logging import collection_logger as logger
+from robottelo.utils.offline import offline
+
+
+def pytest_addoption(parser):
+    """Add --offline-collection to collect tests without connecting to any host"""
+    help_text = '''
+        Collect tests without connecting to the Satellite or any other host.
+
+        Satellite and RHEL versions needed during collection come from the shared version
+        cache (see PERFORMANCE.VERSION_CACHE) or from the settings, and any attempt to open a
+        network or ssh connection while collecting fails immediately.
+        Combine with --bz-cache when tests are marked with skip_if_open.
+
+        Usage: --offline-collection
+    '''
+    parser.addoption('--offline-collection', action='store_true', default=False, help=help_text)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection(session):
+    """Forbid network and ssh I/O for the whole collection, including modifyitems hooks"""
+    if not session.config.getoption('offline_collection', False):
+        yield
+        return
+    logger.info('Collecting tests offline')
+    with offline(reason='while collecting tests with --offline-collection'):
+        yield
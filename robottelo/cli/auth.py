@@ -11,7 +11,21 @@ Subcommands::
     logout                        Wipe your credentials
     status                        Information about current connections
 """
+import hashlib
+import shlex
+import threading
+
+from robottelo import ssh
 from robottelo.cli.base import Base
+from robottelo.logging import logger
+
+# stderr messages telling a hammer session can't be used anymore
+SESSION_ERRORS = (
+    'Session has expired',
+    'Invalid username or password',
+    'Unable to authenticate user',
+    'Missing credentials',
+)
 
 
 class Auth(Base):
@@ -60,3 +74,101 @@ class AuthLogin(Base):
         """Kerberos ticket based auth"""
         cls.command_sub = 'negotiate'
         return cls.execute(cls._construct_command(options), output_format='csv')
+
+
+class HammerSessions:
+    """Cache of hammer session logins, one per Satellite hostname and user
+
+    Each user gets its own hammer home directory on the Satellite, so sessions of different users
+    don't overwrite each other in ``~/.hammer/sessions``. The user's regular hammer configuration
+    is linked into that directory and sessions are turned on by an extra config file passed with
+    ``-c``, leaving the default hammer configuration untouched.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._user_locks = {}  # (hostname, username) -> lock held while that user logs in
+        self._logins = {}  # (hostname, username) -> password used to log in
+        self._homes = {}  # hostname -> absolute path of the session homes root
+
+    @staticmethod
+    def enabled():
+        """Whether hammer commands should authenticate through cached sessions"""
+        from robottelo.config import settings
+
+        return bool(settings.performance.get('hammer_sessions', False))
+
+    @staticmethod
+    def supports(cls):
+        """Whether commands of the given cli class may use a cached session
+
+        Credentials are never cached for classes omitting them, and ``hammer auth`` commands
+        manage sessions themselves.
+        """
+        return not cls.omitting_credentials and not (cls.command_base or '').startswith('auth')
+
+    def _root(self, hostname):
+        if hostname not in self._homes:
+            result = ssh.command('echo "$HOME/.robottelo-hammer"', hostname=hostname)
+            self._homes[hostname] = result.stdout.strip()
+        return self._homes[hostname]
+
+    def _home(self, hostname, username):
+        return f'{self._root(hostname)}/{hashlib.sha256(username.encode()).hexdigest()[:16]}'
+
+    def _user_lock(self, key):
+        with self._lock:
+            return self._user_locks.setdefault(key, threading.Lock())
+
+    def options(self, hostname, username, password):
+        """Log in if needed and return what a hammer command needs to reuse the session
+
+        :return: tuple of environment variables and hammer global options, or None when the
+            login failed and credentials have to be passed with every command
+        """
+        key = (hostname, username)
+        # logins of other users and Satellites don't wait for this one
+        with self._user_lock(key):
+            home = self._home(hostname, username)
+            if self._logins.get(key) != password:
+                if key in self._logins:
+                    logger.debug(f'Password of {username} changed, logging in to hammer again')
+                if not self._login(hostname, username, password, home):
+                    self._logins.pop(key, None)
+                    return None
+                self._logins[key] = password
+        return {'HOME': home}, f'-c {home}/sessions.yml'
+
+    def _login(self, hostname, username, password, home):
+        setup = (
+            f'mkdir -p {home}/.hammer && chmod 700 {home} && '
+            f'ln -sfn "$HOME/.hammer/cli.modules.d" {home}/.hammer/cli.modules.d && '
+            f'ln -sf "$HOME/.hammer/cli_config.yml" {home}/.hammer/cli_config.yml && '
+            f'printf \':foreman:\\n  :use_sessions: true\\n\' > {home}/sessions.yml'
+        )
+        login = (
+            f'HOME={home} hammer -c {home}/sessions.yml auth login basic '
+            f'--username={shlex.quote(username)} --password={shlex.quote(password)}'
+        )
+        result = ssh.command(f'{setup} && {login}', hostname=hostname)
+        if result.status != 0:
+            logger.warning(
+                f'Hammer session login of {username} on {hostname} failed, '
+                f'passing credentials instead:\n{result.stderr}'
+            )
+            return False
+        return True
+
+    def invalidate(self, hostname, username=None):
+        """Forget cached sessions on a Satellite, of all users unless one is given"""
+        with self._lock:
+            for key in list(self._logins):
+                if key[0] == hostname and username in (None, key[1]):
+                    del self._logins[key]
+
+    def is_session_error(self, stderr):
+        """Whether a failed command was caused by an unusable session"""
+        return any(error in str(stderr) for error in SESSION_ERRORS)
+
+
+sessions = HammerSessions()
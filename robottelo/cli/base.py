@@ -1,17 +1,117 @@
 """Generic base class for cli hammer commands."""
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import inspect
 import re
+import time
+from types import MappingProxyType
+import weakref
 
 from wait_for import wait_for
 
 from robottelo import ssh
-from robottelo.cli import hammer
+from robottelo.cli import hammer, hammer_cache, hammer_shell
 from robottelo.config import settings
-from robottelo.exceptions import CLIDataBaseError, CLIError, CLIReturnCodeError
+from robottelo.exceptions import (
+    CLIBaseError,
+    CLIDataBaseError,
+    CLIError,
+    CLIReturnCodeError,
+)
 from robottelo.logging import logger
-from robottelo.utils.ssh import get_client
+from robottelo.utils.satellite_ledger import latency_tracker
 
+# values of the per-call command attributes, by class and attribute name. The classes are weak
+# keys, so the with_user wrappers and the per-host subclasses are not kept alive by the state.
+_command_state = contextvars.ContextVar(
+    'hammer_command_state', default=MappingProxyType(weakref.WeakKeyDictionary())
+)
 
-class Base:
+
+class _CommandAttribute:
+    """Class attribute whose assignments are only visible to the current thread or task
+
+    Entities set ``cls.command_sub`` right before building and running a command, some switch
+    ``cls.command_base`` or ``cls.command_requires_org`` for a single call too. Keeping the
+    assigned value in a context variable stops threads and asyncio tasks sharing an entity class
+    from running each other's commands. Values defined in a class body act as defaults.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, cls, owner=None):
+        state = _command_state.get()
+        for klass in cls.__mro__:
+            values = state.get(klass)
+            if values and self.name in values:
+                return values[self.name]
+            if self.name in vars(klass):
+                return vars(klass)[self.name]
+        return None
+
+    def __set__(self, cls, value):
+        state = _command_state.get()
+        values = state.get(cls, {})
+        if self.name in values and values[self.name] is value:
+            # entities set the same values on every call, keep the state as it is
+            return
+        state = weakref.WeakKeyDictionary(state)
+        state[cls] = MappingProxyType({**values, self.name: value})
+        _command_state.set(MappingProxyType(state))
+
+
+class _BaseMeta(type):
+    """Metaclass making the per-call command attributes of every entity context local"""
+
+    command_base = _CommandAttribute()
+    command_sub = _CommandAttribute()
+    command_end = _CommandAttribute()
+    command_requires_org = _CommandAttribute()
+
+
+class HammerCommand(str):
+    """Immutable hammer command line, built for a single call
+
+    Behaves as the command string and keeps the parts it was built from, which are therefore
+    not affected by later changes of the entity class attributes.
+    """
+
+    def __new__(cls, command_base=None, command_sub=None, options=None, command_end=None):
+        tail = ''
+        options = dict(options or {})
+        for key, val in options.items():
+            if val is None:
+                continue
+            if val is True:
+                tail += f' --{key}'
+            elif val is not False:
+                if isinstance(val, list):
+                    val = ','.join(str(el) for el in val)
+                tail += f' --{key}="{val}"'
+        command = super().__new__(
+            cls, f"{command_base or ''} {command_sub or ''} {tail.strip()} {command_end or ''}"
+        )
+        object.__setattr__(command, 'command_base', command_base)
+        object.__setattr__(command, 'command_sub', command_sub)
+        object.__setattr__(command, 'options', MappingProxyType(options))
+        object.__setattr__(command, 'command_end', command_end)
+        return command
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        return (
+            type(self),
+            (self.command_base, self.command_sub, dict(self.options), self.command_end),
+        )
+
+
+class Base(metaclass=_BaseMeta):
     """Base class for hammer CLI interaction
 
     See Subcommands section in `hammer --help` output on your Satellite.
@@ -22,6 +122,7 @@ class Base:
     command_sub = None  # specific to instance, like: create, update, etc.
     command_end = None  # extending commands like for directory to pass
     command_requires_org = False  # True when command requires organization-id
+    create_fields = None  # fields of a create response making the info call unnecessary
     hostname = None  # Now used for Satellite class hammer execution
     logger = logger
     _db_error_regex = re.compile(r'.*INSERT INTO|.*SELECT .*FROM|.*violates foreign key')
@@ -82,9 +183,14 @@ class Base:
         return cls.execute(cls._construct_command(options))
 
     @classmethod
-    def create(cls, options=None, timeout=None):
+    def create(cls, options=None, timeout=None, fields=None):
         """
         Creates a new record using the arguments passed via dictionary.
+
+        When ``settings.performance.hammer_json_create`` is enabled, hammer is asked for JSON
+        output and the create response is returned as the record if it contains every one of
+        ``fields`` (``cls.create_fields`` by default). The record is fetched with ``info``
+        otherwise.
         """
 
         cls.command_sub = 'create'
@@ -92,12 +198,24 @@ class Base:
         if options is None:
             options = {}
 
-        result = cls.execute(cls._construct_command(options), output_format='csv', timeout=timeout)
+        json_create = settings.performance.get('hammer_json_create', False)
+        result = cls.execute(
+            cls._construct_command(options),
+            output_format='json' if json_create else 'csv',
+            timeout=timeout,
+        )
+        if json_create:
+            result = [result] if isinstance(result, dict) else result or []
 
         # Extract new object ID if it was successfully created
         if len(result) > 0 and 'id' in result[0]:
             obj_id = result[0]['id']
 
+            fields = cls.create_fields if fields is None else fields
+            if json_create and fields and all(field in result[0] for field in fields):
+                # the create response already has everything the caller needs
+                return result[0]
+
             # Fetch new object
             # Some Katello obj require the organization-id for subcommands
             info_options = {'id': obj_id}
@@ -192,34 +310,156 @@ class Base:
             user, password = None, None
         else:
             user, password = cls._get_username_password(user, password)
-        time_hammer = settings.performance.time_hammer
-
-        # add time to measure hammer performance
-        cmd = 'LANG={} {} hammer -v {} {} {} {}'.format(
-            settings.robottelo.locale,
-            'time -p' if time_hammer else '',
+        # auth imports Base, so it can't be imported at module level
+        from robottelo.cli.auth import sessions
+
+        hostname = hostname or cls.hostname or settings.server.hostname
+        cache, cache_key = None, None
+        if isinstance(command, HammerCommand) and hammer_cache.enabled():
+            cache = hammer_cache.get_cache()
+            cache_key = cache.key(hostname, command, user=user, output_format=output_format)
+            if cache_key is None:
+                cache.invalidate(hostname, command.command_base)
+            elif not return_raw_response:
+                try:
+                    return cache.get(cache_key)
+                except KeyError:
+                    pass
+        env = {'LANG': settings.robottelo.locale}
+        credentials = (
             f'-u {user}' if user else "--interactive no",
             f'-p {password}' if password else "",
+        )
+        session = None
+        started = time.monotonic()
+        if user and password and sessions.enabled() and sessions.supports(cls):
+            session = sessions.options(hostname, user, password)
+        if session:
+            session_env, session_options = session
+            response = cls._run_hammer(
+                command,
+                hostname,
+                {**env, **session_env},
+                (session_options, ''),
+                output_format=output_format,
+                timeout=timeout,
+                user=user,
+            )
+            if response.status != 0 and sessions.is_session_error(response.stderr):
+                # the session expired or was revoked on the server, log in again next time
+                sessions.invalidate(hostname, user)
+                session = None
+        if not session:
+            response = cls._run_hammer(
+                command,
+                hostname,
+                env,
+                credentials,
+                output_format=output_format,
+                timeout=timeout,
+                user=user,
+            )
+        latency_tracker.record(hostname, time.monotonic() - started)
+        if cache is not None and cache_key is None:
+            # also drop what concurrent calls read while the command was running
+            cache.invalidate(hostname, command.command_base)
+        if return_raw_response:
+            return response
+        result = cls._handle_response(response, ignore_stderr=ignore_stderr)
+        if cache_key is not None:
+            cache.set(cache_key, result)
+        return result
+
+    @classmethod
+    def _run_hammer(
+        cls, command, hostname, env, credentials, output_format=None, timeout=None, user=None
+    ):
+        """Run hammer with the given environment and credential options on ``hostname``
+
+        ``user`` is the user the credential options authenticate, persistent hammer drivers are
+        not shared between users.
+        """
+        time_hammer = settings.performance.time_hammer
+        hammer_args = '-v {} {} {} {}'.format(
+            *credentials,
             f'--output={output_format}' if output_format else "",
             command,
         )
-        response = ssh.command(
+        if not time_hammer and hammer_shell.enabled():
+            response = hammer_shell.command(
+                hammer_args,
+                hostname=hostname,
+                env=env,
+                output_format=output_format,
+                timeout=timeout,
+                user=user,
+            )
+            if response is not None:
+                return response
+        # add time to measure hammer performance
+        cmd = '{} {} hammer {}'.format(
+            ' '.join(f'{name}={value}' for name, value in env.items()),
+            'time -p' if time_hammer else '',
+            hammer_args,
+        )
+        return ssh.command(
             cmd.encode('utf-8'),
-            hostname=hostname or cls.hostname or settings.server.hostname,
+            hostname=hostname,
             output_format=output_format,
             timeout=timeout,
         )
-        if return_raw_response:
-            return response
-        else:
-            return cls._handle_response(response, ignore_stderr=ignore_stderr)
+
+    @staticmethod
+    def execute_many(calls, max_workers=None):
+        """Run independent hammer calls concurrently
+
+        Each call is an ``(entity, subcommand, options)`` tuple, where ``subcommand`` names the
+        entity method to call, e.g. ``(Org, 'create', {'name': 'org'})`` or
+        ``(ContentView, 'add-repository', {...})``. ``options`` may be omitted.
+
+        :param calls: iterable of ``(entity, subcommand, options)`` tuples
+        :param int max_workers: number of calls run at the same time, defaults to
+            ``settings.performance.hammer_concurrency``
+        :return: list with the result of every call, in the order of ``calls``. Calls failing
+            with :class:`CLIReturnCodeError`, :class:`CLIDataBaseError` or :class:`CLIError`
+            have the raised exception in place of their result.
+        """
+        calls = [tuple(call) for call in calls]
+        if not calls:
+            return []
+
+        def run(call):
+            entity, subcommand, *options = call
+            method = getattr(entity, subcommand.replace('-', '_'))
+            try:
+                return method(*options)
+            except (CLIBaseError, CLIError) as err:
+                return err
+
+        max_workers = max_workers or settings.performance.get('hammer_concurrency', 4)
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(calls)), thread_name_prefix='hammer'
+        ) as executor:
+            return list(executor.map(run, calls))
 
     @classmethod
     def sm_execute(cls, command, hostname=None, timeout=None, **kwargs):
-        """Executes the satellite-maintain cli commands on the server via ssh"""
+        """Executes the satellite-maintain cli commands on the server via ssh
+
+        The output is streamed to the log while the command runs. ``on_stdout``, ``on_stderr``
+        and ``abort_patterns`` keyword arguments are passed to
+        :meth:`robottelo.hosts.ContentHost.execute_streaming`.
+        """
         env_var = kwargs.get('env_var') or ''
-        client = get_client(hostname=hostname or cls.hostname)
-        result = client.execute(f'{env_var} satellite-maintain {command}', timeout=timeout)
+        stream_kwargs = {
+            key: kwargs[key]
+            for key in ('on_stdout', 'on_stderr', 'abort_patterns')
+            if key in kwargs
+        }
+        with ssh.pooled_client(hostname=hostname or cls.hostname) as client:
+            result = client.execute_streaming(
+                f'{env_var} satellite-maintain {command}', timeout=timeout, **stream_kwargs
+            )
         return result
 
     @classmethod
@@ -240,11 +480,8 @@ class Base:
         if search is not None and 'search' not in options:
             options.update({'search': f'{search[0]}=\\"{search[1]}\\"'})
 
-        result = cls.list(options)
-        if result:
-            result = result[0]
-
-        return result
+        # the first match is enough, don't fetch and parse the others
+        return next(cls.iter_list(options, per_page=1), [])
 
     @classmethod
     def info(cls, options=None, output_format=None, return_raw_response=None):
@@ -289,6 +526,37 @@ class Base:
 
         return cls.execute(cls._construct_command(options), output_format=output_format)
 
+    @classmethod
+    def iter_list(cls, options=None, per_page=1000):
+        """Iterate over the ``list`` results, fetching them one page at a time
+
+        Pages are only requested as the iteration advances, so stopping early skips the
+        remaining ones. A ``per-page`` option takes precedence over ``per_page``. Entities whose
+        ``list`` opts out of ``per-page`` are listed in a single call. The iteration stops when a
+        page comes back the same as the previous one, as endpoints ignoring ``--page`` do.
+
+        :param dict options: options of the ``list`` command
+        :param int per_page: number of rows fetched and parsed at once
+        :return: generator of parsed rows
+        """
+        list_per_page = inspect.signature(cls.list).parameters.get('per_page')
+        if list_per_page is not None and list_per_page.default is False:
+            yield from cls.list(options)
+            return
+        options = dict(options or {})
+        per_page = int(options.pop('per-page', per_page))
+        page = options.pop('page', 1)
+        previous = None
+        while True:
+            rows = cls.list({**options, 'per-page': per_page, 'page': page})
+            if rows == previous:
+                return
+            yield from rows
+            if len(rows) < per_page:
+                return
+            previous = rows
+            page += 1
+
     @classmethod
     def puppetclasses(cls, options=None):
         """
@@ -360,21 +628,8 @@ class Base:
 
     @classmethod
     def _construct_command(cls, options=None):
-        """Build a hammer cli command based on the options passed"""
-        tail = ''
+        """Build a hammer cli command based on the options passed
 
-        if options is None:
-            options = {}
-
-        for key, val in options.items():
-            if val is None:
-                continue
-            if val is True:
-                tail += f' --{key}'
-            elif val is not False:
-                if isinstance(val, list):
-                    val = ','.join(str(el) for el in val)
-                tail += f' --{key}="{val}"'
-        cmd = f"{cls.command_base or ''} {cls.command_sub or ''} {tail.strip()} {cls.command_end or ''}"
-
-        return cmd
+        :return: a :class:`HammerCommand` snapshot of the entity command attributes
+        """
+        return HammerCommand(cls.command_base, cls.command_sub, options, cls.command_end)
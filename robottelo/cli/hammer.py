@@ -1,4 +1,5 @@
 """Helpers to interact with hammer command line utility."""
+from collections import deque
 import csv
 import json
 import re
@@ -9,39 +10,138 @@ def _normalize(header):
     return header.replace(' ', '-').lower()
 
 
+def _normalize_pairs(pairs):
+    """Build a JSON object normalizing its keys, see :func:`_normalize`"""
+    return {_normalize(key): value for key, value in pairs}
+
+
+def _parse_int(value):
+    # doing this to conform to csv parser
+    return str(int(value))
+
+
+# normalizes keys and integers while decoding, instead of walking the decoded tree again
+_json_decoder = json.JSONDecoder(object_pairs_hook=_normalize_pairs, parse_int=_parse_int)
+_json_whitespace = re.compile(r'[ \t\n\r]*')
+
+
+def iter_json(output):
+    """Decode every JSON document of a hammer output, one at a time
+
+    Hammer may print several JSON documents one after the other. Keys are normalized as in
+    :func:`parse_json` while decoding, and documents are decoded in place from the output.
+
+    :param output: hammer output, as str or utf-8 encoded bytes
+    :return: generator of the decoded documents
+    :raises json.JSONDecodeError: when the output is not made of JSON documents
+    """
+    if isinstance(output, bytes | bytearray | memoryview):
+        output = str(output, 'utf-8')
+    end = len(output)
+    position = _json_whitespace.match(output, 0).end()
+    while position < end:
+        document, position = _json_decoder.raw_decode(output, position)
+        yield document
+        position = _json_whitespace.match(output, position).end()
+
+
 def parse_json(stdout):
     """Parse JSON output from Hammer CLI and convert it to python dictionary
     while normalizing keys.
+
+    When hammer printed several documents, the last one is returned.
+    """
+    last = deque(iter_json(stdout), maxlen=1)
+    if not last:
+        # no document at all, let json report the error
+        return json.loads(stdout)
+    return last[0]
+
+
+# patterns looked for by csv.Sniffer around quoted values, see _has_quoted_delimiter
+_SNIFF_DELIM = r'[^\w\n"\']'
+_sniff_opening_quote = re.compile(rf'(?=({_SNIFF_DELIM})( ?)(["\']))')
+_sniff_closing_quote = re.compile(rf'(?=(["\'])({_SNIFF_DELIM}))')
+_sniff_line_start_quote = re.compile(r'^(["\'])', re.MULTILINE)
+_sniff_line_end_quote = re.compile(r'(["\'])(?=\n|\Z)')
+_SNIFF_ASCII = frozenset(chr(c) for c in range(127))
+# lowest consistency csv.Sniffer accepts a delimiter with, 1.0 lowered by 0.01 down to 0.9
+_SNIFF_CONSISTENCY = 0.9099999999999999
+
+
+def _has_quoted_delimiter(output):
+    """Whether csv.Sniffer finds a delimiter next to quoted values in ``output``
+
+    The sniffer looks for ``<delim>[ ]<quote>...<quote><delim>``, ``^<quote>...<quote><delim>``
+    or ``<delim>[ ]<quote>...<quote>$``, any text being allowed between the quotes. Such a
+    match exists when the first suitable opening quote comes before the last suitable closing
+    one, which is found in linear time instead of trying every opening quote against the rest
+    of the output.
     """
-    new_object_index = stdout.find('\n}\n{')
-    if new_object_index > -1:
-        stdout = stdout[new_object_index + 3 :]  # noqa: E203
-    parsed = json.loads(stdout)
-    return _normalize_obj(parsed)
+    openings = {}  # (delim, quote) -> first quote position
+    for match in _sniff_opening_quote.finditer(output):
+        delim, space, quote = match.groups()
+        openings.setdefault((delim, quote), match.start() + 1 + len(space))
+    closings = {}  # (delim, quote) -> last quote position
+    for match in _sniff_closing_quote.finditer(output):
+        quote, delim = match.groups()
+        closings[(delim, quote)] = match.start()
+    # <delim><quote>...<quote><delim>
+    if any(closings.get(key, -1) > start for key, start in openings.items()):
+        return True
+    # ^<quote>...<quote><delim>
+    last_closing = {}
+    for (_, quote), position in closings.items():
+        last_closing[quote] = max(position, last_closing.get(quote, -1))
+    first_line_start = {}
+    for match in _sniff_line_start_quote.finditer(output):
+        first_line_start.setdefault(match.group(1), match.start(1))
+    if any(last_closing.get(quote, -1) > start for quote, start in first_line_start.items()):
+        return True
+    # <delim><quote>...<quote>$
+    first_opening = {}
+    for (_, quote), position in openings.items():
+        first_opening[quote] = min(position, first_opening.get(quote, len(output)))
+    last_line_end = {}
+    for match in _sniff_line_end_quote.finditer(output):
+        last_line_end[match.group(1)] = match.start()
+    return any(last_line_end.get(quote, -1) > start for quote, start in first_opening.items())
+
 
+def _has_consistent_character(output):
+    """Whether csv.Sniffer finds a character occurring equally often on most lines
 
-def _normalize_obj(obj):
-    """Normalize all dict's keys replacing empty spaces with "-" and lowering
-    chars
+    Follows the sniffer's frequency tables over growing chunks of 10 lines, but stops at the
+    first chunk a delimiter is found in instead of going through the whole output.
     """
-    if isinstance(obj, dict):
-        return {_normalize(k): _normalize_obj(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [_normalize_obj(v) for v in obj]
-    # doing this to conform to csv parser
-    elif isinstance(obj, int) and not isinstance(obj, bool):
-        return str(obj)
-    return obj
+    lines = [line for line in output.split('\n') if line]
+    chunk_length = min(10, len(lines))
+    line_count = 0
+    frequencies = {}  # char -> {count on a line: number of lines}
+    for start in range(0, len(lines), chunk_length or 1):
+        for line in lines[start : start + chunk_length]:
+            line_count += 1
+            for char in _SNIFF_ASCII.intersection(line):
+                char_frequencies = frequencies.setdefault(char, {})
+                count = line.count(char)
+                char_frequencies[count] = char_frequencies.get(count, 0) + 1
+        # the mode of a character's counts has to be on most lines, lines without the
+        # character at all are never a mode worth considering
+        for char_frequencies in frequencies.values():
+            mode_lines = max(char_frequencies.values())
+            if (2 * mode_lines - line_count) / float(line_count) >= _SNIFF_CONSISTENCY:
+                return True
+    return False
 
 
 def is_csv(output):
-    """Verifies if the output string is eligible for converting into CSV"""
-    sniffer = csv.Sniffer()
-    try:
-        sniffer.sniff(output)
-        return True
-    except csv.Error:
-        return False
+    """Verifies if the output string is eligible for converting into CSV
+
+    Gives the same answer as running ``csv.Sniffer().sniff(output)`` without its cost, which
+    grows quadratically with the number of quoted values on large outputs.
+    """
+    # the consistency check usually succeeds within the first lines, so it goes first
+    return _has_consistent_character(output) or _has_quoted_delimiter(output)
 
 
 def parse_csv(output):
@@ -50,14 +150,14 @@ def parse_csv(output):
     output.replace('Puppet and OSTree will no longer be supported in Katello 3.16\n', '')
     is_rex = True if 'Job invocation' in output else False
     # Validate if the output is eligible for CSV conversions else return as it is
-    if not is_csv(output) and not is_rex:
+    if not is_rex and not is_csv(output):
         return output
     output = output.splitlines()[0:2] if is_rex else output.splitlines()
     reader = csv.reader(output)
     # Generate the key names, spaces will be converted to dashes "-"
     keys = [_normalize(header) for header in next(reader)]
     # For each entry, create a dict mapping each key with each value
-    return [dict(zip(keys, values, strict=True)) for values in reader if len(values) > 0]
+    return [dict(zip(keys, values, strict=True)) for values in reader if values]
 
 
 def parse_help(output):
@@ -178,6 +278,11 @@ def get_line_indentation_level(line, tab_spaces=4, indentation_spaces=4):
     return get_line_indentation_spaces(line, tab_spaces=tab_spaces) // indentation_spaces
 
 
+_info_numbered_value = re.compile(r'\d+\)\s+(.+)$')
+_info_whole_value = re.compile(r'(.*)$')
+_info_number = re.compile(r'(\d+)\)')
+
+
 def parse_info(output):
     """Parse the info output and returns a dict mapping the values."""
     # info dictionary
@@ -190,18 +295,24 @@ def parse_info(output):
         # skip empty lines and dividers
         if line == '' or line == '---':
             continue
-        current_indent_level = get_line_indentation_level(line)
+        # same as get_line_indentation_level(line), inlined as it runs for every line
+        if len(line) < 4:
+            current_indent_level = 0
+        else:
+            indent = len(line) - len(line.lstrip(' \t'))
+            current_indent_level = (indent + 3 * line.count('\t', 0, indent)) // 4
         if current_indent_level <= 1:
             # we are entering or leaving a second level from lower/upper levels
             # clear the second level key
             second_level_key = None
+        stripped = line.lstrip()
         if line.startswith(' '):  # sub-properties are indented
             # values are separated by ':' or '=>', but not by '::' which can be
             # entity name like 'test::params::keys'
-            if line.find(':') != -1 and not line.find('::') != -1:
-                key, value = line.lstrip().split(":", 1)
-            elif line.find('=>') != -1 and len(line.lstrip().split(" =>", 1)) == 2:
-                key, value = line.lstrip().split(" =>", 1)
+            if ':' in line and '::' not in line:
+                key, value = stripped.split(":", 1)
+            elif '=>' in line and ' =>' in stripped:
+                key, value = stripped.split(" =>", 1)
             else:
                 key = value = None
 
@@ -215,30 +326,30 @@ def parse_info(output):
                 # Template
                 #  template1
                 #  template2
-                match = re.match(r'\d+\)\s+(.+)$', line.lstrip())
+                match = _info_numbered_value.match(stripped)
 
                 if match is None:
-                    match = re.match(r'(.*)$', line.lstrip())
+                    match = _info_whole_value.match(stripped)
 
                 value = match.group(1)
 
                 # adding list to 1 level, for example:
                 # {'template': ['template1', 'template2']}
-                if isinstance(contents[sub_prop], dict) and not contents[sub_prop]:
-                    contents[sub_prop] = []
-                    contents[sub_prop].append(value)
-                elif isinstance(contents[sub_prop], list):
-                    contents[sub_prop].append(value)
+                sub_contents = contents[sub_prop]
+                if isinstance(sub_contents, dict) and not sub_contents:
+                    contents[sub_prop] = [value]
+                elif isinstance(sub_contents, list):
+                    sub_contents.append(value)
                 else:
                     # adding list to 2 level, for example:
                     # {'subscription-information':
                     #      {'registered-by-activation-keys': ['ak1', 'ak2']}
                     #  }
-                    last_key = list(contents[sub_prop].keys())[-1]
-                    if not contents[sub_prop][last_key]:
-                        contents[sub_prop][last_key] = [value]
+                    last_key = next(reversed(sub_contents.keys()))
+                    if not sub_contents[last_key]:
+                        sub_contents[last_key] = [value]
                     else:
-                        contents[sub_prop][last_key].append(value)
+                        sub_contents[last_key].append(value)
             else:
                 # some properties have many numbered values
                 # Example:
@@ -247,14 +358,14 @@ def parse_info(output):
                 #     URL:       /custom/4f84fc90-9ffa-...
                 #  2) Repo Name: puppet1
                 #     URL:       /custom/4f84fc90-9ffa-...
-                starts_with_number = re.match(r'(\d+)\)', key)
+                starts_with_number = _info_number.match(key)
                 if starts_with_number:
                     sub_num = int(starts_with_number.group(1))
                     # no. 1) we need to change dict() to list()
                     if sub_num == 1:
                         contents[sub_prop] = []
                     # remove number from key
-                    key = re.sub(r'\d+\)', '', key)
+                    key = _info_number.sub('', key)
                     # append empty dict to array
                     contents[sub_prop].append({})
 
@@ -286,12 +397,13 @@ def parse_info(output):
                         second_level_key = key
         else:
             sub_num = None  # new property implies no sub property
-            key, value = line.lstrip().split(":", 1)
+            key, value = stripped.split(":", 1)
             key = key.lstrip().replace(' ', '-').lower()
-            if value.lstrip() == '':  # 'key:' no value, new sub-property
+            value = value.lstrip()
+            if value == '':  # 'key:' no value, new sub-property
                 sub_prop = key
                 contents[sub_prop] = {}
             else:  # 'key: value' line
-                contents[key] = value.lstrip()
+                contents[key] = value
 
     return contents
@@ -0,0 +1,121 @@
+"""Read-through cache for hammer ``info`` and ``list`` results used by
+:meth:`robottelo.cli.base.Base.execute`.
+
+When ``settings.performance.hammer_cache`` is enabled, parsed results of read-only subcommands
+are kept per worker, keyed by host, command, options and user. Entries expire after
+``settings.performance.hammer_cache_ttl`` seconds, the least recently used ones are dropped when
+more than ``settings.performance.hammer_cache_size`` are kept, and every other subcommand run on
+a host drops the entries of its ``command_base`` there.
+"""
+from collections import OrderedDict
+from collections.abc import Mapping
+import copy
+import threading
+import time
+
+# subcommands which do not change anything on the Satellite
+READ_SUBCOMMANDS = frozenset({'info', 'list'})
+
+
+def _freeze(value):
+    """Turn command options into something hashable"""
+    if isinstance(value, Mapping):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, list | tuple | set):
+        return tuple(_freeze(val) for val in value)
+    return value
+
+
+class HammerCache:
+    """LRU cache of parsed hammer results with a time to live
+
+    :param int max_size: maximum number of cached results
+    :param int ttl: seconds a result is served from the cache
+    """
+
+    def __init__(self, max_size=1024, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires, value)
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    @staticmethod
+    def key(hostname, command, user=None, output_format=None):
+        """Build the cache key of a :class:`robottelo.cli.base.HammerCommand`
+
+        :return: the key, or None when the command is not cacheable
+        """
+        if command.command_sub not in READ_SUBCOMMANDS:
+            return None
+        return (
+            hostname,
+            command.command_base,
+            command.command_sub,
+            _freeze(command.options),
+            command.command_end,
+            user,
+            output_format,
+        )
+
+    def get(self, key):
+        """Return a copy of the cached value
+
+        :raises KeyError: if there is no valid entry for ``key``
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(key, None)
+                self.stats['misses'] += 1
+                raise KeyError(key)
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+        # callers are free to modify what they get back
+        return copy.deepcopy(entry[1])
+
+    def set(self, key, value):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def invalidate(self, hostname, command_base):
+        """Drop the results of every ``command_base`` command run on ``hostname``"""
+        with self._lock:
+            for key in [key for key in self._entries if key[:2] == (hostname, command_base)]:
+                del self._entries[key]
+                self.stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def enabled():
+    """Whether hammer info and list results should be cached"""
+    from robottelo.config import settings
+
+    return bool(settings.performance.get('hammer_cache', False))
+
+
+def get_cache():
+    """Return the hammer cache of this worker, creating it on first use"""
+    global _cache
+    if _cache is None:
+        from robottelo.config import settings
+
+        with _cache_lock:
+            if _cache is None:
+                _cache = HammerCache(
+                    max_size=settings.performance.get('hammer_cache_size', 1024),
+                    ttl=settings.performance.get('hammer_cache_ttl', 60),
+                )
+    return _cache
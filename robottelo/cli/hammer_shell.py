@@ -0,0 +1,322 @@
+"""Persistent hammer driver used by :meth:`robottelo.cli.base.Base.execute`.
+
+Every ``hammer`` call boots a new Ruby interpreter, loads all hammer plugins and reads the API
+documentation before doing any actual work. When ``settings.performance.hammer_shell`` is
+enabled, commands are instead sent to a long-lived Ruby process on the Satellite which loads
+hammer once and then runs each command in-process, reporting back its stdout, stderr and exit
+status.
+
+The driver is started over its own ssh connection and speaks a line based JSON protocol over the
+channel's stdin/stdout. Drivers are kept per Satellite and user, so the connection hammer caches
+in the process never carries credentials over to another user. Commands which rely on shell
+features (pipes, redirections, variable expansion), hosts where the driver can not be started and
+drivers failing before a command was sent transparently fall back to the regular ssh execution.
+A command the driver may have received is never run again, as it may have created, updated or
+deleted something already; it fails instead.
+"""
+import atexit
+from collections import defaultdict
+import json
+import shlex
+import threading
+import time
+
+from broker.helpers import Result
+
+from robottelo.logging import logger
+
+RESPONSE_MARKER = b'\x1eROBOTTELO-HAMMER\x1e'
+
+DRIVER_SCRIPT = r'''
+require 'json'
+require 'stringio'
+hammer_bin = ARGV.shift
+marker = "\x1eROBOTTELO-HAMMER\x1e"
+STDOUT.sync = true
+STDERR.reopen(STDOUT)
+while (line = STDIN.gets)
+  request = JSON.parse(line)
+  out, err = StringIO.new, StringIO.new
+  status = 0
+  saved_env = ENV.to_h
+  begin
+    request['env'].each { |key, value| ENV[key] = value }
+    ARGV.replace(request['argv'])
+    # forget the API connection and credentials of the previous command
+    if defined?(HammerCLI) && HammerCLI.respond_to?(:context)
+      connection = HammerCLI.context[:api_connection]
+      connection.drop_all if connection.respond_to?(:drop_all)
+    end
+    $stdout, $stderr, $stdin = out, err, StringIO.new
+    load hammer_bin
+  rescue SystemExit => e
+    status = e.status
+  rescue Exception => e
+    err.puts("#{e.class}: #{e.message}")
+    status = 70
+  ensure
+    $stdout, $stderr, $stdin = STDOUT, STDERR, STDIN
+    ENV.replace(saved_env)
+  end
+  response = {
+    'id' => request['id'],
+    'status' => status,
+    'stdout' => out.string.scrub,
+    'stderr' => err.string.scrub,
+  }
+  STDOUT.puts(marker + JSON.generate(response))
+end
+'''
+
+# tokens which make a command depend on a real shell
+SHELL_PUNCTUATION = set('|&;<>()')
+# status of a command whose outcome is unknown, as ssh reports its own errors
+UNKNOWN_OUTCOME_STATUS = 255
+# seconds a Satellite where the driver failed to start uses plain ssh before the next attempt
+RETRY_AFTER = 300
+
+
+class HammerShellError(Exception):
+    """Indicates the persistent hammer driver could not run a command
+
+    :param bool delivered: whether the command was sent to the driver, so it may have run
+    """
+
+    def __init__(self, message, delivered=False):
+        super().__init__(message)
+        self.delivered = delivered
+
+
+class HammerShellExited(HammerShellError):
+    """Indicates the persistent hammer driver process exited"""
+
+
+class HammerShellUnsupported(HammerShellError):
+    """Indicates the persistent hammer driver can not run on a Satellite"""
+
+
+def to_argv(command):
+    """Split a hammer command line into arguments
+
+    :return: list of arguments, or None when the command needs a real shell to run
+    """
+    if '$' in command or '`' in command:
+        return None
+    lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    try:
+        argv = list(lexer)
+    except ValueError:
+        return None
+    if any(set(token) <= SHELL_PUNCTUATION for token in argv):
+        return None
+    return argv
+
+
+class HammerShell:
+    """A long-lived Ruby process running hammer commands on a Satellite
+
+    :param str hostname: the Satellite running the driver
+    :param str user: the user the commands of the driver authenticate as
+    """
+
+    def __init__(self, hostname, user=None):
+        self.hostname = hostname
+        self.user = user
+        self._client = None
+        self._channel = None
+        self._buffer = b''
+        self._request_id = 0
+
+    @property
+    def running(self):
+        return self._channel is not None
+
+    def start(self, timeout=120000):
+        """Start the driver and wait for hammer to be loaded
+
+        :raises HammerShellUnsupported: if the driver can not run hammer on the Satellite
+        :raises HammerShellError: if the driver could not be started
+        """
+        from robottelo.utils.ssh import get_client
+
+        self._client = get_client(hostname=self.hostname)
+        self._channel = self._client.session.session.open_session()
+        self._channel.execute(f'ruby -e {shlex.quote(DRIVER_SCRIPT)} "$(command -v hammer)"')
+        # loading hammer once up front keeps the boot time out of the first real command
+        try:
+            warmup = self.run(['--version'], env={}, timeout=timeout)
+        except HammerShellExited as err:
+            raise HammerShellUnsupported(
+                f'Hammer driver on {self.hostname} exited on start:\n{err}'
+            ) from err
+        if warmup.status != 0:
+            self.stop()
+            raise HammerShellUnsupported(
+                f'Failed to start hammer driver on {self.hostname}:\n{warmup.stderr}'
+            )
+        logger.debug(f'Started persistent hammer driver on {self.hostname}')
+
+    def stop(self):
+        """Stop the driver, closing its ssh connection"""
+        if self._channel is not None:
+            try:
+                self._channel.close()
+            except Exception as err:  # noqa: BLE001 - the channel may already be gone
+                logger.debug(f'Failed to close hammer driver channel on {self.hostname}: {err}')
+        if self._client is not None:
+            self._client.close()
+        self._channel = self._client = None
+        self._buffer = b''
+
+    def run(self, argv, env, timeout=None):
+        """Run one hammer command in the driver
+
+        :param list argv: hammer arguments, without the ``hammer`` executable
+        :param dict env: environment variables to set before running the command
+        :param int timeout: time to wait for the command, in milliseconds, defaults to
+            ``settings.server.ssh_client.command_timeout`` as for plain ssh commands
+        :return: result object with ``stdout``, ``stderr`` and ``status``
+        :raises HammerShellError: if the driver went away or did not answer in time
+        """
+        from broker.helpers import translate_timeout
+
+        from robottelo.config import settings
+
+        if timeout is None:
+            timeout = settings.server.ssh_client.command_timeout
+        self._request_id += 1
+        request = {'id': self._request_id, 'argv': argv, 'env': env}
+        # the driver state is unknown after a failure, never reuse it
+        try:
+            self._client.session.session.set_timeout(translate_timeout(timeout))
+            self._channel.write(json.dumps(request) + '\n')
+        except Exception as err:
+            self.stop()
+            raise HammerShellError(
+                f'Hammer driver on {self.hostname} failed to receive the command: {err}'
+            ) from err
+        try:
+            response, noise = self._read_response()
+        except HammerShellExited:
+            self.stop()
+            raise
+        except Exception as err:
+            self.stop()
+            raise HammerShellError(
+                f'Hammer driver on {self.hostname} failed: {err}', delivered=True
+            ) from err
+        if response['id'] != self._request_id:
+            self.stop()
+            raise HammerShellError(
+                f'Hammer driver on {self.hostname} lost track of requests', delivered=True
+            )
+        # anything the command wrote directly to the real streams
+        stderr = noise + response['stderr']
+        return Result(stdout=response['stdout'], stderr=stderr, status=response['status'])
+
+    def _read_response(self):
+        noise = []
+        while True:
+            line_end = self._buffer.find(b'\n')
+            if line_end > -1:
+                line, self._buffer = self._buffer[:line_end], self._buffer[line_end + 1 :]
+                if line.startswith(RESPONSE_MARKER):
+                    response = json.loads(line[len(RESPONSE_MARKER) :].decode('utf-8'))
+                    return response, ''.join(noise)
+                noise.append(line.decode('utf-8', errors='replace') + '\n')
+                continue
+            size, data = self._channel.read()
+            if size > 0:
+                self._buffer += data
+            elif self._channel.eof():
+                raise HammerShellExited(
+                    f'Hammer driver on {self.hostname} exited:\n{"".join(noise)}', delivered=True
+                )
+
+
+_idle_shells = defaultdict(list)
+_lock = threading.Lock()
+_unsupported_hosts = set()
+# hostname -> time the driver last failed to start there
+_failed_starts = {}
+
+
+def enabled():
+    """Whether hammer commands should go through the persistent driver"""
+    from robottelo.config import settings
+
+    return bool(settings.performance.get('hammer_shell', False))
+
+
+def _acquire(hostname, user):
+    with _lock:
+        if _idle_shells[hostname, user]:
+            return _idle_shells[hostname, user].pop()
+    shell = HammerShell(hostname, user)
+    shell.start()
+    return shell
+
+
+def _release(shell):
+    if shell.running:
+        with _lock:
+            _idle_shells[shell.hostname, shell.user].append(shell)
+
+
+def stop_all():
+    """Stop every idle hammer driver of this worker"""
+    with _lock:
+        for shells in _idle_shells.values():
+            while shells:
+                shells.pop().stop()
+
+
+atexit.register(stop_all)
+
+
+def command(hammer_args, hostname, env, output_format=None, timeout=None, user=None):
+    """Run a hammer command through a persistent driver
+
+    Each thread gets a driver of its own, idle drivers are kept per host and user and reused.
+
+    :param str hammer_args: everything following ``hammer`` on the command line
+    :param str hostname: Satellite to run the command on
+    :param dict env: environment variables for the command
+    :param str output_format: json, csv or None
+    :param int timeout: time to wait for the command, in milliseconds
+    :param str user: the user the credentials in ``hammer_args`` authenticate as
+    :return: result object, or None when the command has to be run through a regular shell
+    """
+    from robottelo.utils.ssh import parse_output
+
+    if hostname in _unsupported_hosts or (argv := to_argv(hammer_args)) is None:
+        return None
+    if time.monotonic() - _failed_starts.get(hostname, -RETRY_AFTER) < RETRY_AFTER:
+        return None
+    try:
+        shell = _acquire(hostname, user)
+    except HammerShellUnsupported as err:
+        logger.warning(f'Persistent hammer unsupported on {hostname}, using plain ssh: {err}')
+        _unsupported_hosts.add(hostname)
+        return None
+    except Exception as err:  # noqa: BLE001 - any failure means falling back to plain ssh
+        logger.warning(
+            f'Persistent hammer failed to start on {hostname}, using plain ssh for the next '
+            f'{RETRY_AFTER}s: {err}'
+        )
+        _failed_starts[hostname] = time.monotonic()
+        return None
+    try:
+        result = shell.run(argv, env=env, timeout=timeout)
+    except HammerShellError as err:
+        # run stopped the broken driver, the next command starts a new one
+        if err.delivered:
+            # the command may have run, running it again could repeat a create or a delete
+            logger.warning(f'{err}, the outcome of the command is unknown')
+            return Result(stdout='', stderr=str(err), status=UNKNOWN_OUTCOME_STATUS)
+        logger.warning(f'{err}, running the command through plain ssh')
+        return None
+    finally:
+        _release(shell)
+    return parse_output(result, output_format)
@@ -13,7 +13,33 @@ Options:
  -h, --help                    Print help
 
 """
+from collections import defaultdict
+import threading
+
 from robottelo.cli.base import Base
+from robottelo.cli.hammer_cache import HammerCache, _freeze
+from robottelo.config import settings
+
+_command_cache = None
+_command_cache_lock = threading.Lock()
+# one lock per Satellite, so hosts registering at the same time wait for a single hammer call
+_generate_locks = defaultdict(threading.Lock)
+
+
+def get_command_cache():
+    """Return the registration command cache of this worker, creating it on first use
+
+    Entries expire after ``settings.performance.registration_command_ttl`` seconds, which has
+    to stay below the lifetime of the token embedded in the generated command.
+    """
+    global _command_cache
+    if _command_cache is None:
+        with _command_cache_lock:
+            if _command_cache is None:
+                _command_cache = HammerCache(
+                    ttl=settings.performance.get('registration_command_ttl', 600)
+                )
+    return _command_cache
 
 
 class HostRegistration(Base):
@@ -22,7 +48,51 @@ class HostRegistration(Base):
     command_base = 'host-registration'
 
     @classmethod
-    def generate_command(cls, options):
-        """Generate global registration command"""
+    def generate_command(cls, options, cache=None):
+        """Generate global registration command
+
+        :param dict options: options of ``hammer host-registration generate-command``
+        :param bool cache: reuse the command generated earlier for the same Satellite and
+            options, defaults to ``settings.performance.registration_command_cache``
+        """
         cls.command_sub = 'generate-command'
-        return cls.execute(cls._construct_command(options))
+        command = cls._construct_command(options)
+        if cache is None:
+            cache = settings.performance.get('registration_command_cache', False)
+        if not cache:
+            return cls.execute(command)
+        key = cls._command_cache_key(command)
+        commands = get_command_cache()
+        with _generate_locks[key[0]]:
+            try:
+                return commands.get(key)
+            except KeyError:
+                result = cls.execute(command)
+                commands.set(key, result)
+                return result
+
+    @classmethod
+    def _command_cache_key(cls, command):
+        """Key of a generated command, options differing only in their order or type match
+
+        The generated command embeds a token of the user who generated it, so the credentials
+        are part of the key.
+        """
+        options = {
+            key: val if isinstance(val, bool) else str(val)
+            for key, val in command.options.items()
+            if val is not None
+        }
+        return (
+            cls.hostname or settings.server.hostname,
+            cls.command_base,
+            cls._get_username_password(),
+            command.command_sub,
+            _freeze(options),
+        )
+
+    @classmethod
+    def invalidate_command_cache(cls):
+        """Drop the registration commands cached for the Satellite of this class, e.g. after
+        changing its registration settings or the activation keys in use"""
+        get_command_cache().invalidate(cls.hostname or settings.server.hostname, cls.command_base)
@@ -0,0 +1,89 @@
+"""Registry of the robottelo cli entities behind ``Satellite.cli`` and ``Capsule.cli``.
+
+The cli modules are imported and scanned once per process. Host namespaces only create the
+subclass bound to their host when an entity is first used, and reuse it afterwards.
+"""
+from functools import cache
+import importlib
+import pkgutil
+import threading
+
+import robottelo.cli
+from robottelo.cli.base import Base
+
+
+@cache
+def entities(module_prefix=''):
+    """Map the names of the cli entities to their classes
+
+    :param str module_prefix: only look at the cli modules whose name starts with it
+    :return: dict of entity name to :class:`robottelo.cli.base.Base` subclass
+    """
+    found = {}
+    for module_info in pkgutil.iter_modules(robottelo.cli.__path__):
+        if module_info.name.startswith('_') or not module_info.name.startswith(module_prefix):
+            continue
+        module = importlib.import_module(f'robottelo.cli.{module_info.name}')
+        for name, obj in vars(module).items():
+            if isinstance(obj, type) and issubclass(obj, Base):
+                found.setdefault(name, obj)
+    return found
+
+
+class CLINamespace:
+    """Cli entities bound to a host, created on first access
+
+    Every entity is subclassed with the host's ``hostname`` and current
+    ``omitting_credentials``, so entities used within ``Satellite.omit_credentials`` run
+    without credentials while the ones used outside of it keep them.
+
+    :param host: the host the entities run their commands on
+    :param str module_prefix: only expose the entities of cli modules starting with it
+    """
+
+    def __init__(self, host, module_prefix=''):
+        self._host = host
+        self._module_prefix = module_prefix
+        self._classes = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            entity = entities(self._module_prefix)[name]
+        except KeyError:
+            raise AttributeError(f'{type(self).__name__} has no cli entity {name!r}') from None
+        omitting_credentials = getattr(self._host, 'omitting_credentials', False)
+        key = (name, omitting_credentials)
+        with self._lock:
+            if key not in self._classes:
+                # create a copy of the class and set our hostname as a class attribute
+                self._classes[key] = type(
+                    name,
+                    (entity,),
+                    {
+                        'hostname': self._host.hostname,
+                        'omitting_credentials': omitting_credentials,
+                    },
+                )
+            return self._classes[key]
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(entities(self._module_prefix)))
+
+    def gather(self, calls, max_workers=None):
+        """Run independent hammer calls concurrently against the host
+
+        Entities may be given by name or as robottelo cli classes, the ones not bound to a host
+        are replaced by their counterpart in this namespace.
+        See :meth:`robottelo.cli.base.Base.execute_many` for the format of ``calls``.
+        """
+        bound_calls = []
+        for entity, *rest in calls:
+            if isinstance(entity, str):
+                entity = getattr(self, entity)
+            elif entity.hostname is None:
+                entity = getattr(self, entity.__name__, entity)
+            bound_calls.append((entity, *rest))
+        return Base.execute_many(bound_calls, max_workers=max_workers)
@@ -20,7 +20,9 @@ Subcommands::
     ssh-keys                      Managing User SSH Keys.
     update                        Update an user.
 """
+from robottelo.cli.auth import sessions
 from robottelo.cli.base import Base
+from robottelo.config import settings
 
 
 class User(Base):
@@ -30,6 +32,26 @@ class User(Base):
 
     command_base = 'user'
 
+    @classmethod
+    def _invalidate_sessions(cls):
+        """Drop cached hammer sessions, they may belong to a changed or removed user"""
+        sessions.invalidate(cls.hostname or settings.server.hostname)
+
+    @classmethod
+    def update(cls, options=None, return_raw_response=None):
+        """Update a user, dropping cached hammer sessions when credentials change."""
+        result = super().update(options, return_raw_response=return_raw_response)
+        if options and ({'login', 'password'} & set(options)):
+            cls._invalidate_sessions()
+        return result
+
+    @classmethod
+    def delete(cls, options=None, timeout=None):
+        """Delete a user, dropping cached hammer sessions."""
+        result = super().delete(options, timeout=timeout)
+        cls._invalidate_sessions()
+        return result
+
     @classmethod
     def add_role(cls, options=None):
         """Add a role to a user."""
@@ -6,10 +6,10 @@ from urllib.parse import urlunsplit
 
 from dynaconf import LazySettings
 from dynaconf.validator import ValidationError
-from nailgun.config import ServerConfig
 
 from robottelo.config.validators import VALIDATORS
 from robottelo.logging import logger, robottelo_root_dir
+from robottelo.utils.session_pool import server_config
 
 if not os.getenv('ROBOTTELO_DIR'):
     # dynaconf robottelo file uses ROBOTELLO_DIR for screenshots
@@ -101,7 +101,7 @@ def user_nailgun_config(username=None, password=None):
 
     """
     creds = (username, password)
-    return ServerConfig(get_url(), creds, verify=settings.server.verify_ca)
+    return server_config(get_url(), creds, verify=settings.server.verify_ca)
 
 
 def setting_is_set(option):
@@ -141,10 +141,9 @@ def configure_nailgun():
     * Set a default value for ``nailgun.entities.GPGKey.content``.
     """
     from nailgun import entities, entity_mixins
-    from nailgun.config import ServerConfig
 
     entity_mixins.CREATE_MISSING = True
-    entity_mixins.DEFAULT_SERVER_CONFIG = ServerConfig(
+    entity_mixins.DEFAULT_SERVER_CONFIG = server_config(
         get_url(), get_credentials(), verify=settings.server.verify_ca
     )
     gpgkey_init = entities.GPGKey.__init__
@@ -13,7 +13,9 @@ VALIDATORS = dict(
         Validator('server.version.source', must_exist=True),
         Validator('server.version.rhel_version', must_exist=True, cast=str),
         Validator(
-            'server.xdist_behavior', must_exist=True, is_in=['run-on-one', 'balance', 'on-demand']
+            'server.xdist_behavior',
+            must_exist=True,
+            is_in=['run-on-one', 'balance', 'on-demand', 'least-loaded'],
         ),
         Validator('server.auto_checkin', default=False, is_type_of=bool),
         (
@@ -32,6 +34,9 @@ VALIDATORS = dict(
         Validator('server.ssh_username', default='root'),
         Validator('server.ssh_password', default=None),
         Validator('server.verify_ca', default=False),
+        Validator('server.ssh_client.pool_size', default=8, is_type_of=int),
+        Validator('server.ssh_client.pool_max_idle', default=300, is_type_of=int),
+        Validator('server.ssh_client.pool_health_check_interval', default=60, is_type_of=int),
     ],
     content_host=[
         Validator('content_host.default_rhel_version', must_exist=True),
@@ -239,7 +244,25 @@ VALIDATORS = dict(
             must_exist=True,
         ),
     ],
-    performance=[Validator('performance.time_hammer', default=False)],
+    performance=[
+        Validator('performance.time_hammer', default=False),
+        Validator('performance.hammer_shell', default=False, is_type_of=bool),
+        Validator('performance.hammer_sessions', default=False, is_type_of=bool),
+        Validator('performance.hammer_concurrency', default=4, is_type_of=int, gte=1),
+        Validator('performance.hammer_cache', default=False, is_type_of=bool),
+        Validator('performance.hammer_cache_ttl', default=60, is_type_of=int),
+        Validator('performance.hammer_cache_size', default=1024, is_type_of=int),
+        Validator('performance.hammer_json_create', default=False, is_type_of=bool),
+        Validator('performance.nailgun_sessions', default=False, is_type_of=bool),
+        Validator('performance.nailgun_pool_size', default=10, is_type_of=int, gte=1),
+        Validator('performance.version_cache', default=False, is_type_of=bool),
+        Validator('performance.version_cache_ttl', default=3600, is_type_of=int, gte=0),
+        Validator('performance.host_concurrency', default=8, is_type_of=int, gte=1),
+        Validator('performance.registration_command_cache', default=False, is_type_of=bool),
+        Validator('performance.registration_command_ttl', default=600, is_type_of=int, gte=1),
+        Validator('performance.factory_pool_depth', default=0, is_type_of=int, gte=0),
+        Validator('performance.contenthost_prefetch', default=0, is_type_of=int, gte=0),
+    ],
     report_portal=[
         Validator(
             'report_portal.portal_url',
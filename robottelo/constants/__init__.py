@@ -1750,6 +1750,20 @@ MAINTAIN_HAMMER_YML = "/etc/foreman-maintain/foreman-maintain-hammer.yml"
 SATELLITE_MAINTAIN_YML = "/etc/foreman-maintain/foreman_maintain.yml"
 FOREMAN_SETTINGS_YML = '/etc/foreman/settings.yaml'
 
+# Output of long running commands after which they can not succeed any more, the commands are
+# stopped as soon as one of these patterns shows up instead of waiting for them to time out
+INSTALLER_ABORT_PATTERNS = [
+    r'Your system does not meet the minimum requirements',
+    r'Error: Failed to apply catalog',
+    r'Cannot allocate memory',
+    r'No space left on device',
+]
+YUM_UPDATE_ABORT_PATTERNS = [
+    r'Error: Failed to download metadata for repo',
+    r'Cannot retrieve repository metadata',
+    r'No space left on device',
+]
+
 FOREMAN_TEMPLATE_IMPORT_URL = 'https://github.com/SatelliteQE/foreman_templates.git'
 FOREMAN_TEMPLATE_IMPORT_API_URL = 'http://api.github.com/repos/SatelliteQE/foreman_templates'
 
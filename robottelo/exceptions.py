@@ -118,3 +118,7 @@ class CLIDataBaseError(CLIBaseError):
     which cause a data base error on hammer
     See: https://github.com/SatelliteQE/robottelo/issues/3790 for more details
     """
+
+
+class OfflineCollectionError(Exception):
+    """Raised when network or ssh I/O is attempted while tests are collected offline"""
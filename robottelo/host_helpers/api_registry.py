@@ -0,0 +1,85 @@
+"""Registry of the nailgun entities behind ``Satellite.api``.
+
+Satellites pointing at the same url share one namespace, and a nailgun entity is only subclassed
+with the namespace's server config when it is first used.
+"""
+import functools
+import threading
+
+from robottelo.utils.session_pool import server_config
+
+_namespaces = {}
+_namespaces_lock = threading.Lock()
+
+
+class APINamespace:
+    """Nailgun entities bound to a server config, created on first access
+
+    Bound entities are stored as attributes of the namespace, so only the first access of each
+    entity goes through ``__getattr__``.
+
+    :param server_config: the :class:`nailgun.config.ServerConfig` injected into the entities
+    """
+
+    def __init__(self, server_config):
+        self.server_config = server_config
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entities():
+        from nailgun import entities as _entities  # use a private import
+        from nailgun.entity_mixins import Entity
+
+        return {
+            name: obj
+            for name, obj in vars(_entities).items()
+            if isinstance(obj, type) and issubclass(obj, Entity)
+        }
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        from nailgun import entities as _entities
+        from nailgun.entity_mixins import Entity
+
+        entity = vars(_entities).get(name)
+        if not (isinstance(entity, type) and issubclass(entity, Entity)):
+            raise AttributeError(f'{type(self).__name__} has no nailgun entity {name!r}')
+        with self._lock:
+            if name not in vars(self):
+                # create a copy of the class and inject our server config into the __init__
+                bound = type(
+                    name,
+                    (entity,),
+                    {
+                        '__init__': functools.partialmethod(
+                            entity.__init__, server_config=self.server_config
+                        )
+                    },
+                )
+                setattr(self, name, bound)
+        return vars(self)[name]
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._entities()))
+
+
+def api_namespace(url, auth, verify):
+    """Return the namespace of nailgun entities for a server, creating it on first use
+
+    :param str url: url of the Satellite
+    :param tuple auth: username and password of the Satellite user
+    :param verify: ``verify`` of the server config, either a bool or a path to a CA bundle
+    :return: :class:`APINamespace` shared by every caller with the same arguments
+    """
+    key = (url, tuple(auth), verify)
+    with _namespaces_lock:
+        if key not in _namespaces:
+            _namespaces[key] = APINamespace(server_config(url, auth, verify=verify))
+        return _namespaces[key]
+
+
+def clear_api_namespaces():
+    """Forget every namespace, e.g. after nailgun has been reinstalled"""
+    with _namespaces_lock:
+        _namespaces.clear()
@@ -33,7 +33,7 @@ from robottelo.host_helpers.repository_mixins import initiate_repo_helpers
 from robottelo.utils.manifest import clone
 
 
-def create_object(cli_object, options, values=None, credentials=None):
+def create_object(cli_object, options, values=None, credentials=None, fields=None):
     """
     Creates <object> with dictionary of arguments.
 
@@ -42,6 +42,8 @@ def create_object(cli_object, options, values=None, credentials=None):
         create
     :param dict values: Custom values to override default ones.
     :param list|tuple credentials: Username and password for non-default user.
+    :param tuple fields: Fields the caller needs, the record is not fetched with info when the
+        create response has them.
     :raise robottelo.host_helpers.cli_factory.CLIFactoryError: Raise an exception if object
         cannot be created.
     :rtype: dict
@@ -52,7 +54,7 @@ def create_object(cli_object, options, values=None, credentials=None):
     if credentials:
         cli_object = cli_object.with_user(*credentials)
     try:
-        result = cli_object.create(options)
+        result = cli_object.create(options, fields=fields)
     except CLIReturnCodeError as err:
         # If the object is not created, raise exception, stop the show.
         raise CLIFactoryError(
@@ -339,10 +341,11 @@ class CLIFactory:
 
         return create_object(self._satellite.cli.ContentCredential, args, options)
 
-    def make_partition_table(self, options=None):
+    def make_partition_table(self, options=None, fields=None):
         """Creates a Partition Table
 
         :param options: Check options using `hammer partition-table create --help` on satellite.
+        :param tuple fields: Fields the caller needs from the created Partition Table.
 
         :returns PartitionTable object
         """
@@ -368,7 +371,7 @@ class CLIFactory:
         # Upload file to server
         self._satellite.put(layout, args['file'])
 
-        return create_object(self._satellite.cli.PartitionTable, args, options)
+        return create_object(self._satellite.cli.PartitionTable, args, options, fields=fields)
 
     def make_product_wait(self, options=None, wait_for=5):
         """Wrapper function for make_product to make it wait before erroring out.
@@ -415,14 +418,14 @@ class CLIFactory:
                     {'name': constants.DEFAULT_ORG}
                 )['id']
             except CLIReturnCodeError:
-                options['organization-id'] = self.make_org()['id']
+                options['organization-id'] = self.make_org(fields=('id',))['id']
         if not options.get('location') and not options.get('location-id'):
             try:
                 options['location-id'] = self._satellite.cli.Location.info(
                     {'name': constants.DEFAULT_LOC}
                 )['id']
             except CLIReturnCodeError:
-                options['location-id'] = self.make_location()['id']
+                options['location-id'] = self.make_location(fields=('id',))['id']
         if not options.get('domain') and not options.get('domain-id'):
             options['domain-id'] = self.make_domain(
                 {
@@ -430,7 +433,8 @@ class CLIFactory:
                     'locations': options.get('location'),
                     'organization-ids': options.get('organization-id'),
                     'organizations': options.get('organization'),
-                }
+                },
+                fields=('id',),
             )['id']
         if not options.get('architecture') and not options.get('architecture-id'):
             try:
@@ -438,7 +442,7 @@ class CLIFactory:
                     {'name': constants.DEFAULT_ARCHITECTURE}
                 )['id']
             except CLIReturnCodeError:
-                options['architecture-id'] = self.make_architecture()['id']
+                options['architecture-id'] = self.make_architecture(fields=('id',))['id']
         if not options.get('operatingsystem') and not options.get('operatingsystem-id'):
             try:
                 options['operatingsystem-id'] = self._satellite.cli.OperatingSys.list(
@@ -451,7 +455,8 @@ class CLIFactory:
                         'architectures': options.get('architecture'),
                         'partition-table-ids': options.get('partition-table-id'),
                         'partition-tables': options.get('partition-table'),
-                    }
+                    },
+                    fields=('id',),
                 )['id']
         if not options.get('partition-table') and not options.get('partition-table-id'):
             try:
@@ -469,7 +474,8 @@ class CLIFactory:
                         'operatingsystem-ids': options.get('operatingsystem-id'),
                         'organization-ids': options.get('organization-id'),
                         'organizations': options.get('organization'),
-                    }
+                    },
+                    fields=('id',),
                 )['id']
 
         # Finally, create a new medium (if none was passed)
@@ -482,7 +488,8 @@ class CLIFactory:
                     'operatingsystem-ids': options.get('operatingsystem-id'),
                     'organization-ids': options.get('organization-id'),
                     'organizations': options.get('organization'),
-                }
+                },
+                fields=('id',),
             )['id']
 
         return self.make_host(options)
@@ -592,11 +599,13 @@ class CLIFactory:
         """
         # Create new organization and lifecycle environment if needed
         if options.get('organization-id') is None:
-            org_id = self.make_org()['id']
+            org_id = self.make_org(fields=('id',))['id']
         else:
             org_id = options['organization-id']
         if options.get('lifecycle-environment-id') is None:
-            env_id = self.make_lifecycle_environment({'organization-id': org_id})['id']
+            env_id = self.make_lifecycle_environment({'organization-id': org_id}, fields=('id',))[
+                'id'
+            ]
         else:
             env_id = options['lifecycle-environment-id']
         # Create custom product and repository
@@ -611,7 +620,7 @@ class CLIFactory:
             raise CLIFactoryError(f'Failed to synchronize repository\n{err.msg}') from err
         # Create CV if needed and associate repo with it
         if options.get('content-view-id') is None:
-            cv_id = self.make_content_view({'organization-id': org_id})['id']
+            cv_id = self.make_content_view({'organization-id': org_id}, fields=('id',))['id']
         else:
             cv_id = options['content-view-id']
         try:
@@ -716,11 +725,13 @@ class CLIFactory:
         """
         # Create new organization and lifecycle environment if needed
         if options.get('organization-id') is None:
-            org_id = self.make_org()['id']
+            org_id = self.make_org(fields=('id',))['id']
         else:
             org_id = options['organization-id']
         if options.get('lifecycle-environment-id') is None:
-            env_id = self.make_lifecycle_environment({'organization-id': org_id})['id']
+            env_id = self.make_lifecycle_environment({'organization-id': org_id}, fields=('id',))[
+                'id'
+            ]
         else:
             env_id = options['lifecycle-environment-id']
         # If manifest does not exist, clone and upload it
@@ -770,7 +781,7 @@ class CLIFactory:
             raise CLIFactoryError(f'Failed to synchronize repository\n{err.msg}') from err
         # Create CV if needed and associate repo with it
         if options.get('content-view-id') is None:
-            cv_id = self.make_content_view({'organization-id': org_id})['id']
+            cv_id = self.make_content_view({'organization-id': org_id}, fields=('id',))['id']
         else:
             cv_id = options['content-view-id']
         try:
@@ -0,0 +1,84 @@
+"""Run the same operation on several hosts at once.
+
+Fixtures preparing many content hosts spend most of their time waiting on each host in turn.
+:class:`HostGroup` runs the per-host operations on a bounded thread pool instead, collecting the
+result or exception of every host, and prefixes the log lines of each operation with the
+hostname it runs on.
+"""
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+from robottelo.logging import log_hostname, logger
+
+
+class HostGroupError(Exception):
+    """Raised when an operation failed on some hosts of a :class:`HostGroup`
+
+    :param errors: list of ``(host, exception)`` pairs of the hosts the operation failed on
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        failures = ', '.join(f'{host.hostname}: {err!r}' for host, err in errors)
+        super().__init__(f'Operation failed on {len(errors)} host(s): {failures}')
+
+
+class HostGroup(list):
+    """A list of hosts to run operations on concurrently
+
+    Usage::
+
+        HostGroup(hosts).run('register', org, None, ak.name, target_sat)
+        HostGroup(hosts).run(lambda host: host.install_katello_host_tools())
+    """
+
+    def run(self, operation, *args, max_workers=None, fail_fast=False, raise_errors=True, **kwargs):
+        """Run ``operation`` on every host of the group, several hosts at a time
+
+        :param operation: either the name of a host method, called with ``args`` and
+            ``kwargs``, or a callable called with the host followed by ``args`` and ``kwargs``
+        :param int max_workers: number of hosts processed at the same time, defaults to
+            ``settings.performance.host_concurrency``
+        :param bool fail_fast: do not start the operation on further hosts once it failed on
+            one, the hosts it did not run on get a :class:`concurrent.futures.CancelledError`
+        :param bool raise_errors: raise :class:`HostGroupError` if the operation failed on any
+            host, instead of returning the exceptions in place of the results
+        :return: list with the result of the operation on every host, in the order of the hosts
+        """
+        if not self:
+            return []
+        if max_workers is None:
+            from robottelo.config import settings
+
+            max_workers = settings.performance.get('host_concurrency', 8)
+
+        def run_on(host):
+            token = log_hostname.set(host.hostname)
+            try:
+                if isinstance(operation, str):
+                    return getattr(host, operation)(*args, **kwargs)
+                return operation(host, *args, **kwargs)
+            finally:
+                log_hostname.reset(token)
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(self)), thread_name_prefix='hostgroup'
+        ) as executor:
+            futures = [executor.submit(run_on, host) for host in self]
+            if fail_fast:
+                done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+                if pending and any(future.exception() for future in done):
+                    cancelled = sum(future.cancel() for future in pending)
+                    logger.warning(
+                        'Operation failed on a host, cancelled it on %s other host(s)', cancelled
+                    )
+        results = []
+        errors = []
+        for host, future in zip(self, futures, strict=True):
+            try:
+                results.append(future.result())
+            except Exception as err:
+                results.append(err)
+                errors.append((host, err))
+        if errors and raise_errors:
+            raise HostGroupError(errors)
+        return results
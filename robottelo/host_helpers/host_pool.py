@@ -0,0 +1,136 @@
+"""Check out hosts in the background ahead of the tests needing them.
+
+Deploying a fresh Satellite or Capsule takes longer than most tests using it. A
+:class:`HostPool` starts the checkouts as soon as it is known how many hosts the tests of the
+session will ask for, and hands the hosts over once they are ready. A :class:`HostPrefetcher`
+does the same for hosts of several kinds, as the tests about to run ask for them.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import json
+import threading
+
+from robottelo.logging import logger
+
+
+class HostPool:
+    """Hosts checked out in background threads, up to ``depth`` at a time
+
+    :param str name: name of the pool, used in the log and thread names
+    :param checkout: called without arguments in a background thread, returns a ready host
+    :param checkin: called with the list of hosts nobody took when the pool is closed
+    :param int demand: number of hosts the session is expected to take from the pool
+    :param int depth: maximum number of hosts checked out ahead of time
+    """
+
+    def __init__(self, name, checkout, checkin, demand, depth):
+        self.name = name
+        self._checkout = checkout
+        self._checkin = checkin
+        self._demand = demand
+        self._depth = depth
+        self._futures = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=depth, thread_name_prefix=f'{name}-pool')
+        self.stats = {'started': 0, 'taken': 0, 'failed': 0, 'checked_in': 0}
+        with self._lock:
+            self._refill()
+
+    def _refill(self):
+        """Start checkouts until ``depth`` are pending or the remaining demand is covered"""
+        while not self._closed and len(self._futures) < min(self._depth, self._demand):
+            self._futures.append(self._executor.submit(self._checkout))
+            self.stats['started'] += 1
+
+    def expect(self, count=1):
+        """Raise the number of hosts the session is expected to take from the pool"""
+        with self._lock:
+            self._demand += count
+            self._refill()
+
+    def take(self):
+        """Return a host checked out by the pool, waiting for it if it is not ready yet
+
+        :return: the host, or None if the pool has nothing to offer or the checkout failed, in
+            which case the caller should check out a host itself
+        """
+        with self._lock:
+            if not self._futures:
+                return None
+            future = next((future for future in self._futures if future.done()), self._futures[0])
+            self._futures.remove(future)
+            self._demand = max(self._demand - 1, 0)
+            self._refill()
+        try:
+            host = future.result()
+        except Exception as err:  # noqa: BLE001 - the caller falls back to its own checkout
+            self.stats['failed'] += 1
+            logger.warning(f'Background checkout of a {self.name} host failed: {err}')
+            return None
+        self.stats['taken'] += 1
+        logger.info(f'Using {host.hostname} checked out in the background by the {self.name} pool')
+        return host
+
+    def close(self):
+        """Stop starting checkouts and check in the hosts nobody took
+
+        Waits for the checkouts in progress, as the hosts they deploy have to be checked in too.
+        """
+        with self._lock:
+            self._closed = True
+            futures, self._futures = list(self._futures), deque()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        unused = [f.result() for f in futures if not f.cancelled() and not f.exception()]
+        if unused:
+            logger.info(f'Checking in {len(unused)} unused host(s) of the {self.name} pool')
+            self._checkin(unused)
+            self.stats['checked_in'] += len(unused)
+        logger.debug(f'{self.name} pool stats: {self.stats}')
+
+
+class HostPrefetcher:
+    """One :class:`HostPool` per kind of host, fed with the hosts the upcoming tests will need
+
+    :param checkout: called with the deployment arguments of a kind of host, returns a host
+    :param checkin: called with the list of hosts nobody took when the prefetcher is closed
+    :param int lookahead: maximum number of hosts of each kind checked out ahead of time
+    """
+
+    def __init__(self, checkout, checkin, lookahead):
+        self._checkout = checkout
+        self._checkin = checkin
+        self.lookahead = lookahead
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(deploy_args):
+        """Kind of host deployed with ``deploy_args``"""
+        return json.dumps(deploy_args, sort_keys=True, default=str)
+
+    def expect(self, deploy_args):
+        """Start checking out a host deployed with ``deploy_args`` for an upcoming test"""
+        key = self.key(deploy_args)
+        with self._lock:
+            if key not in self._pools:
+                self._pools[key] = HostPool(
+                    f'prefetch{len(self._pools)}',
+                    checkout=partial(self._checkout, deploy_args),
+                    checkin=self._checkin,
+                    demand=0,
+                    depth=self.lookahead,
+                )
+            pool = self._pools[key]
+        pool.expect()
+
+    def take(self, deploy_args):
+        """Return a prefetched host deployed with ``deploy_args``, None if there is none"""
+        pool = self._pools.get(self.key(deploy_args))
+        return pool.take() if pool else None
+
+    def close(self):
+        """Check in the prefetched hosts nobody took"""
+        for pool in self._pools.values():
+            pool.close()
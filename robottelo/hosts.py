@@ -3,7 +3,6 @@ import contextlib
 from contextlib import contextmanager
 from datetime import datetime
 from functools import cached_property, lru_cache
-import importlib
 import io
 import json
 from pathlib import Path, PurePath
@@ -16,7 +15,9 @@ import warnings
 
 from box import Box
 from broker import Broker
+from broker.helpers import Result, translate_timeout
 from broker.hosts import Host
+from broker.session import Session as SSHSession
 from dynaconf.vendor.box.exceptions import BoxKeyError
 from fauxfactory import gen_alpha, gen_string
 from manifester import Manifester
@@ -29,7 +30,7 @@ from wrapanapi.entities.vm import VmState
 import yaml
 
 from robottelo import constants
-from robottelo.cli.base import Base
+from robottelo.cli.registry import CLINamespace
 from robottelo.config import (
     configure_airgun,
     configure_nailgun,
@@ -42,6 +43,7 @@ from robottelo.constants import (
     CUSTOM_PUPPET_MODULE_REPOS_VERSION,
     DEFAULT_ARCHITECTURE,
     HAMMER_CONFIG,
+    INSTALLER_ABORT_PATTERNS,
     KEY_CLOAK_CLI,
     PRDS,
     REPOS,
@@ -51,13 +53,20 @@ from robottelo.constants import (
     RHSSO_RESET_PASSWORD,
     RHSSO_USER_UPDATE,
     SATELLITE_VERSION,
+    YUM_UPDATE_ABORT_PATTERNS,
 )
 from robottelo.exceptions import CLIFactoryError, DownloadFileError, HostPingFailed
 from robottelo.host_helpers import CapsuleMixins, ContentHostMixins, SatelliteMixins
+from robottelo.host_helpers.api_registry import api_namespace, clear_api_namespaces
+from robottelo.host_helpers.host_group import HostGroup
 from robottelo.logging import logger
 from robottelo.utils import validate_ssh_pub_key
 from robottelo.utils.datafactory import valid_emails_list
 from robottelo.utils.installer import InstallerCommand
+from robottelo.utils.offline import is_offline
+from robottelo.utils.remote_script import run_script
+from robottelo.utils.stream import OutputStream, stream_channel, wrap_command
+from robottelo.utils.version import VersionCache
 
 POWER_OPERATIONS = {
     VmState.RUNNING: 'running',
@@ -66,6 +75,23 @@ POWER_OPERATIONS = {
     # TODO paused, suspended, shelved?
 }
 
+# commands whose results make up ContentHost.snapshot, by group collected together: the system
+# facts are cheap local reads, the registration facts wait on subscription-manager
+SNAPSHOT_COMMANDS = {
+    'system': {
+        'os_release': 'cat /etc/os-release',
+        'redhat_release': 'cat /etc/redhat-release',
+        'arch': 'uname -m',
+        'ip_addr': 'hostname -I',
+    },
+    'registration': {
+        'identity': 'subscription-manager identity',
+        'status': 'subscription-manager status',
+        'rhsm_conf': 'cat /etc/rhsm/rhsm.conf',
+    },
+}
+SNAPSHOT_MARKER = '<<<robottelo-snapshot'
+
 
 @lru_cache
 def lru_sat_ready_rhel(rhel_ver):
@@ -80,12 +106,40 @@ def lru_sat_ready_rhel(rhel_ver):
     return sat_ready_rhel
 
 
+def _cached_sat_version(name, resolver):
+    """Resolve a version of the configured Satellite through the shared version cache
+
+    The cache is used only when ``settings.performance.version_cache`` is enabled, otherwise the
+    version is always resolved. While tests are collected offline the Satellite is never
+    contacted, a cached version is used whatever its age.
+
+    :raises ContentHostError: when offline and the version is not cached, so callers fall back
+        to the settings
+    """
+    path = robottelo_tmp_dir.joinpath('satellite_versions.json')
+    hostname = settings.server.get('hostname')
+    if is_offline():
+        try:
+            return VersionCache(path, ttl=0).get(hostname, name)
+        except KeyError:
+            raise ContentHostError(f'No cached {name} of {hostname} while offline') from None
+    if not settings.performance.get('version_cache', False):
+        return resolver()
+    cache = VersionCache(path, ttl=settings.performance.get('version_cache_ttl', 3600))
+    return cache.resolve(hostname, name, resolver)
+
+
+def _resolve_sat_version():
+    sat_version = Satellite().version
+    return Version('9999' if 'nightly' in sat_version else sat_version)
+
+
 def get_sat_version():
     """Try to read sat_version from envvar SATELLITE_VERSION
     if not available fallback to ssh connection to get it."""
 
     try:
-        sat_version = Satellite().version
+        return _cached_sat_version('sat_version', _resolve_sat_version)
     except (AuthenticationError, ContentHostError, BoxKeyError):
         if sat_version := str(settings.server.version.get('release')) == 'stream':
             sat_version = str(settings.robottelo.get('satellite_version'))
@@ -99,7 +153,7 @@ def get_sat_rhel_version():
     if not available fallback to robottelo configuration."""
 
     try:
-        return Satellite().os_version
+        return _cached_sat_version('rhel_version', lambda: Satellite().os_version)
     except (AuthenticationError, ContentHostError, BoxKeyError):
         if hasattr(settings.server.version, 'rhel_version'):
             rhel_version = str(settings.server.version.rhel_version)
@@ -171,6 +225,16 @@ class IPAHostError(Exception):
     pass
 
 
+class CommandAbortedError(ContentHostError):
+    """Raised when a streamed command was stopped because its output matched an abort pattern"""
+
+    def __init__(self, command, line, result):
+        self.command = command
+        self.line = line
+        self.result = result
+        super().__init__(f'Command {command!r} aborted, its output matched: {line}')
+
+
 class ContentHost(Host, ContentHostMixins):
     run = Host.execute
     default_timeout = settings.server.ssh_client.command_timeout
@@ -214,6 +278,86 @@ class ContentHost(Host, ContentHostMixins):
             )
         return inv_hosts[0]
 
+    def execute_script(self, steps, stop_on_error=True, timeout=None):
+        """Run several commands as the steps of one script, in a single remote command
+
+        :param steps: shell commands, run one after the other in the same shell
+        :param bool stop_on_error: do not run the steps following a failed step
+        :param int timeout: timeout of the whole script
+        :return: :class:`robottelo.utils.remote_script.ScriptResult` with the ``command``,
+            ``status``, ``stdout`` and ``duration`` of every step
+        """
+        return run_script(self.execute, steps, stop_on_error=stop_on_error, timeout=timeout)
+
+    def execute_streaming(
+        self, command, timeout=None, on_stdout=None, on_stderr=None, abort_patterns=None
+    ):
+        """Execute a command, handing its output over line by line while it runs
+
+        Every line of stdout and stderr is logged and passed to the callbacks as soon as it is
+        read. The command is stopped, together with all the processes it started, as soon as a
+        line matches one of ``abort_patterns``.
+
+        :param str command: the command to run
+        :param timeout: same as for ``execute``
+        :param on_stdout: called with every line of stdout, without its line ending
+        :param on_stderr: called with every line of stderr, without its line ending
+        :param abort_patterns: regular expressions of output after which the command can not
+            succeed any more
+        :return: the result of the command, like ``execute``
+        :raises CommandAbortedError: when the output matched one of ``abort_patterns``
+        """
+        timeout = timeout or self.default_timeout
+        if not isinstance(self.session, SSHSession):
+            # containers and other sessions can only hand the output over once the command exited
+            result = self.execute(command, timeout=timeout)
+            aborted_by = None
+            for name, text, callback in (
+                ('stdout', result.stdout, on_stdout),
+                ('stderr', result.stderr, on_stderr),
+            ):
+                stream = OutputStream(name, callback, abort_patterns, self.hostname)
+                line = stream.feed(text) or stream.flush()
+                aborted_by = aborted_by or line
+        else:
+            ssh_session = self.session.session
+
+            def kill(pid):
+                ssh_session.set_blocking(True)
+                self.session.run(f'kill -TERM -- -{pid}', timeout='60s')
+                ssh_session.set_blocking(False)
+
+            logger.debug(f'{self.hostname} streaming command: {command}')
+            ssh_session.set_timeout(0)
+            channel = ssh_session.open_session()
+            channel.execute(wrap_command(command))
+            ssh_session.set_blocking(False)
+            try:
+                stdout, stderr, status, aborted_by = stream_channel(
+                    channel,
+                    on_stdout=on_stdout,
+                    on_stderr=on_stderr,
+                    abort_patterns=abort_patterns,
+                    timeout=translate_timeout(timeout) / 1000,
+                    kill=kill,
+                    hostname=self.hostname,
+                )
+            finally:
+                ssh_session.set_blocking(True)
+                channel.close()
+            result = Result(stdout=stdout, stderr=stderr, status=status)
+        if aborted_by is not None:
+            raise CommandAbortedError(command, aborted_by, result)
+        return result
+
+    @staticmethod
+    def run_on_all(hosts, operation, *args, **kwargs):
+        """Run ``operation`` on all ``hosts`` concurrently
+
+        See :meth:`robottelo.host_helpers.host_group.HostGroup.run` for the arguments.
+        """
+        return HostGroup(hosts).run(operation, *args, **kwargs)
+
     @property
     def satellite(self):
         if not self._satellite:
@@ -248,43 +392,90 @@ class ContentHost(Host, ContentHostMixins):
         else:
             logger.warning(f'Host {self.hostname} not registered to {self.satellite.hostname}')
 
+    def snapshot(self, group, refresh=False):
+        """Collect a group of facts about the host with a single remote command
+
+        The results of the commands of a group of ``SNAPSHOT_COMMANDS`` are kept until the host
+        is registered, unregistered or powered, or :meth:`clean_cached_properties` is called.
+        ``ip_addr``, ``arch`` and the os release properties are read from the ``system`` group,
+        ``identity`` and ``subscribed`` from the ``registration`` group.
+
+        :param str group: ``system`` or ``registration``
+        :param bool refresh: collect the group again even if there is a snapshot of it already
+        :return: dict of the names of the commands of the group to their ``stdout`` and
+            ``status``, ``stderr`` is not collected
+        """
+        if getattr(self, '_snapshots', None) is None:
+            self._snapshots = {}
+        snapshots = self._snapshots
+        if refresh or snapshots.get(group) is None:
+            commands = SNAPSHOT_COMMANDS[group]
+            script = '; '.join(
+                f"echo '{SNAPSHOT_MARKER} {name}>>>'; {command} 2>/dev/null; "
+                f"printf '\\n{SNAPSHOT_MARKER}-status %s>>>\\n' $?"
+                for name, command in commands.items()
+            )
+            output = self.execute(script).stdout
+            pattern = rf'^{SNAPSHOT_MARKER} (\w+)>>>\n(.*?)\n{SNAPSHOT_MARKER}-status (\d+)>>>$'
+            snapshots[group] = {
+                name: Result(stdout=stdout, stderr='', status=int(status))
+                for name, stdout, status in re.findall(pattern, output, re.MULTILINE | re.DOTALL)
+            }
+            if missing := set(commands) - set(snapshots[group]):
+                snapshots[group] = None
+                raise ContentHostError(f'Not able to collect {sorted(missing)} from {self}')
+        return snapshots[group]
+
+    def invalidate_snapshot(self, group=None):
+        """Drop the snapshot of ``group``, or of every group, the next :meth:`snapshot`
+        collects it again"""
+        if group is None or getattr(self, '_snapshots', None) is None:
+            self._snapshots = {}
+        else:
+            self._snapshots.pop(group, None)
+
     @property
     def subscribed(self):
         """Boolean representation of a content host's subscription status"""
-        return 'Status: Unknown' not in self.execute('subscription-manager status').stdout
+        return 'Status: Unknown' not in self.snapshot('registration')['status'].stdout
 
     @property
     def identity(self):
         """A Dictionary containing RHSM identity attributes of the host"""
-        id_output = self.execute('subscription-manager identity').stdout
+        snapshot = self.snapshot('registration')
+        id_output = snapshot['identity'].stdout
         id_dict = {}
         if id_output:
             id_dict = {
                 i.split(':')[0].replace(' ', '_'): i.split(': ')[1]
                 for i in id_output.split('\n')[:-1]
             }
-            regged_to = self.subscription_config['server']['hostname']
+            subscription_config = ConfigParser()
+            subscription_config.read_string(snapshot['rhsm_conf'].stdout)
+            regged_to = subscription_config['server']['hostname']
             if regged_to:
                 id_dict['registered_to'] = regged_to
         return id_dict
 
     @property
     def ip_addr(self):
-        ipv4, *ipv6 = self.execute('hostname -I').stdout.split()
+        ipv4, *ipv6 = self.snapshot('system')['ip_addr'].stdout.split()
         return ipv4
 
     @cached_property
     def arch(self):
-        return self.get_facts().get('lscpu.architecture') or self.execute('uname -m').stdout.strip()
+        return self.snapshot('system')['arch'].stdout.strip()
 
     @cached_property
     def _redhat_release(self):
         """Process redhat-release file for distro and version information
         This is a fallback for when /etc/os-release is not available
         """
-        result = self.execute('cat /etc/redhat-release')
+        result = self.snapshot('system')['redhat_release']
         if result.status != 0:
-            raise ContentHostError(f'Not able to cat /etc/redhat-release "{result.stderr}"')
+            raise ContentHostError(
+                f'Not able to cat /etc/redhat-release, exit status {result.status}'
+            )
         match = re.match(r'(?P<NAME>.+) release (?P<major>\d+)(.(?P<minor>\d+))?', result.stdout)
         if match is None:
             raise ContentHostError(f'Not able to parse release string "{result.stdout}"')
@@ -312,10 +503,10 @@ class ContentHost(Host, ContentHostMixins):
         """Process os-release file for distro and version information"""
         facts = {}
         regex = r'^(["\'])(.*)(\1)$'
-        result = self.execute('cat /etc/os-release')
+        result = self.snapshot('system')['os_release']
         if result.status != 0:
             logger.info(
-                f'Not able to cat /etc/os-release "{result.stderr}", '
+                f'Not able to cat /etc/os-release, exit status {result.status}, '
                 'falling back to /etc/redhat-release'
             )
             return self._redhat_release
@@ -377,6 +568,7 @@ class ContentHost(Host, ContentHostMixins):
 
     def clean_cached_properties(self):
         """Delete all cached properties for this class"""
+        self.invalidate_snapshot()
         for name in self.list_cached_properties():
             with contextlib.suppress(KeyError):  # ignore if property is not cached
                 del self.__dict__[name]
@@ -411,6 +603,7 @@ class ContentHost(Host, ContentHostMixins):
         """
         if getattr(self, '_cont_inst', None):
             raise NotImplementedError('Power control not supported for container instances')
+        self.invalidate_snapshot()
         try:
             vm_operation = POWER_OPERATIONS.get(state)
             workflow_name = settings.broker.host_workflows.power_control
@@ -628,22 +821,25 @@ class ContentHost(Host, ContentHostMixins):
             stacklevel=2,
         )
         self._satellite = satellite
-        self.execute(
-            f'curl --insecure --output katello-ca-consumer-latest.noarch.rpm \
-                    {satellite.url_katello_ca_rpm}'
+        # the rpm points rhsm.conf to the Satellite
+        self.invalidate_snapshot('registration')
+        result = self.execute_script(
+            [
+                f'curl --insecure --output katello-ca-consumer-latest.noarch.rpm \
+                    {satellite.url_katello_ca_rpm}',
+                # check if the host is fips-enabled
+                "if sysctl crypto.fips_enabled | grep -q 'crypto.fips_enabled = 1'; then "
+                'rpm -Uvh --nodigest --nofiledigest katello-ca-consumer-latest.noarch.rpm; '
+                'else rpm -Uvh katello-ca-consumer-latest.noarch.rpm; fi',
+                # Not checking the status here, as rpm could be installed before
+                # and installation may fail
+                f'rpm -q katello-ca-consumer-{satellite.hostname}',
+            ],
+            stop_on_error=False,
         )
-        # check if the host is fips-enabled
-        result = self.execute('sysctl crypto.fips_enabled')
-        if 'crypto.fips_enabled = 1' in result.stdout:
-            self.execute('rpm -Uvh --nodigest --nofiledigest katello-ca-consumer-latest.noarch.rpm')
-        else:
-            self.execute('rpm -Uvh katello-ca-consumer-latest.noarch.rpm')
-        # Not checking the status here, as rpm could be installed before
-        # and installation may fail
-        result = self.execute(f'rpm -q katello-ca-consumer-{satellite.hostname}')
         # Checking the status here to verify katello-ca rpm is actually
         # present in the system
-        if satellite.hostname not in result.stdout:
+        if satellite.hostname not in result[-1].stdout:
             raise ContentHostError('Failed to download and install the katello-ca rpm')
 
     def remove_katello_ca(self):
@@ -652,6 +848,7 @@ class ContentHost(Host, ContentHostMixins):
         :return: None.
         :raises robottelo.hosts.ContentHostError: If katello-ca wasn't removed.
         """
+        self.invalidate_snapshot('registration')
         # unregister host from CDN to avoid subscription leakage
         self.execute('subscription-manager unregister')
         # Not checking the status here, as rpm can be not even installed
@@ -715,6 +912,7 @@ class ContentHost(Host, ContentHostMixins):
         force=False,
         insecure=True,
         hostgroup=None,
+        cache_command=None,
     ):
         """Registers content host to the Satellite or Capsule server
         using a global registration template.
@@ -736,6 +934,9 @@ class ContentHost(Host, ContentHostMixins):
         :param force: Register the content host even if it's already registered.
         :param insecure: Don't verify server authenticity.
         :param hostgroup: hostgroup to register with
+        :param cache_command: reuse the registration command generated for other hosts
+            registering with the same options, defaults to
+            ``settings.performance.registration_command_cache``
         :return: SSHCommandResult instance filled with the result of the registration
         """
         options = {
@@ -787,7 +988,8 @@ class ContentHost(Host, ContentHostMixins):
         if force:
             options['force'] = str(force).lower()
 
-        cmd = target.satellite.cli.HostRegistration.generate_command(options)
+        cmd = target.satellite.cli.HostRegistration.generate_command(options, cache=cache_command)
+        self.invalidate_snapshot('registration')
         return self.execute(cmd.strip('\n'))
 
     def register_contenthost(
@@ -863,6 +1065,7 @@ class ContentHost(Host, ContentHostMixins):
             cmd += f' --serverurl {serverurl}'
         if baseurl:
             cmd += f' --baseurl {baseurl}'
+        self.invalidate_snapshot('registration')
         return self.execute(cmd)
 
     def unregister(self):
@@ -872,6 +1075,7 @@ class ContentHost(Host, ContentHostMixins):
             unregistration.
 
         """
+        self.invalidate_snapshot('registration')
         return self.execute('subscription-manager unregister')
 
     def get(self, remote_path, local_path=None):
@@ -1591,7 +1795,9 @@ class Capsule(ContentHost, CapsuleMixins):
             command_opts = {'scenario': self.__class__.__name__.lower()}
             command_opts.update(cmd_kwargs)
             installer_obj = InstallerCommand(*cmd_args, **command_opts)
-        return self.execute(installer_obj.get_command(), timeout=0)
+        return self.execute_streaming(
+            installer_obj.get_command(), timeout=0, abort_patterns=INSTALLER_ABORT_PATTERNS
+        )
 
     def get_features(self):
         """Get capsule features"""
@@ -1618,7 +1824,7 @@ class Capsule(ContentHost, CapsuleMixins):
                 raise CapsuleHostError(f'Repo enable at capsule host failed\n{result.stdout}')
 
         # Update system, firewall services and check capsule is already installed from template
-        self.execute('yum -y update', timeout=0)
+        self.execute_streaming('yum -y update', timeout=0, abort_patterns=YUM_UPDATE_ABORT_PATTERNS)
         self.execute('firewall-cmd --add-service RH-Satellite-6-capsule')
         self.execute('firewall-cmd --runtime-to-permanent')
         result = self.execute('rpm -q satellite-capsule')
@@ -1704,28 +1910,9 @@ class Capsule(ContentHost, CapsuleMixins):
 
     @property
     def cli(self):
-        """Import only satellite-maintain robottelo cli entities and wrap them under self.cli"""
-        self._cli = type('cli', (), {'_configured': False})
-        if self._cli._configured:
-            return self._cli
-
-        for file in Path('robottelo/cli/').iterdir():
-            if (
-                file.suffix == '.py'
-                and not file.name.startswith('_')
-                and file.name.startswith('sm_')
-            ):
-                cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
-                for name, obj in cli_module.__dict__.items():
-                    try:
-                        if Base in obj.mro():
-                            # create a copy of the class and set our hostname as a class attribute
-                            new_cls = type(name, (obj,), {'hostname': self.hostname})
-                            setattr(self._cli, name, new_cls)
-                    except AttributeError:
-                        # not everything has an mro method, we don't care about them
-                        pass
-        self._cli._configured = True
+        """satellite-maintain robottelo cli entities bound to this capsule"""
+        if getattr(self, '_cli', None) is None:
+            self._cli = CLINamespace(self, module_prefix='sm_')
         return self._cli
 
 
@@ -1738,9 +1925,8 @@ class Satellite(Capsule, SatelliteMixins):
         self.omitting_credentials = False
         self.port = kwargs.get('port', settings.server.port)
         super().__init__(hostname=hostname, **kwargs)
-        # create dummy classes for later population
-        self._api = type('api', (), {'_configured': False})
-        self._cli = type('cli', (), {'_configured': False})
+        self._api = None
+        self._cli = None
         self.record_property = None
 
     def _swap_nailgun(self, new_version):
@@ -1751,77 +1937,29 @@ class Satellite(Capsule, SatelliteMixins):
 
         pip_main(['uninstall', '-y', 'nailgun'])
         pip_main(['install', f'https://github.com/SatelliteQE/nailgun/archive/{new_version}.zip'])
-        self._api = type('api', (), {'_configured': False})
+        self._api = None
+        clear_api_namespaces()
         to_clear = [k for k in sys.modules.keys() if 'nailgun' in k]
         [sys.modules.pop(k) for k in to_clear]
 
     @property
     def api(self):
-        """Import all nailgun entities and wrap them under self.api"""
-        if not self._api:
-            self._api = type('api', (), {'_configured': False})
-        if self._api._configured:
-            return self._api
-        from nailgun import entities as _entities  # use a private import
-        from nailgun.config import ServerConfig
-        from nailgun.entity_mixins import Entity
-
-        def inject_config(cls, server_config):
-            """inject a nailgun server config into the init of nailgun entity classes"""
-            import functools
-
-            class DecClass(cls):
-                __init__ = functools.partialmethod(cls.__init__, server_config=server_config)
-
-            return DecClass
-
-        # set the server configuration to point to this satellite
-        self.nailgun_cfg = ServerConfig(
-            auth=(settings.server.admin_username, settings.server.admin_password),
-            url=f'{self.url}',
-            verify=settings.server.verify_ca,
-        )
-        # add each nailgun entity to self.api, injecting our server config
-        for name, obj in _entities.__dict__.items():
-            try:
-                if Entity in obj.mro():
-                    #  create a copy of the class and inject our server config into the __init__
-                    new_cls = type(name, (obj,), {})
-                    setattr(self._api, name, inject_config(new_cls, self.nailgun_cfg))
-            except AttributeError:
-                # not everything has an mro method, we don't care about them
-                pass
-        self._api._configured = True
+        """Nailgun entities bound to this satellite, shared by the satellites with the same url"""
+        if self._api is None:
+            self._api = api_namespace(
+                url=f'{self.url}',
+                auth=(settings.server.admin_username, settings.server.admin_password),
+                verify=settings.server.verify_ca,
+            )
+            # set the server configuration to point to this satellite
+            self.nailgun_cfg = self._api.server_config
         return self._api
 
     @property
     def cli(self):
-        """Import all robottelo cli entities and wrap them under self.cli"""
-        if not self._cli:
-            self._cli = type('cli', (), {'_configured': False})
-        if self._cli._configured:
-            return self._cli
-
-        for file in Path('robottelo/cli/').iterdir():
-            if file.suffix == '.py' and not file.name.startswith('_'):
-                cli_module = importlib.import_module(f'robottelo.cli.{file.stem}')
-                for name, obj in cli_module.__dict__.items():
-                    try:
-                        if Base in obj.mro():
-                            # create a copy of the class and set our hostname as a class attribute
-                            new_cls = type(
-                                name,
-                                (obj,),
-                                {
-                                    'hostname': self.hostname,
-                                    'omitting_credentials': self.omitting_credentials,
-                                },
-                            )
-                            setattr(self._cli, name, new_cls)
-                    except AttributeError:
-                        # not everything has an mro method, we don't care about them
-                        pass
-        self._cli._configured = True
+        """All robottelo cli entities bound to this satellite"""
+        if self._cli is None:
+            self._cli = CLINamespace(self)
         return self._cli
 
     @contextmanager
@@ -2489,13 +2627,16 @@ class IPAHost(Host):
             raise IPAHostError('Failed to login to the IPA server with admin credentials')
 
     def create_user(self, username):
-        self._kinit_admin()
         add_user_cmd = (
             f'echo {self.ldap_user_passwd} | ipa user-add {username} --first'
             f'={username} --last={username} --password'
         )
-        result = self.execute(add_user_cmd)
-        if result.status != 0:
+        kinit, add_user = run_script(
+            self.execute, [f'echo {self.ldap_user_passwd} | kinit admin', add_user_cmd]
+        )
+        if kinit.status != 0:
+            raise IPAHostError('Failed to login to the IPA server with admin credentials')
+        if add_user.status != 0:
             raise IPAHostError('Failed to create the user')
 
     def delete_user(self, username):
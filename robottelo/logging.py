@@ -1,3 +1,4 @@
+from contextvars import ContextVar
 import logging
 import os
 from pathlib import Path
@@ -34,6 +35,25 @@ logger = logzero.setup_logger(
 # if name is passed during setup, then imported uses of this root logger won't have name set
 logger.name = 'robottelo'
 
+# set while an operation runs on one host of many at once, see robottelo.host_helpers.host_group
+log_hostname = ContextVar('log_hostname', default=None)
+
+
+class HostnameFilter(logging.Filter):
+    """Prefix log messages with the hostname the current operation runs on, if any
+
+    Added to robottelo's loggers only, the records of other packages are left untouched.
+    """
+
+    def filter(self, record):
+        if (hostname := log_hostname.get()) is not None:
+            record.msg = f'[{hostname}] {record.msg}'
+        return True
+
+
+hostname_filter = HostnameFilter()
+logger.addFilter(hostname_filter)
+
 
 def configure_third_party_logging():
     """Increase the level of third party packages logging."""
@@ -81,3 +101,6 @@ config_logger = logzero.setup_logger(
     fileLoglevel=logging_yaml.config.fileLevel,
     formatter=defaultFormatter,
 )
+
+collection_logger.addFilter(hostname_filter)
+config_logger.addFilter(hostname_filter)
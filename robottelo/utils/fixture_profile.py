@@ -0,0 +1,132 @@
+"""Setup and teardown durations of pytest fixtures, kept per fixture execution.
+
+Every execution of a fixture is kept with its dependency chain: the fixtures which requested it,
+from the one a test asked for down to the fixture itself. The test which triggered the setup and
+the test whose teardown finalized the fixture are kept too, so the cost of module and session
+fixtures can be told apart from the cost of the tests. The executions are reported in json and as
+collapsed stacks, one ``frame;frame;frame value`` line per dependency chain, which flamegraph
+tools read.
+"""
+from collections import defaultdict
+import json
+from pathlib import Path
+
+from robottelo.utils.timings import module_of
+
+PHASES = ('setup', 'teardown')
+
+
+def execution(fixture, scope, location, stack, test, worker=None):
+    """Return a new fixture execution, as kept by :class:`FixtureProfile`
+
+    :param str fixture: name of the fixture
+    :param str scope: scope of the fixture
+    :param str location: module the fixture is defined in
+    :param list stack: names of the fixtures requesting this one, this one last
+    :param str test: nodeid of the test which triggered the setup
+    :param str worker: xdist worker running the fixture
+    """
+    return {
+        'fixture': fixture,
+        'scope': scope,
+        'location': location,
+        'stack': list(stack),
+        'test': test,
+        'teardown_test': None,
+        'worker': worker,
+        'setup': 0.0,
+        'teardown': 0.0,
+    }
+
+
+class FixtureProfile:
+    """Fixture executions of a test run, from one or several xdist workers"""
+
+    def __init__(self, executions=None):
+        self.executions = list(executions or [])
+
+    def add(self, execution):
+        self.executions.append(execution)
+
+    def merge(self, executions):
+        """Add the executions recorded by another process"""
+        self.executions.extend(executions)
+
+    def fixtures(self):
+        """Durations of every fixture, longest first, with the tests they are attributed to"""
+        fixtures = {}
+        for run in self.executions:
+            key = (run['location'], run['fixture'], run['scope'])
+            fixture = fixtures.setdefault(
+                key,
+                {
+                    'fixture': run['fixture'],
+                    'scope': run['scope'],
+                    'location': run['location'],
+                    'executions': 0,
+                    'setup': 0.0,
+                    'teardown': 0.0,
+                    'max_setup': 0.0,
+                    'max_teardown': 0.0,
+                    'tests': defaultdict(float),
+                },
+            )
+            fixture['executions'] += 1
+            for phase in PHASES:
+                fixture[phase] += run[phase]
+                fixture[f'max_{phase}'] = max(fixture[f'max_{phase}'], run[phase])
+            fixture['tests'][run['test']] += run['setup']
+            if run['teardown_test']:
+                fixture['tests'][run['teardown_test']] += run['teardown']
+        for fixture in fixtures.values():
+            fixture['tests'] = dict(fixture['tests'])
+        return sorted(
+            fixtures.values(), key=lambda fixture: -(fixture['setup'] + fixture['teardown'])
+        )
+
+    def tests(self):
+        """Fixture setup and teardown durations attributed to every test"""
+        tests = defaultdict(lambda: dict.fromkeys(PHASES, 0.0))
+        for run in self.executions:
+            tests[run['test']]['setup'] += run['setup']
+            if run['teardown_test']:
+                tests[run['teardown_test']]['teardown'] += run['teardown']
+        return dict(tests)
+
+    def report(self):
+        """Return the json report of the fixture durations"""
+        return {
+            'executions': len(self.executions),
+            'workers': sorted({run['worker'] for run in self.executions if run['worker']}),
+            'fixtures': self.fixtures(),
+            'tests': self.tests(),
+        }
+
+    def collapsed_stacks(self):
+        """Return the fixture dependency tree as collapsed stacks, durations in microseconds
+
+        The stacks start with the phase and the test module which triggered the setup, so setup
+        and teardown each make a tree of their own.
+        """
+        stacks = defaultdict(float)
+        for run in self.executions:
+            for phase in PHASES:
+                frames = [phase, module_of(run['test']), *run['stack']]
+                stacks[';'.join(frames)] += run[phase]
+        return [
+            f'{stack} {round(seconds * 1e6)}'
+            for stack, seconds in sorted(stacks.items())
+            if round(seconds * 1e6)
+        ]
+
+    def write(self, path):
+        """Write the json report to ``path`` and the collapsed stacks next to it
+
+        :return: paths of the json report and of the collapsed stacks
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2))
+        folded = path.with_suffix('.folded')
+        folded.write_text(''.join(f'{line}\n' for line in self.collapsed_stacks()))
+        return path, folded
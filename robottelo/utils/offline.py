@@ -0,0 +1,57 @@
+"""Guard against network and ssh I/O, used by ``--offline-collection``.
+
+Within :func:`offline`, connecting a socket to anything but a unix socket or resolving a host
+name raises :class:`robottelo.exceptions.OfflineCollectionError`, and host lookups such as
+:func:`robottelo.hosts.get_sat_version` use cached values or the settings instead.
+"""
+from contextlib import contextmanager
+import socket
+
+from robottelo.exceptions import OfflineCollectionError
+
+_offline = False
+
+
+def is_offline():
+    """Whether network and ssh I/O is currently forbidden"""
+    return _offline
+
+
+@contextmanager
+def offline(reason='while collecting tests offline'):
+    """Forbid network and ssh I/O within the block
+
+    :param str reason: appended to the message of the errors raised on I/O attempts
+    """
+    global _offline
+    socket_connect = socket.socket.connect
+    socket_connect_ex = socket.socket.connect_ex
+    create_connection = socket.create_connection
+    getaddrinfo = socket.getaddrinfo
+
+    def refuse(target):
+        raise OfflineCollectionError(f'Attempted to connect to {target} {reason}')
+
+    def connect(sock, address):
+        if sock.family == socket.AF_UNIX:
+            return socket_connect(sock, address)
+        refuse(address)
+
+    def connect_ex(sock, address):
+        if sock.family == socket.AF_UNIX:
+            return socket_connect_ex(sock, address)
+        refuse(address)
+
+    socket.socket.connect = connect
+    socket.socket.connect_ex = connect_ex
+    socket.create_connection = lambda address, *args, **kwargs: refuse(address)
+    socket.getaddrinfo = lambda host, port, *args, **kwargs: refuse((host, port))
+    _offline = True
+    try:
+        yield
+    finally:
+        _offline = False
+        socket.socket.connect = socket_connect
+        socket.socket.connect_ex = socket_connect_ex
+        socket.create_connection = create_connection
+        socket.getaddrinfo = getaddrinfo
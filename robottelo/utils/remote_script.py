@@ -0,0 +1,103 @@
+"""Run several shell steps on a host in a single remote command.
+
+The steps are combined into one script which reports the exit status and duration of every
+step between markers, so helpers needing a sequence of commands pay for one round trip instead
+of one per command. The steps run in the same shell, one after the other, like the lines of a
+script.
+"""
+import re
+
+from broker.helpers import Result
+
+STEP_MARKER = '<<<robottelo-step'
+
+
+class ScriptResult(list):
+    """Results of the steps of a script, in order
+
+    Every step result has the ``command``, ``stdout``, ``status`` and ``duration`` in seconds of
+    its step. Steps which did not run because an earlier step failed have a ``status`` of None.
+    The ``stderr`` of all steps is kept on the script result.
+    """
+
+    def __init__(self, steps, stderr=''):
+        super().__init__(steps)
+        self.stderr = stderr
+
+    @property
+    def failed_step(self):
+        """The first step which failed, None if none failed"""
+        return next((step for step in self if step.status not in (0, None)), None)
+
+    @property
+    def status(self):
+        """0 if all steps succeeded, the status of the first failed step otherwise"""
+        failed = self.failed_step
+        return 0 if failed is None else failed.status
+
+    @property
+    def stdout(self):
+        """Output of all the steps which ran"""
+        return ''.join(step.stdout for step in self)
+
+
+def build_script(steps, stop_on_error=True):
+    """Combine ``steps`` into a script reporting the status and duration of each of them
+
+    :param steps: shell commands
+    :param bool stop_on_error: do not run the steps following a failed step
+    """
+    lines = []
+    for index, command in enumerate(steps):
+        lines.extend(
+            [
+                f"echo '{STEP_MARKER} {index}>>>'",
+                'step_start=$(date +%s%N)',
+                '{',
+                command,
+                '}',
+                'step_status=$?',
+                f"printf '\\n{STEP_MARKER}-end {index} %s %s>>>\\n' "
+                '"$step_status" "$(( $(date +%s%N) - step_start ))"',
+            ]
+        )
+        if stop_on_error:
+            lines.append('[ "$step_status" -eq 0 ] || exit "$step_status"')
+    return '\n'.join(lines)
+
+
+def parse_script_output(steps, result):
+    """Split the result of a script made by :func:`build_script` into per-step results
+
+    :return: :class:`ScriptResult`
+    """
+    pattern = rf'^{STEP_MARKER} (\d+)>>>\n(.*?)\n{STEP_MARKER}-end \1 (-?\d+) (\d+)>>>$'
+    reported = {
+        int(index): (stdout, int(status), int(duration) / 1e9)
+        for index, stdout, status, duration in re.findall(
+            pattern, result.stdout, re.MULTILINE | re.DOTALL
+        )
+    }
+    step_results = []
+    for index, command in enumerate(steps):
+        stdout, status, duration = reported.get(index, ('', None, None))
+        step_results.append(
+            Result(command=command, stdout=stdout, stderr='', status=status, duration=duration)
+        )
+    return ScriptResult(step_results, stderr=getattr(result, 'stderr', ''))
+
+
+def run_script(execute, steps, stop_on_error=True, **kwargs):
+    """Run ``steps`` with a single call of ``execute``
+
+    :param execute: callable running a shell command on the host and returning a result with
+        ``stdout``, e.g. ``ContentHost.execute`` or a wrapper of ``robottelo.ssh.command``
+    :param steps: shell commands
+    :param bool stop_on_error: do not run the steps following a failed step
+    :param kwargs: passed to ``execute``
+    :return: :class:`ScriptResult`
+    """
+    steps = list(steps)
+    if not steps:
+        return ScriptResult([])
+    return parse_script_output(steps, execute(build_script(steps, stop_on_error), **kwargs))
@@ -0,0 +1,138 @@
+"""Spread xdist workers over Satellites by load, for ``server.xdist_behavior: least-loaded``.
+
+The workers of a test run share a json ledger, guarded by a file lock, with the workers
+assigned to each Satellite and the measured hammer latency of each Satellite. A worker picks the
+Satellite where it adds the least load, the load of a Satellite being the cost of its workers,
+one each unless told otherwise, weighted by how much slower it answers than the fastest one.
+Workers are assigned when the session starts, so the latencies they go by are the ones measured
+by the previous runs, which the ledger keeps.
+"""
+from collections import defaultdict, deque
+from contextlib import contextmanager
+import json
+import os
+from pathlib import Path
+import statistics
+import threading
+
+from pytest_services.locks import file_lock
+
+
+class LatencyTracker:
+    """Durations of the recent hammer commands run by this process, per hostname"""
+
+    def __init__(self, size=100):
+        self._durations = defaultdict(lambda: deque(maxlen=size))
+        self._lock = threading.Lock()
+
+    def record(self, hostname, seconds):
+        with self._lock:
+            self._durations[hostname].append(seconds)
+
+    def median(self, hostname):
+        """Median duration of the recent commands run on ``hostname``, None if there are none"""
+        with self._lock:
+            durations = list(self._durations.get(hostname, ()))
+        return statistics.median(durations) if durations else None
+
+
+latency_tracker = LatencyTracker()
+
+
+class SatelliteLedger:
+    """Workers, costs and latencies of the Satellites of a test run, in a shared json file
+
+    :param path: path of the json file
+    :param str run_id: identifier of the test run, the workers of another run are discarded
+    """
+
+    def __init__(self, path, run_id=None, lock_timeout=300):
+        self.path = Path(path)
+        self.run_id = run_id
+        self.lock_timeout = lock_timeout
+
+    def _read(self):
+        try:
+            contents = json.loads(self.path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            contents = {}
+        if contents.get('run') != self.run_id:
+            # the workers of the previous run are gone, the Satellites answer as fast as they did
+            hosts = {
+                hostname: {'latency': host['latency']}
+                for hostname, host in contents.get('hosts', {}).items()
+                if host.get('latency')
+            }
+            contents = {'run': self.run_id, 'hosts': hosts}
+        return contents
+
+    @contextmanager
+    def _update(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(f'{self.path}.lock', remove=False, timeout=self.lock_timeout):
+            contents = self._read()
+            yield contents['hosts']
+            # write to a temporary file first so readers never see a partial file
+            temp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}')
+            temp_path.write_text(json.dumps(contents, indent=2, sort_keys=True))
+            os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _slowness(hosts, hostname):
+        """How many times slower ``hostname`` answers than the fastest measured Satellite"""
+        latencies = [host['latency'] for host in hosts.values() if host.get('latency')]
+        latency = hosts.get(hostname, {}).get('latency')
+        if not latency or not latencies:
+            return 1.0
+        return latency / min(latencies)
+
+    @classmethod
+    def _load(cls, hosts, hostname, extra_cost=0.0):
+        cost = sum(hosts.get(hostname, {}).get('workers', {}).values()) + extra_cost
+        return cost * cls._slowness(hosts, hostname)
+
+    def hosts(self):
+        """Return the ledger, keyed by hostname"""
+        return self._read()['hosts']
+
+    def assign(self, worker, hostnames, cost=1.0):
+        """Assign ``worker`` to the Satellite among ``hostnames`` where it adds the least load
+
+        :param float cost: estimated cost of the tests of the worker
+        :return: the hostname of the Satellite
+        """
+        with self._update() as hosts:
+            for host in hosts.values():
+                host.get('workers', {}).pop(worker, None)
+            hostname = min(
+                hostnames,
+                key=lambda hostname: (
+                    self._load(hosts, hostname, cost),
+                    len(hosts.get(hostname, {}).get('workers', {})),
+                ),
+            )
+            hosts.setdefault(hostname, {}).setdefault('workers', {})[worker] = cost
+        return hostname
+
+    def report_latency(self, hostname, seconds):
+        """Store the measured latency of a Satellite"""
+        if seconds is None:
+            return
+        with self._update() as hosts:
+            hosts.setdefault(hostname, {})['latency'] = seconds
+
+    def release(self, worker):
+        """Remove ``worker`` from the ledger"""
+        with self._update() as hosts:
+            for host in hosts.values():
+                host.get('workers', {}).pop(worker, None)
+
+
+def get_ledger():
+    """Return the ledger shared by the workers of this test run"""
+    from robottelo.config import robottelo_tmp_dir
+
+    return SatelliteLedger(
+        robottelo_tmp_dir.joinpath('satellite_ledger.json'),
+        run_id=os.environ.get('PYTEST_XDIST_TESTRUNUID'),
+    )
@@ -0,0 +1,165 @@
+"""Pooled HTTP sessions for the nailgun server configs built by robottelo.
+
+nailgun sends every request with ``requests.request`` and its helpers, so each REST call opens
+a new connection and does a new TLS handshake. When ``settings.performance.nailgun_sessions`` is
+enabled, the server configs built by :func:`robottelo.config.configure_nailgun`,
+:func:`robottelo.config.user_nailgun_config` and ``Satellite.api`` are
+:class:`PooledServerConfig` objects. Their requests go through one keep-alive
+:class:`requests.Session` per worker, host and credentials, so connections and their TLS sessions
+are reused between calls while the cookies Foreman sets for one user are never sent for another.
+"""
+import threading
+from urllib.parse import urlsplit
+
+from nailgun.config import ServerConfig
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class SessionPool:
+    """Keep-alive :class:`requests.Session` objects, one per host and credentials
+
+    :param int pool_size: maximum number of idle connections kept open to each host
+    """
+
+    def __init__(self, pool_size=10):
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._adapters = {}
+        self._lock = threading.Lock()
+
+    def session(self, url, auth=None):
+        """Return the session for the host of ``url`` and ``auth``, creating it on first use
+
+        Foreman answers with a ``_session_id`` cookie, which the session sends with its next
+        requests, so each user gets a session of its own.
+        """
+        host = urlsplit(url).netloc
+        key = (host, tuple(auth) if isinstance(auth, list) else auth)
+        with self._lock:
+            if key not in self._sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._sessions[key] = session
+                self._adapters[key] = adapter
+            return self._sessions[key]
+
+    def metrics(self):
+        """Count the requests sent and the connections opened and reused for each host
+
+        :return: dict of host to a dict with ``requests``, ``opened`` and ``reused`` counts
+        """
+        with self._lock:
+            adapters = dict(self._adapters)
+        metrics = {}
+        for (host, _), adapter in adapters.items():
+            pools = adapter.poolmanager.pools
+            sent = opened = 0
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    sent += pool.num_requests
+                    opened += pool.num_connections
+            host_metrics = metrics.setdefault(host, {'requests': 0, 'opened': 0, 'reused': 0})
+            host_metrics['requests'] += sent
+            host_metrics['opened'] += opened
+            host_metrics['reused'] += max(sent - opened, 0)
+        return metrics
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._adapters.clear()
+
+
+class PooledServerConfig(ServerConfig):
+    """A nailgun server config sending its requests through the worker's session pool"""
+
+    def get_client_kwargs(self):
+        config = super().get_client_kwargs()
+        config['session'] = get_pool().session(self.url, self.auth)
+        return config
+
+
+class _PooledRequests:
+    """Stand-in for the ``requests`` module used by :mod:`nailgun.client`
+
+    Requests passing a ``session``, i.e. the ones made with a :class:`PooledServerConfig`, are
+    sent through it, everything else is left to :mod:`requests`.
+    """
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+    @staticmethod
+    def request(method, url, **kwargs):
+        session = kwargs.pop('session', None)
+        if session is None:
+            return requests.request(method, url, **kwargs)
+        return session.request(method, url, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('head', url, **kwargs)
+
+    def get(self, url, params=None, **kwargs):
+        return self.request('get', url, params=params, **kwargs)
+
+    def options(self, url, **kwargs):
+        return self.request('options', url, **kwargs)
+
+    def post(self, url, data=None, json=None, **kwargs):
+        return self.request('post', url, data=data, json=json, **kwargs)
+
+    def put(self, url, data=None, **kwargs):
+        return self.request('put', url, data=data, **kwargs)
+
+    def patch(self, url, data=None, **kwargs):
+        return self.request('patch', url, data=data, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('delete', url, **kwargs)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def enabled():
+    """Whether nailgun requests should go through pooled sessions"""
+    from robottelo.config import settings
+
+    return bool(settings.performance.get('nailgun_sessions', False))
+
+
+def get_pool():
+    """Return the session pool of this worker, creating it on first use"""
+    global _pool
+    if _pool is None:
+        from robottelo.config import settings
+
+        with _pool_lock:
+            if _pool is None:
+                _pool = SessionPool(pool_size=settings.performance.get('nailgun_pool_size', 10))
+    return _pool
+
+
+def server_config(url, auth, verify):
+    """Build the nailgun server config for ``url``, pooled when enabled
+
+    :return: :class:`PooledServerConfig` if ``settings.performance.nailgun_sessions`` is set,
+        :class:`nailgun.config.ServerConfig` otherwise
+    """
+    if not enabled():
+        return ServerConfig(url, auth, verify=verify)
+    from nailgun import client
+
+    # nailgun.client takes no session, it always calls the requests module functions, so the
+    # session in the client kwargs is picked up there; calls without one are passed on unchanged
+    if not isinstance(client.requests, _PooledRequests):
+        client.requests = _PooledRequests()
+    return PooledServerConfig(url, auth, verify=verify)
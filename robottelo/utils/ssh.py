@@ -1,5 +1,13 @@
 """Utility module to handle the shared ssh connection."""
+import atexit
+from collections import defaultdict, deque
+from contextlib import contextmanager
+import os
+import threading
+import time
+
 from robottelo.cli import hammer
+from robottelo.logging import logger
 
 
 def get_client(
@@ -25,6 +33,194 @@ def get_client(
     return client
 
 
+class SSHClientPool:
+    """Per-worker pool of persistent ssh clients
+
+    Clients are keyed by ``(hostname, username, port)`` and lent out exclusively, so the same
+    ssh session is never used by two threads at once. Idle clients are closed after
+    ``max_idle`` seconds, clients idle for longer than ``health_check_interval`` seconds are
+    probed before being reused and the pool never keeps more than ``max_size`` clients around.
+
+    :param int max_size: maximum number of clients kept by this worker, 0 disables pooling
+    :param int max_idle: seconds an unused client is kept open
+    :param int health_check_interval: seconds of inactivity after which a client is probed
+    """
+
+    def __init__(self, max_size=None, max_idle=None, health_check_interval=None):
+        from robottelo.config import settings
+
+        ssh_client = settings.server.ssh_client
+        self.max_size = ssh_client.get('pool_size', 8) if max_size is None else max_size
+        self.max_idle = ssh_client.get('pool_max_idle', 300) if max_idle is None else max_idle
+        self.health_check_interval = (
+            ssh_client.get('pool_health_check_interval', 60)
+            if health_check_interval is None
+            else health_check_interval
+        )
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._idle = defaultdict(deque)  # key -> deque of (client, last_used)
+        self._size = 0  # idle and leased clients
+        self.stats = {'created': 0, 'reused': 0, 'evicted': 0, 'failed_health_checks': 0}
+
+    @staticmethod
+    def _key(hostname, username, port):
+        from robottelo.config import settings
+
+        return (
+            hostname or settings.server.hostname,
+            username or settings.server.ssh_username,
+            port or settings.server.ssh_client.port or 22,
+        )
+
+    @staticmethod
+    def _close(client):
+        try:
+            client.close()
+        except Exception as err:  # noqa: BLE001 - a dead session may fail in many ways
+            logger.debug(f'Failed to close pooled ssh client for {client.hostname}: {err}')
+
+    def _check_fork(self):
+        """Forget clients inherited from a parent process, their sockets are not ours"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle.clear()
+            self._size = 0
+
+    def _evict_expired(self, now):
+        for entries in self._idle.values():
+            while entries and now - entries[0][1] > self.max_idle:
+                client, _ = entries.popleft()
+                self._size -= 1
+                self.stats['evicted'] += 1
+                self._close(client)
+
+    def _evict_oldest(self):
+        """Close the least recently used idle client, return False if there is none"""
+        oldest_key = min(
+            (key for key, entries in self._idle.items() if entries),
+            key=lambda key: self._idle[key][0][1],
+            default=None,
+        )
+        if oldest_key is None:
+            return False
+        client, _ = self._idle[oldest_key].popleft()
+        self._size -= 1
+        self.stats['evicted'] += 1
+        self._close(client)
+        return True
+
+    def _is_healthy(self, client):
+        try:
+            # broker reads integer timeouts as milliseconds
+            return client.execute('true', timeout='30s').status == 0
+        except Exception as err:  # noqa: BLE001 - a dead session may fail in many ways
+            logger.debug(f'Pooled ssh client for {client.hostname} failed health check: {err}')
+            return False
+
+    def acquire(self, hostname=None, username=None, password=None, port=22):
+        """Lend out a client for the given host, creating it if no idle one is available"""
+        key = self._key(hostname, username, port)
+        while True:
+            with self._lock:
+                self._check_fork()
+                now = time.monotonic()
+                self._evict_expired(now)
+                entries = self._idle[key]
+                if not entries:
+                    break
+                client, last_used = entries.pop()
+            if password and client.password != password:
+                # credentials changed since the client was pooled
+                self.discard(client)
+                continue
+            if now - last_used > self.health_check_interval and not self._is_healthy(client):
+                with self._lock:
+                    self.stats['failed_health_checks'] += 1
+                self.discard(client)
+                continue
+            with self._lock:
+                self.stats['reused'] += 1
+            return client
+
+        client = get_client(hostname=key[0], username=key[1], password=password, port=key[2])
+        client._pool_key = key
+        with self._lock:
+            while self._size >= self.max_size and self._evict_oldest():
+                pass
+            self._size += 1
+            self.stats['created'] += 1
+        return client
+
+    def release(self, client):
+        """Return a client lent out by :meth:`acquire` back to the pool"""
+        with self._lock:
+            self._check_fork()
+            if self._size > self.max_size:
+                self._size -= 1
+                self.stats['evicted'] += 1
+                self._close(client)
+                return
+            self._idle[client._pool_key].append((client, time.monotonic()))
+
+    def discard(self, client):
+        """Close a client lent out by :meth:`acquire` instead of returning it to the pool"""
+        with self._lock:
+            self._size -= 1
+        self._close(client)
+
+    def close_all(self):
+        """Close every idle client kept by this pool"""
+        with self._lock:
+            for entries in self._idle.values():
+                while entries:
+                    client, _ = entries.popleft()
+                    self._size -= 1
+                    self._close(client)
+            self._idle.clear()
+
+    @contextmanager
+    def client(self, hostname=None, username=None, password=None, port=22):
+        """Context manager lending out a pooled client
+
+        The client goes back to the pool on success and is closed when the block raises, as the
+        session may have been left in an unusable state.
+        """
+        client = self.acquire(hostname=hostname, username=username, password=password, port=port)
+        try:
+            yield client
+        except BaseException:
+            self.discard(client)
+            raise
+        self.release(client)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the ssh client pool of this worker, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SSHClientPool()
+                atexit.register(_pool.close_all)
+    return _pool
+
+
+@contextmanager
+def pooled_client(hostname=None, username=None, password=None, port=22):
+    """Lend out a persistent ssh client, falling back to a new client when pooling is disabled"""
+    pool = get_pool()
+    if not pool.max_size:
+        yield get_client(hostname=hostname, username=username, password=password, port=port)
+        return
+    with pool.client(hostname=hostname, username=username, password=password, port=port) as client:
+        yield client
+
+
 def command(
     cmd,
     hostname=None,
@@ -43,14 +239,23 @@ def command(
     :param int timeout: Time to wait for the ssh command to finish.
     :param connection_timeout: Time to wait for establishing the connection.
     """
-    client = get_client(
+    with pooled_client(
         hostname=hostname,
         username=username,
         password=password,
         port=port,
-    )
-    result = client.execute(cmd, timeout=timeout)
+    ) as client:
+        result = client.execute(cmd, timeout=timeout)
+    return parse_output(result, output_format)
 
+
+def parse_output(result, output_format):
+    """Parse the stdout of a successful hammer command result in place
+
+    :param result: a result object with ``status`` and ``stdout``
+    :param str output_format: json, csv or None
+    :return: the same result object
+    """
     if output_format and result.status == 0:
         if output_format == 'csv':
             result.stdout = hammer.parse_csv(result.stdout) if result.stdout else {}
@@ -0,0 +1,143 @@
+"""Stream the output of long remote commands line by line.
+
+:func:`stream_channel` reads the stdout and stderr of a command running on an ssh channel as
+they are produced, hands every line to callbacks and to the log, and stops the command as soon
+as a line matches one of the abort patterns, instead of buffering the whole output until the
+command exits or times out.
+"""
+import codecs
+import re
+import time
+
+from robottelo.logging import logger
+
+PID_MARKER = '<<<robottelo-pid'
+POLL_INTERVAL = 0.1
+# returned by non-blocking ssh2 reads when no data is available yet
+EAGAIN = -37
+
+
+def wrap_command(command):
+    """Make ``command`` report the process id of its shell before running
+
+    The shell started by sshd leads its own process group, so killing that group stops the
+    command together with every process it started.
+    """
+    return f"echo '{PID_MARKER}' $$\n{command}"
+
+
+class OutputStream:
+    """Split the chunks read from one stream of a command into lines
+
+    :param str name: name of the stream, ``stdout`` or ``stderr``, used in the log
+    :param callback: called with every complete line, without its line ending
+    :param abort_patterns: regular expressions, the first line matching any of them is reported
+        by :meth:`feed` and :meth:`flush`
+    """
+
+    def __init__(self, name, callback=None, abort_patterns=None, hostname=None):
+        self.name = name
+        self.callback = callback
+        self.abort_patterns = [re.compile(pattern) for pattern in abort_patterns or ()]
+        self.hostname = hostname
+        self.chunks = []
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._partial = ''
+
+    @property
+    def text(self):
+        """Everything read from the stream so far"""
+        return ''.join(self.chunks)
+
+    def _line(self, line):
+        logger.debug(f'{self.hostname} {self.name}: {line}')
+        if self.callback:
+            self.callback(line)
+        return next((line for pattern in self.abort_patterns if pattern.search(line)), None)
+
+    def feed(self, data):
+        """Handle a chunk of output, return the first complete line matching an abort pattern"""
+        text = self._decoder.decode(data) if isinstance(data, bytes) else data
+        self.chunks.append(text)
+        *lines, self._partial = (self._partial + text).split('\n')
+        for line in lines:
+            if (match := self._line(line.rstrip('\r'))) is not None:
+                return match
+        return None
+
+    def flush(self):
+        """Handle the last line of the stream when it has no line ending"""
+        if tail := self._decoder.decode(b'', final=True):
+            self.chunks.append(tail)
+            self._partial += tail
+        line, self._partial = self._partial, ''
+        return self._line(line) if line else None
+
+
+def stream_channel(
+    channel,
+    on_stdout=None,
+    on_stderr=None,
+    abort_patterns=None,
+    timeout=0,
+    kill=None,
+    hostname=None,
+):
+    """Read a command from a non-blocking channel until it exits, times out or is aborted
+
+    :param channel: ssh2 channel running a command made by :func:`wrap_command`
+    :param on_stdout: called with every line of stdout
+    :param on_stderr: called with every line of stderr
+    :param abort_patterns: regular expressions, the command is stopped as soon as a line of
+        its stdout or stderr matches one of them
+    :param float timeout: seconds to wait for the command, 0 to wait indefinitely
+    :param kill: called with the process id of the command to stop it
+    :return: tuple ``(stdout, stderr, status, aborted_by)``, ``status`` is None if the command
+        was stopped and ``aborted_by`` is the line which matched an abort pattern
+    :raises TimeoutError: when the command did not exit within ``timeout``
+    """
+    stdout = OutputStream('stdout', on_stdout, abort_patterns, hostname)
+    stderr = OutputStream('stderr', on_stderr, abort_patterns, hostname)
+    deadline = time.monotonic() + timeout if timeout else None
+    pid = None
+    header = b''
+    aborted_by = None
+
+    def feed_stdout(data):
+        nonlocal pid, header
+        if pid is None:
+            # hold stdout back until the line reporting the process id is complete
+            header += data
+            if b'\n' not in header:
+                return None
+            marker, data = header.split(b'\n', 1)
+            pid = int(marker.decode().removeprefix(PID_MARKER).strip() or 0)
+        return stdout.feed(data)
+
+    while aborted_by is None:
+        out_size, out_data = channel.read()
+        err_size, err_data = channel.read_stderr()
+        if out_size > 0:
+            aborted_by = feed_stdout(out_data)
+        if err_size > 0 and aborted_by is None:
+            aborted_by = stderr.feed(err_data)
+        if out_size > 0 or err_size > 0:
+            continue
+        if out_size not in (0, EAGAIN) or err_size not in (0, EAGAIN):
+            raise ConnectionError(f'Failed to read the command output from {hostname}')
+        if channel.eof():
+            stdout_line, stderr_line = stdout.flush(), stderr.flush()
+            aborted_by = stdout_line or stderr_line
+            break
+        if deadline and time.monotonic() > deadline:
+            if pid and kill:
+                kill(pid)
+            raise TimeoutError(f'Command did not finish on {hostname} within {timeout} seconds')
+        time.sleep(POLL_INTERVAL)
+
+    if aborted_by is not None and not channel.eof():
+        logger.warning(f'Stopping the command on {hostname}, its output matched: {aborted_by}')
+        if pid and kill:
+            kill(pid)
+        return stdout.text, stderr.text, None, aborted_by
+    return stdout.text, stderr.text, channel.get_exit_status(), aborted_by
@@ -0,0 +1,137 @@
+"""Local database of test durations, kept in a SQLite file.
+
+Durations of the setup, call and teardown phases of every test are stored as moving averages,
+so estimates follow the recent runs. When the tests of a module run together on one worker, the
+setup of the first one pays for the module-scoped fixtures, it is stored as the fixture cost of
+the module instead of as the setup of that test.
+"""
+from contextlib import closing
+import sqlite3
+import statistics
+import threading
+import time
+
+PHASES = ('setup', 'call', 'teardown')
+# weight of the latest run in the moving averages
+SMOOTHING = 0.5
+# estimated duration of a test which never ran, when there is no other test to compare with
+DEFAULT_DURATION = 1.0
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS test_timings (
+    nodeid TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    duration REAL NOT NULL,
+    runs INTEGER NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (nodeid, phase)
+);
+CREATE TABLE IF NOT EXISTS module_costs (
+    module TEXT PRIMARY KEY,
+    duration REAL NOT NULL,
+    runs INTEGER NOT NULL,
+    updated REAL NOT NULL
+);
+'''
+
+
+def module_of(nodeid):
+    """Module part of a test nodeid"""
+    return nodeid.split('::', 1)[0]
+
+
+class TimingDB:
+    """Test and module fixture durations kept in the SQLite file at ``path``"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    @staticmethod
+    def _upsert(conn, table, key_column, key, duration, extra=None):
+        extra = extra or {}
+        columns = [key_column, *extra]
+        where = ' AND '.join(f'{column} = ?' for column in columns)
+        row = conn.execute(
+            f'SELECT duration, runs FROM {table} WHERE {where}', (key, *extra.values())
+        ).fetchone()
+        if row:
+            duration = SMOOTHING * duration + (1 - SMOOTHING) * row[0]
+        conn.execute(
+            f'INSERT OR REPLACE INTO {table} ({", ".join(columns)}, duration, runs, updated) '
+            f'VALUES ({", ".join("?" * len(columns))}, ?, ?, ?)',
+            (key, *extra.values(), duration, (row[1] if row else 0) + 1, time.time()),
+        )
+
+    def record(self, nodeid, phase, duration):
+        """Add the duration in seconds of a phase of a test"""
+        with self._lock, closing(self._connect()) as conn, conn:
+            self._upsert(conn, 'test_timings', 'nodeid', nodeid, duration, {'phase': phase})
+
+    def record_module(self, module, duration):
+        """Add the duration in seconds of the module-scoped fixtures of a module"""
+        with self._lock, closing(self._connect()) as conn, conn:
+            self._upsert(conn, 'module_costs', 'module', module, duration)
+
+    def test_durations(self):
+        """Return the estimated duration of every known test, all phases together"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute('SELECT nodeid, SUM(duration) FROM test_timings GROUP BY nodeid')
+            return dict(rows.fetchall())
+
+    def module_costs(self):
+        """Return the estimated cost of the module-scoped fixtures of every known module"""
+        with closing(self._connect()) as conn:
+            return dict(conn.execute('SELECT module, duration FROM module_costs').fetchall())
+
+    def estimate_modules(self, nodeids):
+        """Estimate how long the tests of each module take, module-scoped fixtures included
+
+        Tests which never ran are estimated at the median duration of the known tests.
+
+        :param nodeids: nodeids of the tests to run
+        :return: dict of the estimated duration of every module
+        """
+        durations = self.test_durations()
+        default = statistics.median(durations.values()) if durations else DEFAULT_DURATION
+        estimates = dict.fromkeys(map(module_of, nodeids), 0.0)
+        for module, cost in self.module_costs().items():
+            if module in estimates:
+                estimates[module] += cost
+        for nodeid in nodeids:
+            estimates[module_of(nodeid)] += durations.get(nodeid, default)
+        return estimates
+
+
+class TimingRecorder:
+    """Feed a :class:`TimingDB` with test reports
+
+    With ``module_costs``, for runs keeping the tests of a module together, the first test each
+    worker runs in a module is recognized as the one paying for the module-scoped fixtures. The
+    reports of different workers are told apart by ``worker``. Under scheduling spreading the
+    tests of a module over the workers, a module switch doesn't say when the fixtures were set
+    up, so every setup is recorded as the setup of its test.
+    """
+
+    def __init__(self, db, module_costs=False):
+        self.db = db
+        self.module_costs = module_costs
+        self._last_module = {}
+
+    def add_report(self, report, worker=None):
+        """Record the duration of the phase a ``pytest_runtest_logreport`` report is about"""
+        if report.when not in PHASES or report.skipped:
+            return
+        module = module_of(report.nodeid)
+        if self.module_costs and report.when == 'setup' and self._last_module.get(worker) != module:
+            self._last_module[worker] = module
+            self.db.record_module(module, report.duration)
+            return
+        self.db.record(report.nodeid, report.when, report.duration)
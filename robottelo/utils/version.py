@@ -1,7 +1,12 @@
 # Utility methods and classes related to Satellite/foreman version handling
+import contextlib
 import json
+import os
+from pathlib import Path
+import time
 
 from packaging.version import Version
+from pytest_services.locks import file_lock
 
 
 def search_version_key(key, value):  # pragma: no cover
@@ -22,3 +27,64 @@ class VersionEncoder(json.JSONEncoder):  # pragma: no cover
         if isinstance(z, Version):
             return str(z)
         return super().default(z)
+
+
+class VersionCache:
+    """Versions of hosts kept in a json file shared by the processes of a test run
+
+    Each version is stored under the hostname and the name of the version, with the time it was
+    resolved at. Versions older than ``ttl`` seconds are resolved again.
+
+    :param path: path of the json file
+    :param int ttl: seconds a version is used for, 0 to keep them forever
+    """
+
+    def __init__(self, path, ttl=3600, lock_timeout=300):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+
+    def _read(self):
+        try:
+            return json.loads(self.path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def get(self, hostname, name):
+        """Return the cached version
+
+        :raises KeyError: if there is no version or it is older than ``ttl``
+        """
+        entry = self._read().get(hostname, {}).get(name)
+        if entry is None or (self.ttl and entry['resolved'] + self.ttl <= time.time()):
+            raise KeyError((hostname, name))
+        return Version(entry['version'])
+
+    def set(self, hostname, name, version):
+        with file_lock(f'{self.path}.lock', remove=False, timeout=self.lock_timeout):
+            self._write(hostname, name, version)
+
+    def _write(self, hostname, name, version):
+        contents = self._read()
+        contents.setdefault(hostname, {})[name] = {'version': str(version), 'resolved': time.time()}
+        # write to a temporary file first so readers never see a partial file
+        temp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}')
+        temp_path.write_text(json.dumps(contents, indent=2, sort_keys=True))
+        os.replace(temp_path, self.path)
+
+    def resolve(self, hostname, name, resolver):
+        """Return the cached version, or resolve and cache it when there is none
+
+        Only one process resolves a missing version, the others wait for it and use its result.
+
+        :param resolver: callable returning the :class:`packaging.version.Version`
+        """
+        with contextlib.suppress(KeyError):
+            return self.get(hostname, name)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(f'{self.path}.lock', remove=False, timeout=self.lock_timeout):
+            with contextlib.suppress(KeyError):
+                return self.get(hostname, name)
+            version = resolver()
+            self._write(hostname, name, version)
+        return version
@@ -14,6 +14,7 @@ from robottelo.cli.host import Host
 from robottelo.cli.virt_who_config import VirtWhoConfig
 from robottelo.config import settings
 from robottelo.constants import DEFAULT_ORG
+from robottelo.utils.remote_script import run_script
 
 ETC_VIRTWHO_CONFIG = "/etc/virt-who.conf"
 
@@ -87,6 +88,26 @@ def runcmd(cmd, system=None, timeout=600000, output_format='base'):
     return result.status, result.stdout.strip()
 
 
+def runscript(steps, system=None, timeout=600000, stop_on_error=False):
+    """Run several commands in a single ssh round trip and return the result of every step.
+
+    :param list steps: The command lines to be executed one after the other in the target system.
+    :param dict system: the system account which ssh will connect to,
+        it will connect to the satellite host if the system is None.
+    :param int timeout: Time to wait for establish the connection.
+    :param bool stop_on_error: Do not run the commands following a failed one.
+    :return: :class:`robottelo.utils.remote_script.ScriptResult`, the status and stripped
+        stdout of each step like :func:`runcmd`
+    """
+    system = system or get_system('satellite')
+    result = run_script(
+        lambda cmd: ssh.command(cmd, **system, timeout=timeout), steps, stop_on_error=stop_on_error
+    )
+    for step in result:
+        step.stdout = step.stdout.strip()
+    return result
+
+
 def register_system(system, activation_key=None, org='Default_Organization', env='Library'):
     """Return True if the system is registered to satellite successfully.
 
@@ -96,15 +117,6 @@ def register_system(system, activation_key=None, org='Default_Organization', env
     :param str env: Which environment will be used to register.
     :raises: VirtWhoError: If failed to register the system.
     """
-    runcmd('subscription-manager unregister', system)
-    runcmd('subscription-manager clean', system)
-    runcmd('rpm -qa | grep katello-ca-consumer | xargs rpm -e |sort', system)
-    runcmd(
-        'rpm -ihv http://{}/pub/katello-ca-consumer-latest.noarch.rpm'.format(
-            settings.server.hostname
-        ),
-        system,
-    )
     cmd = f'subscription-manager register --org={org} --environment={env} '
     if activation_key is not None:
         cmd += f'--activationkey={activation_key}'
@@ -112,8 +124,19 @@ def register_system(system, activation_key=None, org='Default_Organization', env
         cmd += '--username={} --password={}'.format(
             settings.server.admin_username, settings.server.admin_password
         )
-    ret, stdout = runcmd(cmd, system)
-    if ret == 0 or "system has been registered" in stdout:
+    *_, register = runscript(
+        [
+            'subscription-manager unregister',
+            'subscription-manager clean',
+            'rpm -qa | grep katello-ca-consumer | xargs rpm -e |sort',
+            'rpm -ihv http://{}/pub/katello-ca-consumer-latest.noarch.rpm'.format(
+                settings.server.hostname
+            ),
+            cmd,
+        ],
+        system,
+    )
+    if register.status == 0 or "system has been registered" in register.stdout:
         return True
     else:
         raise VirtWhoError(f'Failed to register system: {system}')
@@ -127,12 +150,16 @@ def virtwho_cleanup():
     3. clean rhsm.log message, make sure there is no old message exist.
     4. clean all the configure files in /etc/virt-who.d/
     """
-    runcmd("systemctl stop virt-who")
-    runcmd("pkill -9 virt-who")
-    runcmd("rm -f /var/run/virt-who.pid")
-    runcmd("rm -f /var/log/rhsm/rhsm.log")
-    runcmd("rm -rf /etc/virt-who.d/*")
-    runcmd("rm -rf /tmp/deploy_script.sh")
+    runscript(
+        [
+            "systemctl stop virt-who",
+            "pkill -9 virt-who",
+            "rm -f /var/run/virt-who.pid",
+            "rm -f /var/log/rhsm/rhsm.log",
+            "rm -rf /etc/virt-who.d/*",
+            "rm -rf /tmp/deploy_script.sh",
+        ]
+    )
 
 
 def get_virtwho_status():
@@ -0,0 +1,132 @@
+"""Tests for the lazy nailgun entities behind ``Satellite.api``"""
+import functools
+import sys
+import time
+import types
+
+import nailgun
+from nailgun.entity_mixins import Entity
+import pytest
+
+from robottelo.host_helpers import api_registry
+
+# roughly the number of entities in nailgun.entities
+ENTITY_COUNT = 300
+
+
+def make_entities_module():
+    """Build a stand-in for :mod:`nailgun.entities`"""
+
+    class Organization(Entity):
+        def __init__(self, server_config=None, **kwargs):
+            self._server_config = server_config
+            self.__dict__.update(kwargs)
+
+    module = types.ModuleType('nailgun.entities')
+    module.Entity = Entity
+    module.Organization = Organization
+    module._OPERATING_SYSTEMS = ('redhat',)
+    module.some_helper = lambda: None
+    for i in range(ENTITY_COUNT):
+        setattr(module, f'Entity{i}', type(f'Entity{i}', (Organization,), {}))
+    return module
+
+
+@pytest.fixture
+def fake_entities(monkeypatch):
+    module = make_entities_module()
+    monkeypatch.setattr(nailgun, 'entities', module, raising=False)
+    monkeypatch.setitem(sys.modules, 'nailgun.entities', module)
+    api_registry.clear_api_namespaces()
+    yield module
+    api_registry.clear_api_namespaces()
+
+
+def legacy_api(url, auth, verify):
+    """The eager ``Satellite.api`` build this registry replaced"""
+    from nailgun import entities as _entities
+    from nailgun.config import ServerConfig
+
+    def inject_config(cls, server_config):
+        class DecClass(cls):
+            __init__ = functools.partialmethod(cls.__init__, server_config=server_config)
+
+        return DecClass
+
+    api = type('api', (), {'_configured': False})
+    nailgun_cfg = ServerConfig(auth=auth, url=url, verify=verify)
+    for name, obj in _entities.__dict__.items():
+        try:
+            if Entity in obj.mro():
+                new_cls = type(name, (obj,), {})
+                setattr(api, name, inject_config(new_cls, nailgun_cfg))
+        except AttributeError:
+            pass
+    api._configured = True
+    return api
+
+
+class TestAPINamespace:
+    def test_entity_bound_on_first_access(self, fake_entities):
+        api = api_registry.api_namespace('https://sat.example.com', ('admin', 'changeme'), False)
+        assert 'Organization' not in vars(api)
+        org = api.Organization(name='org')
+        assert issubclass(api.Organization, fake_entities.Organization)
+        assert api.Organization.__name__ == 'Organization'
+        assert org._server_config is api.server_config
+        assert org.name == 'org'
+        assert api.server_config.url == 'https://sat.example.com'
+        assert api.server_config.auth == ('admin', 'changeme')
+        # the bound class is kept, other entities are still untouched
+        assert api.Organization is api.Organization
+        assert 'Entity0' not in vars(api)
+
+    def test_explicit_server_config(self, fake_entities):
+        api = api_registry.api_namespace('https://sat.example.com', ('admin', 'changeme'), False)
+        other_config = object()
+        assert api.Organization(server_config=other_config)._server_config is other_config
+
+    def test_not_an_entity(self, fake_entities):
+        api = api_registry.api_namespace('https://sat.example.com', ('admin', 'changeme'), False)
+        for name in ('_OPERATING_SYSTEMS', 'some_helper', 'Missing'):
+            with pytest.raises(AttributeError):
+                getattr(api, name)
+        assert hasattr(api, 'Entity')
+
+    def test_shared_per_url(self, fake_entities):
+        auth = ('admin', 'changeme')
+        api = api_registry.api_namespace('https://sat.example.com', auth, False)
+        assert api_registry.api_namespace('https://sat.example.com', list(auth), False) is api
+        other = api_registry.api_namespace('https://other.example.com', auth, False)
+        assert other is not api
+        assert other.Organization is not api.Organization
+        assert other.Organization()._server_config.url == 'https://other.example.com'
+        api_registry.clear_api_namespaces()
+        assert api_registry.api_namespace('https://sat.example.com', auth, False) is not api
+
+    def test_dir(self, fake_entities):
+        api = api_registry.api_namespace('https://sat.example.com', ('admin', 'changeme'), False)
+        names = dir(api)
+        assert {'Organization', 'Entity', 'Entity0', 'server_config'} <= set(names)
+        assert 'some_helper' not in names
+
+
+@pytest.mark.benchmark
+def test_first_entity_benchmark(fake_entities, record_property):
+    """Binding only the used entity is cheaper than binding every nailgun entity"""
+    rounds = 20
+    args = ('https://sat.example.com', ('admin', 'changeme'), False)
+    legacy = []
+    current = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        legacy_entity = legacy_api(*args).Organization
+        legacy.append(time.perf_counter() - start)
+        api_registry.clear_api_namespaces()
+        start = time.perf_counter()
+        entity = api_registry.api_namespace(*args).Organization
+        current.append(time.perf_counter() - start)
+    assert entity.__mro__[1:] == legacy_entity.__mro__[2:]
+    record_property('legacy_seconds', min(legacy))
+    record_property('current_seconds', min(current))
+    assert min(current) < min(legacy)
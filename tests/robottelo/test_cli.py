@@ -1,16 +1,27 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
+import gc
+import threading
+import time
+from types import SimpleNamespace
 import unittest
 from unittest import mock
+import weakref
 
 import pytest
 
-from robottelo.cli.base import Base
+from robottelo.cli import host_registration
+from robottelo.cli.base import Base, HammerCommand
+from robottelo.cli.hammer_cache import HammerCache
+from robottelo.cli.host_registration import HostRegistration
 from robottelo.exceptions import (
     CLIBaseError,
     CLIDataBaseError,
     CLIError,
     CLIReturnCodeError,
 )
+from robottelo.host_helpers.cli_factory import create_object
 
 
 class CLIClass(Base):
@@ -38,6 +49,74 @@ class BaseCliTestCase(unittest.TestCase):
         assert '--flag-two' not in command_parts
         assert len(command_parts) == 4
 
+    def test_construct_command_snapshot(self):
+        """_construct_command returns an immutable command unaffected by later changes"""
+
+        class Entity(Base):
+            command_base = 'entity'
+
+        Entity.command_sub = 'info'
+        command = Entity._construct_command({'id': 1})
+        Entity.command_sub = 'delete'
+
+        assert isinstance(command, HammerCommand)
+        assert command.split() == ['entity', 'info', '--id="1"']
+        assert command.command_sub == 'info'
+        assert command.options == {'id': 1}
+        with pytest.raises(AttributeError):
+            command.command_sub = 'delete'
+        with pytest.raises(TypeError):
+            command.options['id'] = 2
+
+    def test_command_attributes_thread_local(self):
+        """Subcommands set by concurrent threads on the same entity do not interfere"""
+
+        class Entity(Base):
+            command_base = 'entity'
+            command_end = 'default-end'
+
+        Entity.command_sub = 'list'
+        barrier = threading.Barrier(2)
+
+        def build(sub):
+            Entity.command_sub = sub
+            # both threads have set command_sub before either builds its command
+            barrier.wait()
+            return Entity._construct_command({'name': sub})
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            info, delete = executor.map(build, ['info', 'delete'])
+
+        assert info.split() == ['entity', 'info', '--name="info"', 'default-end']
+        assert delete.split() == ['entity', 'delete', '--name="delete"', 'default-end']
+        assert Entity.command_sub == 'list'
+
+    def test_command_attributes_inheritance(self):
+        """Subcommands set on a subclass do not leak to the parent class"""
+
+        class Entity(Base):
+            command_base = 'entity'
+
+        Entity.command_sub = 'list'
+        wrapper = Entity.with_user('user', 'password')
+        assert wrapper.command_sub == 'list'
+        wrapper.command_sub = 'info'
+        assert wrapper.command_sub == 'info'
+        assert Entity.command_sub == 'list'
+
+    def test_command_attributes_release_classes(self):
+        """Classes a subcommand was set on are not kept alive by the command state"""
+
+        class Entity(Base):
+            command_base = 'entity'
+
+        wrapper = Entity.with_user('user', 'password')
+        wrapper.command_sub = 'info'
+        wrapper = weakref.ref(wrapper)
+        gc.collect()
+        assert wrapper() is None
+        assert Entity.command_sub == Base.command_sub
+
     def test_username_password_parameters_lookup(self):
         """Username and password returned are the parameters"""
         username, password = CLIClass._get_username_password('auser', 'apass')
@@ -283,12 +362,96 @@ class BaseCliTestCase(unittest.TestCase):
         handle_resp.assert_called_once_with(command.return_value, ignore_stderr=None)
         assert response is handle_resp.return_value
 
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.hammer_shell')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_with_hammer_shell(self, settings, hammer_shell, command):
+        """Check execute sends the command to the persistent hammer driver"""
+        settings.robottelo.locale = 'en_US'
+        settings.performance.time_hammer = False
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        hammer_shell.enabled.return_value = True
+        response = Base.execute('some_cmd', hostname='sat.example.com', return_raw_response=True)
+        hammer_shell.command.assert_called_once_with(
+            '-v -u admin -p password  some_cmd',
+            hostname='sat.example.com',
+            env={'LANG': 'en_US'},
+            output_format=None,
+            timeout=None,
+            user='admin',
+        )
+        command.assert_not_called()
+        assert response is hammer_shell.command.return_value
+
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.hammer_shell')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_hammer_shell_fallback(self, settings, hammer_shell, command):
+        """Check execute uses plain ssh when the hammer driver can't run the command"""
+        settings.robottelo.locale = 'en_US'
+        settings.performance.time_hammer = False
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        hammer_shell.enabled.return_value = True
+        hammer_shell.command.return_value = None
+        response = Base.execute('some_cmd', return_raw_response=True)
+        ssh_cmd = 'LANG=en_US  hammer -v -u admin -p password  some_cmd'
+        command.assert_called_once_with(
+            ssh_cmd.encode('utf-8'),
+            hostname=mock.ANY,
+            output_format=None,
+            timeout=None,
+        )
+        assert response is command.return_value
+
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.auth.sessions')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_with_hammer_session(self, settings, sessions, command):
+        """Check execute reuses a hammer session instead of passing credentials"""
+        settings.robottelo.locale = 'en_US'
+        settings.performance.time_hammer = False
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        sessions.enabled.return_value = True
+        sessions.options.return_value = ({'HOME': '/root/s'}, '-c /root/s/sessions.yml')
+        command.return_value.status = 0
+        response = Base.execute('some_cmd', hostname='sat.example.com', return_raw_response=True)
+        sessions.options.assert_called_once_with('sat.example.com', 'admin', 'password')
+        ssh_cmd = 'LANG=en_US HOME=/root/s  hammer -v -c /root/s/sessions.yml   some_cmd'
+        command.assert_called_once_with(
+            ssh_cmd.encode('utf-8'),
+            hostname='sat.example.com',
+            output_format=None,
+            timeout=None,
+        )
+        assert response is command.return_value
+
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.auth.sessions')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_with_expired_hammer_session(self, settings, sessions, command):
+        """Check execute passes credentials again when the hammer session is not usable"""
+        settings.robottelo.locale = 'en_US'
+        settings.performance.time_hammer = False
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        sessions.enabled.return_value = True
+        sessions.options.return_value = ({'HOME': '/root/s'}, '-c /root/s/sessions.yml')
+        sessions.is_session_error.return_value = True
+        command.return_value.status = 129
+        Base.execute('some_cmd', hostname='sat.example.com', return_raw_response=True)
+        sessions.invalidate.assert_called_once_with('sat.example.com', 'admin')
+        assert command.call_count == 2
+        assert command.call_args[0][0] == b'LANG=en_US  hammer -v -u admin -p password  some_cmd'
+
     @mock.patch('robottelo.cli.base.Base.list')
     def test_exists_without_option_and_empty_return(self, lst_method):
         """Check exists method without options and empty return"""
         lst_method.return_value = []
         response = Base.exists(search=['id', 1])
-        lst_method.assert_called_once_with({'search': 'id=\\"1\\"'})
+        lst_method.assert_called_once_with({'search': 'id=\\"1\\"', 'per-page': 1, 'page': 1})
         assert [] == response
 
     @mock.patch('robottelo.cli.base.Base.list')
@@ -297,9 +460,47 @@ class BaseCliTestCase(unittest.TestCase):
         lst_method.return_value = [1, 2]
         my_options = {'search': 'foo=bar'}
         response = Base.exists(my_options, search=['id', 1])
-        lst_method.assert_called_once_with(my_options)
+        lst_method.assert_called_once_with({'search': 'foo=bar', 'per-page': 1, 'page': 1})
         assert 1 == response
 
+    @mock.patch('robottelo.cli.base.Base.list')
+    def test_iter_list_pages(self, lst_method):
+        """Check iter_list requests pages until a short one is returned"""
+        pages = {1: [1, 2], 2: [3, 4], 3: [5]}
+        lst_method.side_effect = lambda options: pages[options['page']]
+        assert list(Base.iter_list({'search': 'foo=bar'}, per_page=2)) == [1, 2, 3, 4, 5]
+        assert lst_method.call_args_list == [
+            mock.call({'search': 'foo=bar', 'per-page': 2, 'page': page}) for page in (1, 2, 3)
+        ]
+
+    @mock.patch('robottelo.cli.base.Base.list')
+    def test_iter_list_early_stop(self, lst_method):
+        """Check iter_list doesn't request pages which are not consumed"""
+        lst_method.side_effect = lambda options: [options['page']] * 2
+        rows = Base.iter_list({'per-page': 2})
+        assert [next(rows), next(rows), next(rows)] == [1, 1, 2]
+        assert lst_method.call_count == 2
+
+    @mock.patch('robottelo.cli.base.Base.list')
+    def test_iter_list_page_ignored(self, lst_method):
+        """Check iter_list stops when the endpoint ignores the page option"""
+        lst_method.return_value = [1, 2]
+        assert list(Base.iter_list(per_page=2)) == [1, 2]
+        assert lst_method.call_count == 2
+
+    def test_iter_list_per_page_opt_out(self):
+        """Check iter_list lists entities opting out of per-page in a single call"""
+
+        class Entity(Base):
+            @classmethod
+            def list(cls, options=None, per_page=False):
+                return super().list(options, per_page=per_page)
+
+        with mock.patch('robottelo.cli.base.Base.execute', return_value=[1, 2, 3]) as execute:
+            assert list(Entity.iter_list({'search': 'foo=bar'}, per_page=2)) == [1, 2, 3]
+        execute.assert_called_once()
+        assert execute.call_args.args[0].options == {'search': 'foo=bar'}
+
     @mock.patch('robottelo.cli.base.Base.command_requires_org')
     def test_info_requires_organization_id(self, _):  # noqa: PT019 - not a fixture
         """Check info raises CLIError with organization-id is not present in
@@ -393,6 +594,45 @@ class BaseCliTestCase(unittest.TestCase):
         self.assert_cmd_execution(construct, execute, Base.update, 'update')
 
 
+class TestJSONCreate:
+    """Tests for skipping the info call after a JSON create"""
+
+    @mock.patch('robottelo.cli.base.Base.info')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_json_create_without_info(self, settings, execute, info, monkeypatch):
+        """Check the JSON create response is returned when it has all required fields"""
+        settings.performance.get.return_value = True
+        execute.return_value = {'message': 'Created.', 'id': '1', 'name': 'foo'}
+        monkeypatch.setattr(Base, 'command_requires_org', False)
+        assert Base.create({'name': 'foo'}, fields=('id', 'name')) == execute.return_value
+        assert execute.call_args.kwargs['output_format'] == 'json'
+        assert not info.called
+
+    @mock.patch('robottelo.cli.base.Base.info')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_json_create_with_missing_fields(self, settings, execute, info, monkeypatch):
+        """Check the record is fetched with info when the JSON create response is incomplete"""
+        settings.performance.get.return_value = True
+        execute.return_value = {'message': 'Created.', 'id': '1', 'name': 'foo'}
+        info.return_value = {'id': '1', 'name': 'foo', 'label': 'foo'}
+        monkeypatch.setattr(Base, 'command_requires_org', False)
+        assert Base.create({'name': 'foo'}, fields=('id', 'label')) == info.return_value
+        info.assert_called_once_with({'id': '1'})
+        info.reset_mock()
+        # entities don't declare their create response fields by default
+        assert Base.create({'name': 'foo'}) == info.return_value
+        info.assert_called_once_with({'id': '1'})
+
+    @mock.patch('robottelo.cli.base.Base.create')
+    def test_factory_passes_fields(self, create):
+        """Check the CLI factory passes the fields it needs to create"""
+        create.return_value = {'id': '1'}
+        assert create_object(Base, {'name': 'foo'}, fields=('id',)) == {'id': '1'}
+        create.assert_called_once_with({'name': 'foo'}, fields=('id',))
+
+
 class CLIErrorTests(unittest.TestCase):
     """Tests for the CLIError cli class"""
 
@@ -428,3 +668,385 @@ class CLIBaseErrorTestCase(unittest.TestCase):
         """Check if message is exposed to assertRaisesRegex"""
         with pytest.raises(CLIBaseError, match='msg'):
             raise CLIBaseError(1, 'stderr', 'msg')
+
+
+@mock.patch('robottelo.cli.auth.ssh.command')
+class TestHammerSessions:
+    """Tests for the hammer session cache"""
+
+    def test_login_once(self, command):
+        from robottelo.cli.auth import HammerSessions
+
+        command.return_value.status = 0
+        command.return_value.stdout = '/root/.robottelo-hammer\n'
+        sessions = HammerSessions()
+        env, options = sessions.options('sat.example.com', 'admin', 'changeme')
+        assert env['HOME'].startswith('/root/.robottelo-hammer/')
+        assert options == f'-c {env["HOME"]}/sessions.yml'
+        assert sessions.options('sat.example.com', 'admin', 'changeme') == (env, options)
+        # one call to find the home directory and one to log in
+        assert command.call_count == 2
+        assert 'auth login basic --username=admin --password=changeme' in command.call_args[0][0]
+
+    def test_login_password_quoted(self, command):
+        from robottelo.cli.auth import HammerSessions
+
+        command.return_value.status = 0
+        command.return_value.stdout = '/root/.robottelo-hammer\n'
+        HammerSessions().options('sat.example.com', 'admin', 'pa"ss $(id)')
+        assert command.call_args[0][0].endswith('''--password='pa"ss $(id)\'''')
+
+    def test_logins_per_user(self, command):
+        from robottelo.cli.auth import HammerSessions
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        def run(cmd, hostname):
+            if 'auth login' in cmd:
+                # both logins are running at the same time
+                barrier.wait()
+            return SimpleNamespace(status=0, stdout='/root/.robottelo-hammer\n', stderr='')
+
+        command.side_effect = run
+        sessions = HammerSessions()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(
+                executor.map(
+                    partial(sessions.options, 'sat.example.com'), ['admin', 'viewer'], ['a', 'b']
+                )
+            )
+        assert all(results)
+
+    def test_login_again_on_password_change(self, command):
+        from robottelo.cli.auth import HammerSessions
+
+        command.return_value.status = 0
+        command.return_value.stdout = '/root/.robottelo-hammer\n'
+        sessions = HammerSessions()
+        sessions.options('sat.example.com', 'admin', 'changeme')
+        sessions.options('sat.example.com', 'admin', 'newpassword')
+        assert command.call_count == 3
+        sessions.invalidate('sat.example.com')
+        sessions.options('sat.example.com', 'admin', 'newpassword')
+        assert command.call_count == 4
+
+    def test_failed_login(self, command):
+        from robottelo.cli.auth import HammerSessions
+
+        command.return_value.status = 1
+        sessions = HammerSessions()
+        assert sessions.options('sat.example.com', 'admin', 'wrong') is None
+
+    def test_auth_commands_not_supported(self, command):
+        from robottelo.cli.auth import Auth, HammerSessions
+
+        assert HammerSessions.supports(Base)
+        assert not HammerSessions.supports(Auth)
+        assert not HammerSessions.supports(
+            type('Omitting', (Base,), {'omitting_credentials': True})
+        )
+
+
+class TestExecuteMany:
+    """Tests for running hammer calls concurrently"""
+
+    class Entity(Base):
+        command_base = 'entity'
+
+        @classmethod
+        def add_repository(cls, options=None):
+            cls.command_sub = 'add-repository'
+            return cls.execute(cls._construct_command(options))
+
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_results_in_order(self, execute):
+        execute.side_effect = lambda command, **kwargs: command.split()
+        calls = [(self.Entity, 'add-repository', {'id': i}) for i in range(10)]
+        results = Base.execute_many(calls, max_workers=4)
+        assert results == [['entity', 'add-repository', f'--id="{i}"'] for i in range(10)]
+
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_subcommand_names(self, execute):
+        execute.side_effect = lambda command, **kwargs: command.command_sub
+        results = Base.execute_many(
+            [(self.Entity, 'add-repository', {}), (self.Entity, 'add_repository')]
+        )
+        assert results == ['add-repository', 'add-repository']
+
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_per_item_errors(self, execute):
+        errors = {
+            'fails': CLIReturnCodeError(1, 'error', 'msg'),
+            'db': CLIDataBaseError(1, 'INSERT INTO', 'msg'),
+        }
+
+        def execute_command(command, **kwargs):
+            if command.options['name'] in errors:
+                raise errors[command.options['name']]
+            return command.options['name']
+
+        execute.side_effect = execute_command
+        results = Base.execute_many(
+            [
+                (self.Entity, 'add-repository', {'name': name})
+                for name in ('ok', 'fails', 'db', 'ok2')
+            ]
+        )
+        assert results == ['ok', errors['fails'], errors['db'], 'ok2']
+
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_bounded_concurrency(self, execute):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def execute_command(command, **kwargs):
+            with lock:
+                running.append(command)
+                peak.append(len(running))
+            threading.Event().wait(0.01)
+            with lock:
+                running.remove(command)
+
+        execute.side_effect = execute_command
+        Base.execute_many(
+            [(self.Entity, 'add-repository', {'id': i}) for i in range(12)], max_workers=3
+        )
+        assert max(peak) <= 3
+        assert execute.call_count == 12
+
+    def test_no_calls(self):
+        assert Base.execute_many([]) == []
+
+
+class TestConcurrentEntities:
+    """Tests for entities switching their command attributes for a single call"""
+
+    def test_template_sync(self):
+        from robottelo.cli.template_sync import TemplateSync
+
+        barrier = threading.Barrier(2, timeout=5)
+        construct = Base._construct_command.__func__
+
+        def construct_together(cls, options=None):
+            # both threads have set command_base before either builds its command
+            barrier.wait()
+            return construct(cls, options)
+
+        with (
+            mock.patch.object(TemplateSync, '_construct_command', classmethod(construct_together)),
+            mock.patch.object(Base, 'execute', side_effect=lambda command: command.command_base),
+            ThreadPoolExecutor(max_workers=2) as executor,
+        ):
+            exports = executor.submit(TemplateSync.exports)
+            imports = executor.submit(TemplateSync.imports)
+            assert (exports.result(), imports.result()) == ('export-templates', 'import-templates')
+
+    def test_repository_create_and_info(self):
+        from robottelo.cli.repository import Repository
+
+        barrier = threading.Barrier(2, timeout=5)
+        info_done = threading.Event()
+
+        def execute(command, **kwargs):
+            if command.command_sub == 'create':
+                barrier.wait()
+                # the info call of the other thread restores command_requires_org meanwhile
+                info_done.wait(5)
+                return [{'id': '1'}]
+            if command.options['id'] == '2':
+                barrier.wait()
+            return 'Id: 1\n'
+
+        with (
+            mock.patch.object(Base, 'execute', side_effect=execute),
+            mock.patch('robottelo.cli.base.settings') as settings,
+            ThreadPoolExecutor(max_workers=2) as executor,
+        ):
+            settings.performance.get.return_value = False
+            created = executor.submit(Repository.create, {'name': 'repo'})
+            executor.submit(Repository.info, {'id': '2'}).result()
+            info_done.set()
+            assert created.result() == {'id': '1'}
+        assert Repository.command_requires_org
+
+
+class TestHammerCache:
+    """Tests for the hammer info and list cache"""
+
+    class Entity(Base):
+        command_base = 'entity'
+
+    def command(self, sub, options=None):
+        self.Entity.command_sub = sub
+        return self.Entity._construct_command(options)
+
+    def test_lru_eviction(self):
+        cache = HammerCache(max_size=2)
+        keys = [cache.key('sat', self.command('info', {'id': i})) for i in range(3)]
+        cache.set(keys[0], 0)
+        cache.set(keys[1], 1)
+        cache.get(keys[0])
+        cache.set(keys[2], 2)
+        assert cache.get(keys[0]) == 0
+        with pytest.raises(KeyError):
+            cache.get(keys[1])
+        assert cache.stats['evictions'] == 1
+
+    def test_ttl(self):
+        cache = HammerCache(ttl=0)
+        key = cache.key('sat', self.command('list'))
+        cache.set(key, [])
+        with pytest.raises(KeyError):
+            cache.get(key)
+        assert cache.stats == {'hits': 0, 'misses': 1, 'evictions': 0, 'invalidations': 0}
+
+    def test_returns_copies(self):
+        cache = HammerCache()
+        key = cache.key('sat', self.command('info', {'id': 1}))
+        cache.set(key, {'versions': [2, 1]})
+        cache.get(key)['versions'].sort()
+        assert cache.get(key) == {'versions': [2, 1]}
+
+    def test_key(self):
+        cache = HammerCache()
+        assert cache.key('sat', self.command('create', {'name': 'x'})) is None
+        assert cache.key('sat', self.command('info', {'id': 1, 'fields': ['a']})) == cache.key(
+            'sat', self.command('info', {'fields': ['a'], 'id': 1})
+        )
+        assert cache.key('sat', self.command('info', {'id': 1})) != cache.key(
+            'sat', self.command('info', {'id': 1}), user='admin'
+        )
+
+    @mock.patch('robottelo.cli.base.hammer_cache.enabled', return_value=True)
+    @mock.patch('robottelo.cli.base.hammer_cache.get_cache')
+    @mock.patch('robottelo.cli.base.Base._run_hammer')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_read_through(self, settings, run_hammer, get_cache, enabled):
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        get_cache.return_value = cache = HammerCache()
+        run_hammer.return_value.status = 0
+        run_hammer.return_value.stderr = ''
+        run_hammer.return_value.stdout = [{'id': '1'}]
+        for _ in range(3):
+            assert self.Entity.execute(
+                self.command('list'), hostname='sat', output_format='csv'
+            ) == [{'id': '1'}]
+        assert run_hammer.call_count == 1
+        assert cache.stats['hits'] == 2
+        # any other subcommand of the same entity drops its cached results
+        run_hammer.return_value.stdout = ''
+        self.Entity.execute(self.command('update', {'id': 1}), hostname='sat')
+        assert cache.stats['invalidations'] == 1
+        self.Entity.execute(self.command('list'), hostname='sat', output_format='csv')
+        assert run_hammer.call_count == 3
+
+
+class TestRegistrationCommandCache:
+    """Tests for the cache of generated registration commands"""
+
+    @pytest.fixture(autouse=True)
+    def cache(self, monkeypatch):
+        cache = HammerCache(ttl=60)
+        monkeypatch.setattr(host_registration, '_command_cache', cache)
+        monkeypatch.setattr(host_registration, '_generate_locks', defaultdict(threading.Lock))
+        return cache
+
+    @pytest.fixture
+    def execute(self):
+        with mock.patch.object(HostRegistration, 'execute') as execute:
+            execute.side_effect = lambda command: f'curl {len(execute.call_args_list)}'
+            yield execute
+
+    def test_disabled_by_default(self, execute):
+        with mock.patch.object(host_registration, 'settings') as settings:
+            settings.performance.get.return_value = False
+            HostRegistration.generate_command({'activation-keys': 'ak'})
+            HostRegistration.generate_command({'activation-keys': 'ak'})
+        assert execute.call_count == 2
+
+    def test_normalized_options(self, execute):
+        options = {'organization-id': 1, 'activation-keys': 'ak', 'insecure': 'true'}
+        first = HostRegistration.generate_command(options, cache=True)
+        same = {'insecure': 'true', 'activation-keys': 'ak', 'organization-id': '1', 'repo': None}
+        assert HostRegistration.generate_command(same, cache=True) == first
+        assert execute.call_count == 1
+        assert HostRegistration.generate_command({**options, 'force': 'true'}, cache=True) != first
+        assert execute.call_count == 2
+
+    def test_per_user(self, execute):
+        admin = HostRegistration.generate_command({'activation-keys': 'ak'}, cache=True)
+        viewer = HostRegistration.with_user('viewer', 'password')
+        assert viewer.generate_command({'activation-keys': 'ak'}, cache=True) != admin
+        assert viewer.generate_command({'activation-keys': 'ak'}, cache=True) != admin
+        assert execute.call_count == 2
+        viewer.invalidate_command_cache()
+        HostRegistration.generate_command({'activation-keys': 'ak'}, cache=True)
+        assert execute.call_count == 3
+
+    def test_invalidate(self, execute):
+        HostRegistration.generate_command({'activation-keys': 'ak'}, cache=True)
+        HostRegistration.invalidate_command_cache()
+        HostRegistration.generate_command({'activation-keys': 'ak'}, cache=True)
+        assert execute.call_count == 2
+
+    def test_concurrent_hosts_share_one_call(self, execute):
+        def slow_execute(command):
+            time.sleep(0.1)
+            return 'curl'
+
+        execute.side_effect = slow_execute
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            commands = list(
+                executor.map(
+                    lambda _: HostRegistration.generate_command({'activation-keys': 'ak'}, True),
+                    range(8),
+                )
+            )
+        assert commands == ['curl'] * 8
+        assert execute.call_count == 1
+        # a single lock is kept for the Satellite, whatever the options
+        HostRegistration.generate_command({'activation-keys': 'other'}, True)
+        assert len(host_registration._generate_locks) == 1
+
+
+class TestCLINamespace:
+    """Tests for the per host cli entity namespaces"""
+
+    def test_entities_bound_lazily(self):
+        from robottelo.cli.org import Org
+        from robottelo.cli.registry import CLINamespace
+
+        host = SimpleNamespace(hostname='sat.example.com', omitting_credentials=False)
+        cli = CLINamespace(host)
+        assert not cli._classes
+        assert issubclass(cli.Org, Org)
+        assert cli.Org.hostname == 'sat.example.com'
+        assert cli.Org is cli.Org
+        assert list(cli._classes) == [('Org', False)]
+        assert 'Org' in dir(cli)
+        with pytest.raises(AttributeError):
+            cli.NotAnEntity  # noqa: B018 - attribute access is the test
+
+    def test_omitting_credentials(self):
+        from robottelo.cli.registry import CLINamespace
+
+        host = SimpleNamespace(hostname='sat.example.com', omitting_credentials=False)
+        cli = CLINamespace(host)
+        assert not cli.Org.omitting_credentials
+        host.omitting_credentials = True
+        assert cli.Org.omitting_credentials
+        host.omitting_credentials = False
+        assert not cli.Org.omitting_credentials
+
+    def test_module_prefix(self):
+        from robottelo.cli.registry import CLINamespace, entities
+
+        cli = CLINamespace(SimpleNamespace(hostname='capsule.example.com'), module_prefix='sm_')
+        assert cli.Backup.hostname == 'capsule.example.com'
+        assert not cli.Backup.omitting_credentials
+        with pytest.raises(AttributeError):
+            cli.Org  # noqa: B018 - attribute access is the test
+        # modules are only scanned once per process
+        assert entities('sm_') is entities('sm_')
@@ -0,0 +1,115 @@
+"""Tests for robottelo.utils.fixture_profile and the fixture profiler plugin"""
+import json
+
+import pytest
+
+from robottelo.utils.fixture_profile import FixtureProfile, execution
+
+TEST_A = 'tests/test_a.py::test_1'
+TEST_B = 'tests/test_a.py::test_2'
+
+
+def run(fixture, stack, test, setup, teardown=0.0, teardown_test=None, scope='module'):
+    result = execution(fixture, scope, 'pytest_fixtures.component.org', stack, test, 'gw0')
+    result.update(setup=setup, teardown=teardown, teardown_test=teardown_test)
+    return result
+
+
+@pytest.fixture
+def profile():
+    return FixtureProfile(
+        [
+            run('module_org', ['module_sca_manifest_org', 'module_org'], TEST_A, 2, 1, TEST_B),
+            run('module_sca_manifest_org', ['module_sca_manifest_org'], TEST_A, 30, 5, TEST_B),
+            run('target_sat', ['target_sat'], TEST_A, 0.5, scope='function'),
+            run('target_sat', ['target_sat'], TEST_B, 0.25, scope='function'),
+        ]
+    )
+
+
+def test_fixtures(profile):
+    fixtures = profile.fixtures()
+    assert [fixture['fixture'] for fixture in fixtures] == [
+        'module_sca_manifest_org',
+        'module_org',
+        'target_sat',
+    ]
+    assert fixtures[0]['tests'] == {TEST_A: 30, TEST_B: 5}
+    assert fixtures[2]['executions'] == 2
+    assert fixtures[2]['setup'] == 0.75
+    assert fixtures[2]['max_setup'] == 0.5
+
+
+def test_tests(profile):
+    assert profile.tests() == {
+        TEST_A: {'setup': 32.5, 'teardown': 0.0},
+        TEST_B: {'setup': 0.25, 'teardown': 6.0},
+    }
+
+
+def test_collapsed_stacks(profile):
+    profile.merge([run('module_org', ['module_org'], 'tests/test_b.py::test_1', 1e-7)])
+    assert profile.collapsed_stacks() == [
+        'setup;tests/test_a.py;module_sca_manifest_org 30000000',
+        'setup;tests/test_a.py;module_sca_manifest_org;module_org 2000000',
+        'setup;tests/test_a.py;target_sat 750000',
+        'teardown;tests/test_a.py;module_sca_manifest_org 5000000',
+        'teardown;tests/test_a.py;module_sca_manifest_org;module_org 1000000',
+    ]
+
+
+def test_plugin(tmp_path):
+    tests = tmp_path / 'test_profiled.py'
+    tests.write_text(
+        '''
+import time
+
+import pytest
+
+@pytest.fixture(scope='module')
+def base():
+    time.sleep(0.01)
+    yield 1
+    time.sleep(0.01)
+
+@pytest.fixture
+def derived(base):
+    time.sleep(0.01)
+    return base + 1
+
+def test_one(derived):
+    pass
+
+def test_two(base):
+    pass
+'''
+    )
+    report_path = tmp_path / 'profile.json'
+    assert (
+        pytest.main(
+            [
+                str(tests),
+                '-p',
+                'pytest_plugins.fixture_profiler',
+                '-p',
+                'no:cacheprovider',
+                f'--fixture-profile={report_path}',
+                f'--rootdir={tmp_path}',
+            ]
+        )
+        == 0
+    )
+    report = json.loads(report_path.read_text())
+    fixtures = {fixture['fixture']: fixture for fixture in report['fixtures']}
+    assert fixtures['base']['executions'] == 1
+    assert set(fixtures['base']['tests']) == {
+        'test_profiled.py::test_one',
+        'test_profiled.py::test_two',
+    }
+    assert fixtures['derived']['executions'] == 1
+    stacks = [
+        line.rsplit(' ', 1)[0]
+        for line in report_path.with_suffix('.folded').read_text().splitlines()
+    ]
+    assert 'setup;test_profiled.py;derived;base' in stacks
+    assert 'setup;test_profiled.py;derived' in stacks
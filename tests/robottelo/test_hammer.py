@@ -1,5 +1,12 @@
 """Tests for Robottelo's hammer helpers"""
-from robottelo.cli import hammer
+from collections import defaultdict
+import json
+from unittest import mock
+
+import pytest
+
+from robottelo.cli import hammer, hammer_shell
+from robottelo.cli.base import Base
 
 
 class TestParseCSV:
@@ -108,6 +115,26 @@ class TestParseJSON:
 
         assert hammer.parse_json(json_output) == hammer.parse_csv(csv_ouput_lines)[0]
 
+    def test_parse_json_multiple_documents(self):
+        """The last of several JSON documents is returned"""
+        output = '{\n  "Message": "Created"\n}\n{\n  "ID": 1\n}\n{\n  "Full Name": "x"\n}\n'
+        assert hammer.parse_json(output) == {'full-name': 'x'}
+
+    def test_iter_json(self):
+        """Every document is decoded with normalized keys and integers"""
+        output = b'{"ID": 1, "Sub Items": [{"Big Int": 12345678901234567890}]} [1.5, true] null'
+        assert list(hammer.iter_json(output)) == [
+            {'id': '1', 'sub-items': [{'big-int': '12345678901234567890'}]},
+            [1.5, True],
+            None,
+        ]
+
+    def test_parse_json_invalid(self):
+        """Outputs which are not JSON documents are reported"""
+        for output in (' ', '{"ID": 1} trailing text'):
+            with pytest.raises(json.JSONDecodeError):
+                hammer.parse_json(output)
+
 
 class TestParseHelp:
     """Tests for parsing hammer help output"""
@@ -539,3 +566,175 @@ class TestParseInfo:
     def test_parse_json_list(self):
         """Can parse a list in json"""
         assert hammer.parse_json('["item1", "item2"]') == ['item1', 'item2']
+
+
+class MockDriverChannel:
+    """A channel replaying the output of the persistent hammer driver"""
+
+    def __init__(self, *chunks):
+        self.chunks = list(chunks)
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+
+    def read(self):
+        if self.chunks:
+            chunk = self.chunks.pop(0)
+            return len(chunk), chunk
+        return 0, b''
+
+    def eof(self):
+        return not self.chunks
+
+    def close(self):
+        pass
+
+
+class TestHammerShell:
+    """Tests for the persistent hammer driver"""
+
+    @pytest.mark.parametrize(
+        ('command', 'argv'),
+        [
+            ('-v org list', ['-v', 'org', 'list']),
+            (
+                '-v -u admin org create --name="my org"',
+                ['-v', '-u', 'admin', 'org', 'create', '--name=my org'],
+            ),
+            ('-v host list --search="name=\\"h1\\""', ['-v', 'host', 'list', '--search=name="h1"']),
+            ('-v org create --description="a;b"', ['-v', 'org', 'create', '--description=a;b']),
+        ],
+    )
+    def test_to_argv(self, command, argv):
+        assert hammer_shell.to_argv(command) == argv
+
+    @pytest.mark.parametrize(
+        'command',
+        ['-v host list | head', '-v export --file=/tmp/x > /dev/null', '-v org list --id=$ID'],
+    )
+    def test_to_argv_needs_shell(self, command):
+        assert hammer_shell.to_argv(command) is None
+
+    def test_run(self):
+        response = {'id': 1, 'status': 65, 'stdout': 'out\n', 'stderr': 'Error: failed\n'}
+        line = hammer_shell.RESPONSE_MARKER + json.dumps(response).encode() + b'\n'
+        shell = hammer_shell.HammerShell('sat.example.com')
+        shell._client = mock.Mock()
+        shell._channel = MockDriverChannel(b'warning: noise\n', line[:10], line[10:])
+        result = shell.run(['org', 'list'], env={'LANG': 'en_US'})
+        assert json.loads(shell._channel.written[0]) == {
+            'id': 1,
+            'argv': ['org', 'list'],
+            'env': {'LANG': 'en_US'},
+        }
+        assert result.status == 65
+        assert result.stdout == 'out\n'
+        assert result.stderr == 'warning: noise\nError: failed\n'
+
+    def test_run_driver_exited(self):
+        shell = hammer_shell.HammerShell('sat.example.com')
+        shell._client = mock.Mock()
+        shell._channel = MockDriverChannel(b'ruby: command not found\n')
+        with pytest.raises(hammer_shell.HammerShellError, match='command not found'):
+            shell.run(['org', 'list'], env={})
+        assert not shell.running
+
+    @pytest.fixture
+    def drivers(self, monkeypatch):
+        monkeypatch.setattr(hammer_shell, '_idle_shells', defaultdict(list))
+        monkeypatch.setattr(hammer_shell, '_unsupported_hosts', set())
+        monkeypatch.setattr(hammer_shell, '_failed_starts', {})
+        monkeypatch.setattr(hammer_shell.HammerShell, 'start', lambda shell: None)
+        monkeypatch.setattr(hammer_shell.HammerShell, 'running', True)
+        monkeypatch.setattr('robottelo.utils.ssh.parse_output', lambda result, _: result)
+        started = []
+
+        def run(shell, argv, env, timeout=None):
+            started.append((shell.user, id(shell)))
+            return mock.Mock(status=0, stdout='', stderr='')
+
+        monkeypatch.setattr(hammer_shell.HammerShell, 'run', run)
+        return started
+
+    def test_driver_per_user(self, drivers):
+        for user in ('admin', 'viewer', 'admin', 'viewer'):
+            hammer_shell.command(f'-v -u {user} -p secret org list', 'sat', {}, user=user)
+        users = [user for user, _ in drivers]
+        assert users == ['admin', 'viewer', 'admin', 'viewer']
+        shells = {user: {shell for u, shell in drivers if u == user} for user in users}
+        # the idle driver of each user is reused, never the one of another user
+        assert len(shells['admin']) == len(shells['viewer']) == 1
+        assert shells['admin'] != shells['viewer']
+
+    def test_driver_failure_falls_back(self, drivers, monkeypatch):
+        def run(shell, argv, env, timeout=None):
+            raise hammer_shell.HammerShellError('Hammer driver on sat failed to receive')
+
+        monkeypatch.setattr(hammer_shell.HammerShell, 'run', run)
+        assert hammer_shell.command('-v org list', 'sat', {}, user='admin') is None
+        assert 'sat' not in hammer_shell._unsupported_hosts
+
+    def test_delivered_command_not_run_again(self, monkeypatch):
+        """A driver dying after receiving a command fails it instead of falling back to ssh"""
+
+        def acquire(hostname, user):
+            shell = hammer_shell.HammerShell(hostname, user)
+            shell._client = mock.Mock()
+            shell._channel = MockDriverChannel()
+            return shell
+
+        monkeypatch.setattr(hammer_shell, '_acquire', acquire)
+        monkeypatch.setattr(hammer_shell, 'enabled', lambda: True)
+        with (
+            mock.patch('robottelo.cli.base.settings') as settings,
+            mock.patch('robottelo.cli.base.ssh.command') as ssh_command,
+        ):
+            settings.performance.time_hammer = False
+            result = Base._run_hammer(
+                'org create --name="org"', 'sat', {}, ('-u admin', '-p secret'), user='admin'
+            )
+        assert result.status == hammer_shell.UNKNOWN_OUTCOME_STATUS
+        assert 'exited' in result.stderr
+        assert not ssh_command.called
+
+    def test_default_timeout(self):
+        from broker.helpers import translate_timeout
+
+        from robottelo.config import settings
+
+        response = {'id': 1, 'status': 0, 'stdout': '', 'stderr': ''}
+        shell = hammer_shell.HammerShell('sat.example.com')
+        shell._client = mock.Mock()
+        shell._channel = MockDriverChannel(
+            hammer_shell.RESPONSE_MARKER + json.dumps(response).encode() + b'\n'
+        )
+        shell.run(['org', 'list'], env={})
+        shell._client.session.session.set_timeout.assert_called_once_with(
+            translate_timeout(settings.server.ssh_client.command_timeout)
+        )
+
+    def test_start_failure_retried(self, drivers, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(hammer_shell.time, 'monotonic', lambda: clock[0])
+
+        def start(shell):
+            raise OSError('connection reset')
+
+        monkeypatch.setattr(hammer_shell.HammerShell, 'start', start)
+        assert hammer_shell.command('-v org list', 'sat', {}, user='admin') is None
+        assert 'sat' not in hammer_shell._unsupported_hosts
+        monkeypatch.setattr(hammer_shell.HammerShell, 'start', lambda shell: None)
+        assert hammer_shell.command('-v org list', 'sat', {}, user='admin') is None
+        assert not drivers
+        clock[0] += hammer_shell.RETRY_AFTER
+        assert hammer_shell.command('-v org list', 'sat', {}, user='admin') is not None
+        assert len(drivers) == 1
+
+    def test_unsupported_host(self, drivers, monkeypatch):
+        def start(shell):
+            raise hammer_shell.HammerShellUnsupported('ruby: command not found')
+
+        monkeypatch.setattr(hammer_shell.HammerShell, 'start', start)
+        assert hammer_shell.command('-v org list', 'sat', {}, user='admin') is None
+        assert 'sat' in hammer_shell._unsupported_hosts
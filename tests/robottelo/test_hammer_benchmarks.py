@@ -0,0 +1,259 @@
+"""Benchmarks for the hammer output parsers
+
+Large synthetic outputs are parsed by :mod:`robottelo.cli.hammer` and by the previous
+implementations kept below, checking both give identical results and that the current parsers
+are faster.
+"""
+import csv
+import json
+import re
+import time
+
+import pytest
+
+from robottelo.cli import hammer
+
+LIST_ROWS = 50000
+INFO_FACTS = 5000
+
+
+def legacy_is_csv(output):
+    sniffer = csv.Sniffer()
+    try:
+        sniffer.sniff(output)
+        return True
+    except csv.Error:
+        return False
+
+
+def legacy_parse_csv(output):
+    is_rex = True if 'Job invocation' in output else False
+    if not legacy_is_csv(output) and not is_rex:
+        return output
+    output = output.splitlines()[0:2] if is_rex else output.splitlines()
+    reader = csv.reader(output)
+    keys = [hammer._normalize(header) for header in next(reader)]
+    return [dict(zip(keys, values, strict=True)) for values in reader if len(values) > 0]
+
+
+def legacy_normalize_obj(obj):
+    if isinstance(obj, dict):
+        return {hammer._normalize(k): legacy_normalize_obj(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [legacy_normalize_obj(v) for v in obj]
+    elif isinstance(obj, int) and not isinstance(obj, bool):
+        return str(obj)
+    return obj
+
+
+def legacy_parse_json(stdout):
+    new_object_index = stdout.find('\n}\n{')
+    if new_object_index > -1:
+        stdout = stdout[new_object_index + 3 :]
+    parsed = json.loads(stdout)
+    return legacy_normalize_obj(parsed)
+
+
+def legacy_parse_info(output):
+    contents = {}
+    sub_prop = None
+    sub_num = None
+    second_level_key = None
+
+    for line in output.splitlines():
+        if line == '' or line == '---':
+            continue
+        current_indent_level = hammer.get_line_indentation_level(line)
+        if current_indent_level <= 1:
+            second_level_key = None
+        if line.startswith(' '):
+            if line.find(':') != -1 and not line.find('::') != -1:
+                key, value = line.lstrip().split(":", 1)
+            elif line.find('=>') != -1 and len(line.lstrip().split(" =>", 1)) == 2:
+                key, value = line.lstrip().split(" =>", 1)
+            else:
+                key = value = None
+
+            if key is None and value is None:
+                match = re.match(r'\d+\)\s+(.+)$', line.lstrip())
+
+                if match is None:
+                    match = re.match(r'(.*)$', line.lstrip())
+
+                value = match.group(1)
+
+                if isinstance(contents[sub_prop], dict) and not contents[sub_prop]:
+                    contents[sub_prop] = []
+                    contents[sub_prop].append(value)
+                elif isinstance(contents[sub_prop], list):
+                    contents[sub_prop].append(value)
+                else:
+                    last_key = list(contents[sub_prop].keys())[-1]
+                    if not contents[sub_prop][last_key]:
+                        contents[sub_prop][last_key] = [value]
+                    else:
+                        contents[sub_prop][last_key].append(value)
+            else:
+                starts_with_number = re.match(r'(\d+)\)', key)
+                if starts_with_number:
+                    sub_num = int(starts_with_number.group(1))
+                    if sub_num == 1:
+                        contents[sub_prop] = []
+                    key = re.sub(r'\d+\)', '', key)
+                    contents[sub_prop].append({})
+
+                key = key.lstrip().replace(' ', '-').lower()
+                value = value.lstrip()
+                if sub_num is not None:
+                    contents[sub_prop][-1][key] = value
+                else:
+                    if current_indent_level == 2 and second_level_key:
+                        if not contents[sub_prop][second_level_key]:
+                            contents[sub_prop][second_level_key] = {}
+                        contents[sub_prop][second_level_key][key] = value
+                    else:
+                        contents[sub_prop][key] = value
+                    if current_indent_level == 1 and not value:
+                        second_level_key = key
+        else:
+            sub_num = None
+            key, value = line.lstrip().split(":", 1)
+            key = key.lstrip().replace(' ', '-').lower()
+            if value.lstrip() == '':
+                sub_prop = key
+                contents[sub_prop] = {}
+            else:
+                contents[key] = value.lstrip()
+
+    return contents
+
+
+def host_list_output():
+    """``hammer --output csv host list`` of a large Satellite"""
+    lines = ['Id,Name,Operating System,Host Group,IP,MAC,Global Status']
+    lines.extend(
+        f'{i},host{i}.example.com,RedHat 8.{i % 9},hostgroup/{i % 7},10.0.{i % 250}.{i % 200},'
+        f'00:1a:4a:{i % 99:02d}:aa:bb,OK'
+        for i in range(LIST_ROWS)
+    )
+    return '\n'.join(lines) + '\n'
+
+
+def erratum_list_output():
+    """``hammer --output csv erratum list`` with quoted titles"""
+    lines = ['ID,Errata ID,Type,Title,Installable']
+    lines.extend(
+        f'{i},RHSA-2023:{i:05d},security,"Important: kernel security, bug fix, and '
+        f'enhancement update",{"true" if i % 2 else "false"}'
+        for i in range(LIST_ROWS)
+    )
+    return '\n'.join(lines) + '\n'
+
+
+def host_list_json_output():
+    """``hammer --output json host list`` of a large Satellite"""
+    return json.dumps(
+        [
+            {
+                'Id': i,
+                'Name': f'host{i}.example.com',
+                'Operating System': f'RedHat 8.{i % 9}',
+                'Host Group': f'hostgroup/{i % 7}',
+                'Content Information': {'Content View': {'ID': i % 10, 'Name': 'View'}},
+                'Global Status': 'OK',
+                'Registered': bool(i % 2),
+            }
+            for i in range(LIST_ROWS)
+        ],
+        indent=2,
+    )
+
+
+def host_info_output():
+    """``hammer host info`` of a host with thousands of facts and parameters"""
+    lines = [
+        'Id:                       1',
+        'Name:                     host.example.com',
+        'Organization:             Default Organization',
+        'Network:',
+        '    IPv4 address: 10.0.0.1',
+        '    MAC:          00:1a:4a:00:aa:bb',
+        'Content Information:',
+        '    Content View:',
+        '        ID:   10',
+        '        Name: Default Organization View',
+        '    Lifecycle Environment:',
+        '        ID:   1',
+        '        Name: Library',
+        'Subscription Information:',
+        '    Registered by Activation Keys:',
+        '        ak1',
+        '        ak2',
+        'Interfaces:',
+    ]
+    for i in range(1, 51):
+        lines.extend(
+            [f' {i}) Id:       {i}', f'    Identifier: eth{i}', '    Type:       interface']
+        )
+    lines.append('Installed Packages:')
+    lines.extend(f'    {i}) package-{i}-1.0-1.el8.x86_64' for i in range(1, INFO_FACTS + 1))
+    lines.append('Parameters:')
+    lines.extend(f'    param_{i} => value {i}' for i in range(INFO_FACTS))
+    lines.append('Puppet classes:')
+    lines.extend(f'    module_{i % 50}::class_{i}' for i in range(INFO_FACTS))
+    lines.append('Facts:')
+    lines.extend(f'    facts/net_{i}: 10.0.{i % 250}.1' for i in range(INFO_FACTS))
+    return '\n'.join(lines) + '\n'
+
+
+def timed(function, output, rounds=1):
+    """Return the result of ``function(output)`` along with its best time over ``rounds``"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = function(output)
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    ('output_factory', 'parser', 'legacy_parser'),
+    [
+        (host_list_output, hammer.parse_csv, legacy_parse_csv),
+        (erratum_list_output, hammer.parse_csv, legacy_parse_csv),
+        (host_list_json_output, hammer.parse_json, legacy_parse_json),
+        (host_info_output, hammer.parse_info, legacy_parse_info),
+    ],
+    ids=['host-list-csv', 'erratum-list-csv', 'host-list-json', 'host-info'],
+)
+def test_parser_benchmark(output_factory, parser, legacy_parser, record_property):
+    """Parsers give the same results as before, faster"""
+    output = output_factory()
+    # the legacy parsers take seconds on these outputs, run them only once
+    expected, legacy = timed(legacy_parser, output)
+    result, current = timed(parser, output, rounds=3)
+    assert result == expected
+    record_property('legacy_seconds', legacy)
+    record_property('current_seconds', current)
+    assert current < legacy
+
+
+def test_is_csv_matches_sniffer():
+    """is_csv accepts exactly what csv.Sniffer can find a dialect for"""
+    samples = [
+        '',
+        'Message',
+        'Message\nRepository synchronized',
+        'Task 1 success',
+        'Id,Name\n1,foo\n2,bar',
+        'Id,Name\n1,"foo, bar"\n2,baz',
+        '"quoted single column"\n"another one"',
+        "'a' 'b'\n'c' 'd'",
+        'no, consistency\nat all\nin, this, output\n\nhere',
+        'Job invocation 1 created',
+        '\n'.join(['a;b'] * 9 + ['a b c d e f']),
+        '\n'.join(['x,y'] * 20 + ['plain'] * 5),
+    ]
+    for sample in samples:
+        assert hammer.is_csv(sample) == legacy_is_csv(sample), sample
@@ -0,0 +1,90 @@
+"""Tests for running operations on several hosts at once"""
+from concurrent.futures import CancelledError
+import logging
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from robottelo.host_helpers.host_group import HostGroup, HostGroupError
+from robottelo.logging import logger
+
+
+class FakeHost(SimpleNamespace):
+    def register(self, org, repo=None):
+        return f'{self.hostname} registered to {org} with {repo}'
+
+
+def make_hosts(count):
+    return [FakeHost(hostname=f'host{i}.example.com') for i in range(count)]
+
+
+def test_run_method():
+    hosts = make_hosts(3)
+    assert HostGroup(hosts).run('register', 'org', repo='repo', max_workers=2) == [
+        f'host{i}.example.com registered to org with repo' for i in range(3)
+    ]
+
+
+def test_runs_concurrently():
+    hosts = make_hosts(4)
+    barrier = threading.Barrier(4, timeout=5)
+    # every host waits for all the others, which only passes if they all run at the same time
+    assert (
+        HostGroup(hosts).run(lambda host: barrier.wait() is not None, max_workers=4) == [True] * 4
+    )
+
+
+def test_errors():
+    hosts = make_hosts(3)
+
+    def operation(host, fail_on):
+        if host.hostname == fail_on:
+            raise ValueError('registration failed')
+        return host.hostname
+
+    group = HostGroup(hosts)
+    results = group.run(operation, 'host1.example.com', raise_errors=False)
+    assert results[0] == 'host0.example.com'
+    assert isinstance(results[1], ValueError)
+    assert results[2] == 'host2.example.com'
+    with pytest.raises(HostGroupError, match='host1.example.com') as err:
+        group.run(operation, 'host1.example.com')
+    assert err.value.errors[0][0] is hosts[1]
+
+
+def test_fail_fast():
+    hosts = make_hosts(5)
+    started = []
+
+    def operation(host):
+        started.append(host.hostname)
+        if host.hostname == 'host0.example.com':
+            raise ValueError('registration failed')
+        return host.hostname
+
+    results = HostGroup(hosts).run(operation, max_workers=1, fail_fast=True, raise_errors=False)
+    assert isinstance(results[0], ValueError)
+    # the first host failed before the others were picked up by the only worker
+    assert len(started) < 5
+    assert all(isinstance(result, CancelledError) for result in results[len(started) :])
+
+
+def test_log_lines_tagged(caplog):
+    hosts = make_hosts(2)
+    caplog.set_level(logging.INFO, logger=logger.name)
+    other = logging.getLogger('some.library')
+    HostGroup(hosts).run(lambda host: (logger.info('registering'), other.warning('untouched')))
+    logger.info('done')
+    messages = sorted(record.getMessage() for record in caplog.records)
+    assert messages == [
+        '[host0.example.com] registering',
+        '[host1.example.com] registering',
+        'done',
+        'untouched',
+        'untouched',
+    ]
+
+
+def test_empty():
+    assert HostGroup().run('register', 'org') == []
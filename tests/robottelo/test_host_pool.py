@@ -0,0 +1,171 @@
+"""Tests for robottelo.host_helpers.host_pool"""
+from collections import Counter
+import itertools
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from pytest_fixtures.core import contenthosts
+from robottelo.host_helpers.host_pool import HostPool, HostPrefetcher
+
+
+class Checkouts:
+    """Checkout callable handing out numbered hosts, optionally held back by an event"""
+
+    def __init__(self, fail=()):
+        self.counter = itertools.count()
+        self.fail = fail
+        self.release = threading.Event()
+        self.release.set()
+        self.checked_in = []
+
+    def checkout(self):
+        number = next(self.counter)
+        self.release.wait(timeout=10)
+        if number in self.fail:
+            raise RuntimeError('no capacity')
+        return SimpleNamespace(hostname=f'sat{number}.example.com')
+
+    def pool(self, demand, depth):
+        return HostPool('satellite', self.checkout, self.checked_in.extend, demand, depth)
+
+
+def test_depth_bounds_checkouts():
+    checkouts = Checkouts()
+    pool = checkouts.pool(demand=5, depth=2)
+    assert pool.stats['started'] == 2
+    hostnames = [pool.take().hostname for _ in range(5)]
+    assert sorted(hostnames) == [f'sat{i}.example.com' for i in range(5)]
+    assert pool.take() is None
+    assert pool.stats == {'started': 5, 'taken': 5, 'failed': 0, 'checked_in': 0}
+    pool.close()
+    assert checkouts.checked_in == []
+
+
+def test_demand_bounds_checkouts():
+    pool = Checkouts().pool(demand=1, depth=3)
+    assert pool.stats['started'] == 1
+    assert pool.take().hostname == 'sat0.example.com'
+    assert pool.take() is None
+
+
+def test_failed_checkout_falls_back():
+    pool = Checkouts(fail={0}).pool(demand=2, depth=1)
+    assert pool.take() is None
+    assert pool.take().hostname == 'sat1.example.com'
+    assert pool.stats['failed'] == 1
+
+
+def test_unused_hosts_checked_in():
+    checkouts = Checkouts()
+    checkouts.release.clear()
+    pool = checkouts.pool(demand=4, depth=2)
+    checkouts.release.set()
+    pool.close()
+    assert sorted(host.hostname for host in checkouts.checked_in) == [
+        'sat0.example.com',
+        'sat1.example.com',
+    ]
+    assert pool.stats['checked_in'] == 2
+    assert pool.take() is None
+
+
+def test_prefetcher_per_kind():
+    checked_in = []
+    prefetcher = HostPrefetcher(
+        checkout=lambda args: SimpleNamespace(hostname=f'rhel{args["rhel"]}.example.com'),
+        checkin=checked_in.extend,
+        lookahead=2,
+    )
+    prefetcher.expect({'rhel': 8, 'container': True})
+    prefetcher.expect({'container': True, 'rhel': 8})
+    prefetcher.expect({'rhel': 9})
+    assert prefetcher.take({'rhel': 9}).hostname == 'rhel9.example.com'
+    assert prefetcher.take({'rhel': 9}) is None
+    assert prefetcher.take({'rhel': 7}) is None
+    assert prefetcher.take({'rhel': 8, 'container': True}).hostname == 'rhel8.example.com'
+    prefetcher.close()
+    assert [host.hostname for host in checked_in] == ['rhel8.example.com']
+
+
+@pytest.mark.parametrize('skip_checkin', [False, True])
+def test_prefetched_contenthost_lifecycle(skip_checkin):
+    host = mock.Mock(hostname='rhel8.example.com', _skip_context_checkin=skip_checkin)
+    prefetcher = HostPrefetcher(checkout=lambda args: host, checkin=mock.Mock(), lookahead=1)
+    prefetcher.expect({'rhel': 8})
+    request = SimpleNamespace(
+        config=SimpleNamespace(stash={contenthosts.prefetcher_key: prefetcher})
+    )
+    with mock.patch.object(contenthosts, 'host_conf', return_value={'rhel': 8}), mock.patch(
+        'broker.broker.Broker._checkin', side_effect=lambda host: host
+    ) as checkin, mock.patch('broker.helpers.update_inventory'):
+        with contenthosts._single_contenthost(request) as taken:
+            assert taken is host
+            host.setup.assert_called_once_with()
+            host.teardown.assert_not_called()
+    # torn down, which unregisters it and deletes its host record, then checked in unless the
+    # test asked to keep it
+    host.teardown.assert_called_once_with()
+    assert checkin.called is not skip_checkin
+
+
+class FakeNode(SimpleNamespace):
+    def get_closest_marker(self, name):
+        return name if name in self.markers else None
+
+
+def fake_item(nodeid, scopes, markers=(), module_markers=(), params=None):
+    """An item using fixtures of the given scopes, in a module of its own file"""
+    module = FakeNode(nodeid=nodeid.split('::')[0], markers=set(module_markers))
+    item = FakeNode(
+        nodeid=nodeid,
+        markers={*markers, *module_markers},
+        fixturenames=list(scopes),
+        _fixtureinfo=SimpleNamespace(
+            name2fixturedefs={
+                name: [SimpleNamespace(scope=scope)] for name, scope in scopes.items()
+            }
+        ),
+        session=FakeNode(nodeid='', markers=set()),
+        getparent=lambda cls: module if cls is pytest.Module else None,
+    )
+    if params:
+        item.callspec = SimpleNamespace(params=params)
+    return item
+
+
+def test_factory_demand_per_instance():
+    from pytest_plugins.factory_collection import factory_instances
+
+    items = [
+        # module-scoped hosts are one instance for the whole module
+        fake_item('test_a.py::test_1', {'module_satellite_host': 'module'}),
+        fake_item('test_a.py::test_2', {'module_satellite_host': 'module'}),
+        fake_item('test_b.py::test_1', {'capsule_host': 'function'}),
+        fake_item('test_b.py::test_2', {'capsule_host': 'function'}),
+        # target_sat only deploys a Satellite for destructive tests
+        fake_item('test_c.py::test_1', {'target_sat': 'function'}),
+        fake_item('test_c.py::test_2', {'target_sat': 'function'}, markers={'destructive'}),
+        fake_item('test_c.py::test_3', {'module_target_sat': 'module'}, markers={'destructive'}),
+        fake_item(
+            'test_d.py::test_1', {'module_target_sat': 'module'}, module_markers={'destructive'}
+        ),
+        # one instance per parameter
+        fake_item(
+            'test_e.py::test_1[IDM]',
+            {'parametrized_enrolled_sat': 'module'},
+            params={'parametrized_enrolled_sat': 'IDM'},
+        ),
+        fake_item(
+            'test_e.py::test_1[AD]',
+            {'parametrized_enrolled_sat': 'module'},
+            params={'parametrized_enrolled_sat': 'AD'},
+        ),
+    ]
+    instances = set().union(*map(factory_instances, items))
+    assert Counter(factory for factory, _ in instances) == {
+        'satellite_factory': 5,
+        'capsule_factory': 2,
+    }
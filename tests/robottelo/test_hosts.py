@@ -0,0 +1,166 @@
+"""Tests for robottelo.hosts"""
+import json
+import subprocess
+from unittest import mock
+
+from broker.helpers import Result
+from packaging.version import Version
+import pytest
+
+from robottelo import hosts
+from robottelo.hosts import ContentHost, ContentHostError
+
+IDENTITY = 'system identity: 5f1a\nname: host.example.com\norg name: Default_Organization\n'
+RHSM_CONF = '[server]\nhostname = sat.example.com\n'
+OS_RELEASE = 'NAME="Red Hat Enterprise Linux"\nVERSION_ID="9.2"\nID="rhel"\n'
+
+
+@pytest.fixture
+def host(monkeypatch):
+    """ContentHost running its commands locally, with the remote commands replaced"""
+    monkeypatch.setattr(
+        hosts,
+        'SNAPSHOT_COMMANDS',
+        {
+            'system': {
+                'os_release': f"printf '{OS_RELEASE}'",
+                'redhat_release': 'echo oops >&2; exit_with_1() { return 1; }; exit_with_1',
+                'arch': 'echo x86_64',
+                'ip_addr': 'echo 10.0.0.5 2620:52::5',
+            },
+            'registration': {
+                'identity': f"printf '{IDENTITY}'",
+                'status': "printf 'Overall Status: Current\\n'",
+                'rhsm_conf': f"printf '{RHSM_CONF}'",
+            },
+        },
+    )
+    host = ContentHost('host.example.com')
+    host.commands = []
+
+    def execute(command, *args, **kwargs):
+        host.commands.append(command)
+        result = subprocess.run(['bash', '-c', command], capture_output=True, text=True)
+        return Result(stdout=result.stdout, stderr=result.stderr, status=result.returncode)
+
+    monkeypatch.setattr(host, 'execute', execute)
+    return host
+
+
+def test_snapshot(host):
+    snapshot = host.snapshot('registration')
+    assert set(snapshot) == set(hosts.SNAPSHOT_COMMANDS['registration'])
+    assert snapshot['identity'].stdout == IDENTITY
+    assert snapshot['identity'].status == 0
+    system = host.snapshot('system')
+    assert system['redhat_release'].stdout == ''
+    assert system['redhat_release'].status == 1
+    assert host.snapshot('registration') is snapshot
+    assert len(host.commands) == 2
+
+
+def test_release_facts_skip_registration(host):
+    assert host.arch == 'x86_64'
+    assert str(host.os_version) == '9.2'
+    assert len(host.commands) == 1
+    assert 'subscription-manager' not in host.commands[0]
+
+
+def test_properties_read_snapshot(host):
+    assert host.identity == {
+        'system_identity': '5f1a',
+        'name': 'host.example.com',
+        'org_name': 'Default_Organization',
+        'registered_to': 'sat.example.com',
+    }
+    assert host.subscribed
+    assert host.ip_addr == '10.0.0.5'
+    assert host.arch == 'x86_64'
+    assert host.os_id == 'rhel'
+    assert str(host.os_version) == '9.2'
+    assert len(host.commands) == 2
+
+
+def test_snapshot_invalidated(host, monkeypatch):
+    host.snapshot('registration')
+    host.snapshot('system')
+    monkeypatch.setitem(
+        hosts.SNAPSHOT_COMMANDS['registration'], 'status', "printf 'Status: Unknown\\n'"
+    )
+    assert host.subscribed
+    host.unregister()
+    assert not host.subscribed
+    assert host.commands[2] == 'subscription-manager unregister'
+    # unregistering leaves the system facts alone
+    host.snapshot('system')
+    assert len(host.commands) == 4
+    host.clean_cached_properties()
+    host.snapshot('system')
+    host.snapshot('system', refresh=True)
+    assert len(host.commands) == 6
+
+
+def test_katello_ca_invalidates_registration(host, monkeypatch):
+    satellite = mock.Mock(hostname='sat.example.com')
+    host.snapshot('registration')
+    installed = Result(stdout='katello-ca-consumer-sat.example.com', stderr='', status=0)
+    monkeypatch.setattr(host, 'execute_script', lambda *args, **kwargs: [installed])
+    with pytest.warns(DeprecationWarning, match='register method'):
+        host.install_katello_ca(satellite)
+    assert 'registration' not in host._snapshots
+    host.snapshot('registration')
+    monkeypatch.setattr(host, 'execute', lambda command: Result(stdout='', stderr='', status=1))
+    host.remove_katello_ca()
+    assert 'registration' not in host._snapshots
+
+
+def test_snapshot_incomplete(host):
+    host.execute = lambda command: Result(stdout='', stderr='', status=255)
+    with pytest.raises(ContentHostError, match='Not able to collect'):
+        host.snapshot('system')
+
+
+@pytest.fixture
+def version_cache(tmp_path, mocker):
+    """Enable the version cache, with the Satellite replaced by a mock"""
+    settings = mocker.patch.object(hosts, 'settings')
+    settings.performance.get.side_effect = lambda key, default=None: {
+        'version_cache': True,
+        'version_cache_ttl': 3600,
+    }.get(key, default)
+    settings.server.get.return_value = 'sat.example.com'
+    mocker.patch.object(hosts, 'robottelo_tmp_dir', tmp_path)
+    satellite = mocker.patch.object(hosts, 'Satellite')
+    satellite.return_value.version = '6.15.0'
+    satellite.return_value.os_version = Version('9.2')
+    return satellite
+
+
+def test_sat_versions_cached(version_cache, tmp_path):
+    assert hosts.get_sat_version() == Version('6.15.0')
+    assert hosts.get_sat_rhel_version() == Version('9.2')
+    assert hosts.get_sat_version() == Version('6.15.0')
+    assert hosts.get_sat_rhel_version() == Version('9.2')
+    assert version_cache.call_count == 2
+    assert set(json.loads(tmp_path.joinpath('satellite_versions.json').read_text())) == {
+        'sat.example.com'
+    }
+
+
+def test_sat_version_cache_disabled(version_cache):
+    hosts.settings.performance.get.side_effect = None
+    hosts.settings.performance.get.return_value = False
+    version_cache.return_value.version = 'nightly'
+    assert hosts.get_sat_version() == Version('9999')
+    assert hosts.get_sat_version() == Version('9999')
+    assert version_cache.call_count == 2
+
+
+def test_execute_streaming_without_ssh(host, monkeypatch):
+    monkeypatch.setattr(ContentHost, 'session', None)
+    lines = []
+    result = host.execute_streaming('echo one; echo two', on_stdout=lines.append)
+    assert (result.stdout, result.status, lines) == ('one\ntwo\n', 0, ['one', 'two'])
+    with pytest.raises(hosts.CommandAbortedError, match='Error: fatal') as err:
+        host.execute_streaming('echo "Error: fatal" >&2; exit 1', abort_patterns=['^Error'])
+    assert err.value.result.status == 1
@@ -0,0 +1,62 @@
+"""Tests for the offline collection guard"""
+import socket
+
+from packaging.version import Version
+import pytest
+
+from robottelo import hosts
+from robottelo.exceptions import OfflineCollectionError
+from robottelo.utils.offline import is_offline, offline
+from robottelo.utils.version import VersionCache
+
+
+def test_network_refused():
+    connect = socket.socket.connect
+    with offline():
+        assert is_offline()
+        with socket.socket() as sock, pytest.raises(OfflineCollectionError, match='offline'):
+            sock.connect(('127.0.0.1', 22))
+        with socket.socket() as sock, pytest.raises(OfflineCollectionError):
+            sock.connect_ex(('127.0.0.1', 22))
+        with pytest.raises(OfflineCollectionError):
+            socket.create_connection(('sat.example.com', 443))
+        with pytest.raises(OfflineCollectionError, match='sat.example.com'):
+            socket.getaddrinfo('sat.example.com', 443)
+    assert not is_offline()
+    assert socket.socket.connect is connect
+
+
+def test_unix_sockets_allowed(tmp_path):
+    path = str(tmp_path / 'sock')
+    with socket.socket(socket.AF_UNIX) as server:
+        server.bind(path)
+        server.listen()
+        with offline(), socket.socket(socket.AF_UNIX) as client:
+            client.connect(path)
+
+
+@pytest.fixture
+def satellite(tmp_path, mocker):
+    settings = mocker.patch.object(hosts, 'settings')
+    settings.server.get.return_value = 'sat.example.com'
+    settings.server.version.rhel_version = '8.9'
+    mocker.patch.object(hosts, 'robottelo_tmp_dir', tmp_path)
+    satellite = mocker.patch.object(hosts, 'Satellite')
+    satellite.side_effect = AssertionError('Satellite contacted while offline')
+    return satellite
+
+
+def test_versions_from_settings_offline(satellite):
+    with offline():
+        assert hosts.get_sat_version() == Version(hosts.SATELLITE_VERSION)
+        assert hosts.get_sat_rhel_version() == Version('8.9')
+
+
+def test_versions_from_cache_offline(satellite, tmp_path):
+    cache = VersionCache(tmp_path / 'satellite_versions.json', ttl=1)
+    cache.set('sat.example.com', 'sat_version', Version('6.16.0'))
+    cache.set('sat.example.com', 'rhel_version', Version('9.4'))
+    with offline():
+        # the age of cached versions does not matter offline
+        assert hosts.get_sat_version() == Version('6.16.0')
+        assert hosts.get_sat_rhel_version() == Version('9.4')
@@ -0,0 +1,54 @@
+"""Tests for robottelo.utils.remote_script"""
+import subprocess
+
+from broker.helpers import Result
+
+from robottelo.utils.remote_script import run_script
+
+
+def execute(command, **kwargs):
+    result = subprocess.run(['bash', '-c', command], capture_output=True, text=True)
+    return Result(stdout=result.stdout, stderr=result.stderr, status=result.returncode)
+
+
+def test_steps_status_and_output():
+    result = run_script(execute, ['echo one; echo two', 'printf three', 'true'])
+    assert [step.stdout for step in result] == ['one\ntwo\n', 'three', '']
+    assert [step.status for step in result] == [0, 0, 0]
+    assert all(step.duration >= 0 for step in result)
+    assert result.status == 0
+    assert result.failed_step is None
+    assert result.stdout == 'one\ntwo\nthree'
+
+
+def test_stop_on_error():
+    calls = []
+
+    def counting_execute(command, **kwargs):
+        calls.append(command)
+        return execute(command)
+
+    result = run_script(counting_execute, ['echo ok', 'echo oops >&2; false', 'echo never'])
+    assert len(calls) == 1
+    assert [step.status for step in result] == [0, 1, None]
+    assert result[2].stdout == ''
+    assert result[2].duration is None
+    assert result.failed_step is result[1]
+    assert result.status == 1
+    assert result.stderr == 'oops\n'
+
+
+def test_continue_on_error():
+    result = run_script(execute, ['exit_with() { return $1; }; exit_with 3', 'echo ran'], False)
+    assert [step.status for step in result] == [3, 0]
+    assert result[1].stdout == 'ran\n'
+    assert result.status == 3
+
+
+def test_steps_share_shell():
+    result = run_script(execute, ['cd /tmp; value=42', 'echo $value $PWD'])
+    assert result[1].stdout == '42 /tmp\n'
+
+
+def test_no_steps():
+    assert run_script(execute, []) == []
@@ -0,0 +1,81 @@
+"""Tests for robottelo.utils.satellite_ledger"""
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from robottelo.utils.satellite_ledger import LatencyTracker, SatelliteLedger
+
+HOSTNAMES = ['sat1', 'sat2', 'sat3']
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return SatelliteLedger(tmp_path / 'ledger.json', run_id='run1')
+
+
+def assigned(ledger):
+    return {name: sorted(host.get('workers', {})) for name, host in ledger.hosts().items()}
+
+
+def test_workers_spread(ledger):
+    for worker in range(5):
+        ledger.assign(f'gw{worker}', HOSTNAMES)
+    assert assigned(ledger) == {'sat1': ['gw0', 'gw3'], 'sat2': ['gw1', 'gw4'], 'sat3': ['gw2']}
+
+
+def test_costs_and_latency(ledger):
+    ledger.report_latency('sat1', 3.0)
+    ledger.report_latency('sat2', 1.0)
+    # sat1 answers three times slower, one worker there weighs as much as three on sat2
+    assert [ledger.assign(f'gw{i}', ['sat1', 'sat2']) for i in range(4)] == [
+        'sat2',
+        'sat2',
+        'sat1',
+        'sat2',
+    ]
+    assert ledger.assign('gw4', ['sat1', 'sat2'], cost=4) == 'sat2'
+
+
+def test_release_and_new_run(ledger, tmp_path):
+    ledger.assign('gw0', HOSTNAMES)
+    ledger.assign('gw1', HOSTNAMES)
+    ledger.release('gw0')
+    assert assigned(ledger) == {'sat1': [], 'sat2': ['gw1']}
+    assert SatelliteLedger(tmp_path / 'ledger.json', run_id='run2').hosts() == {}
+
+
+def test_latency_kept_for_next_run(ledger, tmp_path):
+    ledger.assign('gw0', ['sat1', 'sat2'])
+    ledger.report_latency('sat1', 1.0)
+    ledger.report_latency('sat2', 3.0)
+    next_run = SatelliteLedger(tmp_path / 'ledger.json', run_id='run2')
+    assert next_run.hosts() == {'sat1': {'latency': 1.0}, 'sat2': {'latency': 3.0}}
+    # sat2 answered three times slower in the previous run
+    assert [next_run.assign(f'gw{i}', ['sat1', 'sat2']) for i in range(4)] == [
+        'sat1',
+        'sat1',
+        'sat2',
+        'sat1',
+    ]
+
+
+def assign(path, worker):
+    return SatelliteLedger(path, run_id='run1').assign(worker, HOSTNAMES)
+
+
+def test_concurrent_workers(tmp_path):
+    with ProcessPoolExecutor(max_workers=6) as executor:
+        list(executor.map(assign, [tmp_path / 'ledger.json'] * 6, [f'gw{i}' for i in range(6)]))
+    counts = [
+        len(workers)
+        for workers in assigned(SatelliteLedger(tmp_path / 'ledger.json', 'run1')).values()
+    ]
+    assert counts == [2, 2, 2]
+
+
+def test_latency_tracker():
+    tracker = LatencyTracker(size=3)
+    assert tracker.median('sat1') is None
+    for seconds in (100, 1, 2, 3):
+        tracker.record('sat1', seconds)
+    assert tracker.median('sat1') == 2
@@ -0,0 +1,91 @@
+"""Tests for the pooled nailgun HTTP sessions"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+from nailgun import client
+from nailgun.config import ServerConfig
+import pytest
+import requests
+
+from robottelo.utils import session_pool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"results": []}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def pooled(monkeypatch):
+    pool = session_pool.SessionPool(pool_size=2)
+    monkeypatch.setattr(session_pool, '_pool', pool)
+    monkeypatch.setattr(session_pool, 'enabled', lambda: True)
+    monkeypatch.setattr(client, 'requests', client.requests)
+    yield pool
+    pool.close()
+
+
+def test_pooled_server_config(server, pooled):
+    cfg = session_pool.server_config(server, ('admin', 'changeme'), verify=False)
+    assert isinstance(cfg, session_pool.PooledServerConfig)
+    kwargs = cfg.get_client_kwargs()
+    assert kwargs['session'] is pooled.session(server, ('admin', 'changeme'))
+    assert kwargs['auth'] == ('admin', 'changeme')
+    assert kwargs['verify'] is False
+    for _ in range(5):
+        assert client.get(f'{server}/api/v2/hosts', **cfg.get_client_kwargs()).json() == {
+            'results': []
+        }
+    host = server.split('//')[1]
+    assert pooled.metrics() == {host: {'requests': 5, 'opened': 1, 'reused': 4}}
+
+
+def test_unpooled_requests_untouched(server, pooled):
+    session_pool.server_config(server, ('admin', 'changeme'), verify=False)
+    assert isinstance(client.requests, session_pool._PooledRequests)
+    cfg = ServerConfig(server, ('admin', 'changeme'), verify=False)
+    assert client.get(f'{server}/api/v2/hosts', **cfg.get_client_kwargs()).status_code == 200
+    assert client.requests.codes is requests.codes
+    assert pooled.metrics() == {}
+
+
+def test_session_per_host_and_user(pooled):
+    admin = ('admin', 'changeme')
+    session = pooled.session('https://sat1.example.com/api/v2', admin)
+    assert pooled.session('https://sat1.example.com', ['admin', 'changeme']) is session
+    assert pooled.session('https://sat2.example.com', admin) is not session
+    # the Foreman session cookie of one user must not authenticate another
+    session.cookies.set('_session_id', 'admin-session', domain='sat1.example.com')
+    restricted = pooled.session('https://sat1.example.com', ('viewer', 'secret'))
+    assert restricted is not session
+    assert not restricted.cookies
+    assert set(pooled.metrics()) == {'sat1.example.com', 'sat2.example.com'}
+    pooled.close()
+    assert pooled.metrics() == {}
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setattr(session_pool, 'enabled', lambda: False)
+    cfg = session_pool.server_config('https://sat.example.com', ('admin', 'changeme'), True)
+    assert type(cfg) is ServerConfig
+    assert 'session' not in cfg.get_client_kwargs()
@@ -1,7 +1,9 @@
 """Tests for module ``robottelo.utils.ssh``."""
 from unittest import mock
 
-from robottelo import ssh
+import pytest
+
+from robottelo.utils import ssh
 
 
 class MockChannel:
@@ -44,7 +46,7 @@ class MockSSHClient:
         self.username = None
         self.key_filename = None
         self.pkey = None
-        self.password = None
+        self.password = kwargs.get('password')
         self.ret_code = 0
 
     def set_missing_host_key_policy(self, policy):
@@ -89,15 +91,81 @@ class MockSSHClient:
 class TestSSH:
     """Tests for module ``robottelo.utils.ssh``."""
 
+    @mock.patch('robottelo.utils.ssh._pool', None)
+    @mock.patch('robottelo.utils.ssh.get_client', MockSSHClient)
     @mock.patch('robottelo.config.settings')
     def test_command(self, settings):
-        ssh.get_client = MockSSHClient
         settings.server.hostname = 'example.com'
         settings.server.ssh_username = 'nobody'
         settings.server.ssh_key = None
         settings.server.ssh_password = 'test_password'
         settings.server.ssh_client.command_timeout = 300000
         settings.server.ssh_client.connection_timeout = 10000
+        settings.server.ssh_client.get.side_effect = lambda key, default: default
 
         ret = ssh.command('ls -la')
         assert ret[1].cmd == 'ls -la'
+        assert ssh.get_pool().stats['created'] == 1
+        ssh.command('ls -la')
+        assert ssh.get_pool().stats['created'] == 1
+        assert ssh.get_pool().stats['reused'] == 1
+
+
+@mock.patch('robottelo.utils.ssh.get_client', MockSSHClient)
+@mock.patch('robottelo.config.settings')
+class TestSSHClientPool:
+    """Tests for ``robottelo.utils.ssh.SSHClientPool``."""
+
+    def test_client_is_reused(self, settings):
+        pool = ssh.SSHClientPool(max_size=2, max_idle=300, health_check_interval=300)
+        with pool.client(hostname='example.com', username='root') as client:
+            pass
+        with pool.client(hostname='example.com', username='root') as reused:
+            assert reused is client
+        with pool.client(hostname='other.example.com', username='root') as other:
+            assert other is not client
+        assert pool.stats['created'] == 2
+        assert pool.stats['reused'] == 1
+
+    def test_client_discarded_on_error(self, settings):
+        pool = ssh.SSHClientPool(max_size=2, max_idle=300, health_check_interval=300)
+        with pytest.raises(RuntimeError), pool.client(hostname='example.com') as client:
+            raise RuntimeError('connection lost')
+        assert client.close_ == 1
+        with pool.client(hostname='example.com') as new_client:
+            assert new_client is not client
+
+    def test_least_recently_used_client_evicted(self, settings):
+        pool = ssh.SSHClientPool(max_size=1, max_idle=300, health_check_interval=300)
+        with pool.client(hostname='first.example.com') as first:
+            pass
+        with pool.client(hostname='second.example.com'):
+            pass
+        assert first.close_ == 1
+        assert pool.stats['evicted'] == 1
+
+    def test_idle_client_evicted(self, settings):
+        pool = ssh.SSHClientPool(max_size=2, max_idle=0, health_check_interval=300)
+        with pool.client(hostname='example.com') as client:
+            pass
+        with pool.client(hostname='example.com') as new_client:
+            assert new_client is not client
+        assert client.close_ == 1
+
+    def test_unhealthy_client_replaced(self, settings):
+        pool = ssh.SSHClientPool(max_size=2, max_idle=300, health_check_interval=0)
+        with pool.client(hostname='example.com') as client:
+            client.ret_code = 1
+        with pool.client(hostname='example.com') as new_client:
+            assert new_client is not client
+        assert pool.stats['failed_health_checks'] == 1
+
+    def test_healthy_client_kept(self, settings):
+        pool = ssh.SSHClientPool(max_size=2, max_idle=300, health_check_interval=0)
+        with pool.client(hostname='example.com') as client:
+            client.execute = mock.Mock(return_value=mock.Mock(status=0))
+        with pool.client(hostname='example.com') as reused:
+            assert reused is client
+        # broker reads integer timeouts as milliseconds
+        client.execute.assert_called_once_with('true', timeout='30s')
+        assert pool.stats['failed_health_checks'] == 0
@@ -0,0 +1,107 @@
+"""Tests for robottelo.utils.stream"""
+import os
+import signal
+import subprocess
+import time
+
+import pytest
+
+from robottelo.utils import stream
+from robottelo.utils.stream import EAGAIN, OutputStream, stream_channel, wrap_command
+
+
+class LocalChannel:
+    """Non-blocking ssh2-like channel running a command in a local shell"""
+
+    def __init__(self, command):
+        self.process = subprocess.Popen(
+            ['bash', '-c', wrap_command(command)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+        self._eof = {'stdout': False, 'stderr': False}
+        for pipe in (self.process.stdout, self.process.stderr):
+            os.set_blocking(pipe.fileno(), False)
+
+    def _read(self, name):
+        pipe = getattr(self.process, name)
+        try:
+            data = os.read(pipe.fileno(), 4096)
+        except BlockingIOError:
+            return EAGAIN, b''
+        if not data:
+            self._eof[name] = True
+        return len(data), data
+
+    def read(self):
+        return self._read('stdout')
+
+    def read_stderr(self):
+        return self._read('stderr')
+
+    def eof(self):
+        return all(self._eof.values())
+
+    def get_exit_status(self):
+        return self.process.wait()
+
+
+def kill(pid):
+    os.killpg(pid, signal.SIGTERM)
+
+
+@pytest.fixture(autouse=True)
+def _fast_poll(monkeypatch):
+    monkeypatch.setattr(stream, 'POLL_INTERVAL', 0.01)
+
+
+def test_output_stream_lines():
+    lines = []
+    output = OutputStream('stdout', lines.append)
+    assert output.feed(b'one\ntw') is None
+    assert output.feed(b'o\r\nthr') is None
+    # a multi-byte character split between two chunks
+    assert output.feed('ée'.encode()[:1]) is None
+    assert output.feed('ée'.encode()[1:]) is None
+    assert output.flush() is None
+    assert lines == ['one', 'two', 'thrée']
+    assert output.text == 'one\ntwo\r\nthrée'
+
+
+def test_stream_channel():
+    stdout_lines, stderr_lines = [], []
+    stdout, stderr, status, aborted_by = stream_channel(
+        LocalChannel('echo one; echo oops >&2; sleep 0.1; printf two; exit 3'),
+        on_stdout=stdout_lines.append,
+        on_stderr=stderr_lines.append,
+        abort_patterns=['fatal'],
+        kill=kill,
+    )
+    assert (stdout, stderr, status, aborted_by) == ('one\ntwo', 'oops\n', 3, None)
+    assert stdout_lines == ['one', 'two']
+    assert stderr_lines == ['oops']
+
+
+def test_stream_channel_abort():
+    start = time.monotonic()
+    channel = LocalChannel('echo step 1; sleep 0.2; echo "Error: fatal" >&2; sleep 30 & wait')
+    stdout, stderr, status, aborted_by = stream_channel(
+        channel, abort_patterns=[r'^Error: f\w+'], kill=kill
+    )
+    assert time.monotonic() - start < 10
+    assert (stdout, stderr, status, aborted_by) == (
+        'step 1\n',
+        'Error: fatal\n',
+        None,
+        'Error: fatal',
+    )
+    # the whole process group was stopped, including the background sleep
+    assert channel.process.wait(timeout=10) == -signal.SIGTERM
+
+
+def test_stream_channel_timeout():
+    channel = LocalChannel('sleep 30')
+    with pytest.raises(TimeoutError):
+        stream_channel(channel, timeout=0.2, kill=kill)
+    assert channel.process.wait(timeout=10) == -signal.SIGTERM
@@ -0,0 +1,82 @@
+"""Tests for robottelo.utils.timings and the duration scheduling plugin"""
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from pytest_plugins.duration_scheduling import DurationScheduling
+from robottelo.utils.timings import TimingDB, TimingRecorder
+
+NODEIDS = [
+    'tests/test_a.py::test_1',
+    'tests/test_a.py::test_2',
+    'tests/test_b.py::test_1',
+    'tests/test_c.py::Test::test_1',
+    'tests/test_c.py::Test::test_2',
+]
+
+
+def report(nodeid, when, duration, skipped=False):
+    return SimpleNamespace(nodeid=nodeid, when=when, duration=duration, skipped=skipped)
+
+
+@pytest.fixture
+def db(tmp_path):
+    return TimingDB(tmp_path / 'timings.db')
+
+
+def test_moving_average(db):
+    db.record('tests/test_a.py::test_1', 'call', 10)
+    db.record('tests/test_a.py::test_1', 'call', 20)
+    db.record('tests/test_a.py::test_1', 'teardown', 1)
+    assert db.test_durations() == {'tests/test_a.py::test_1': 16}
+
+
+def test_recorder_module_costs(db):
+    recorder = TimingRecorder(db, module_costs=True)
+    for worker in ('gw0', 'gw1'):
+        for nodeid in NODEIDS[:2]:
+            recorder.add_report(report(nodeid, 'setup', 60 if nodeid == NODEIDS[0] else 1), worker)
+            recorder.add_report(report(nodeid, 'call', 5), worker)
+    recorder.add_report(report(NODEIDS[2], 'setup', 0, skipped=True), 'gw0')
+    assert db.module_costs() == {'tests/test_a.py': 60}
+    assert db.test_durations() == {NODEIDS[0]: 5, NODEIDS[1]: 6}
+
+
+def test_recorder_spread_modules(db):
+    """Without module grouped scheduling, every setup is kept as the setup of its test"""
+    recorder = TimingRecorder(db)
+    recorder.add_report(report(NODEIDS[0], 'setup', 60), 'gw0')
+    recorder.add_report(report(NODEIDS[2], 'setup', 2), 'gw0')
+    recorder.add_report(report(NODEIDS[1], 'setup', 1), 'gw0')
+    assert db.module_costs() == {}
+    assert db.test_durations() == {NODEIDS[0]: 60, NODEIDS[1]: 1, NODEIDS[2]: 2}
+
+
+def test_estimate_modules(db):
+    db.record_module('tests/test_c.py', 100)
+    db.record(NODEIDS[0], 'call', 30)
+    db.record(NODEIDS[1], 'call', 10)
+    db.record(NODEIDS[3], 'call', 20)
+    assert db.estimate_modules(NODEIDS) == {
+        'tests/test_a.py': 40,
+        # unknown tests count for the median of the known ones
+        'tests/test_b.py': 20,
+        'tests/test_c.py': 100 + 20 + 20,
+    }
+
+
+def test_longest_modules_first(db):
+    db.record(NODEIDS[2], 'call', 500)
+    db.record(NODEIDS[0], 'call', 1)
+    db.record(NODEIDS[3], 'call', 3)
+    config = mock.Mock()
+    config.getvalue.return_value = ['2*popen']
+    scheduler = DurationScheduling(config, db=db)
+    nodes = [mock.Mock(name=f'gw{i}') for i in range(2)]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, NODEIDS)
+    scheduler.schedule()
+    first_units = [node.send_runtest_some.call_args_list[0].args[0] for node in nodes]
+    assert first_units == [[2], [3, 4]]
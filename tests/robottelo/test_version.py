@@ -0,0 +1,75 @@
+"""Tests for the shared version cache"""
+from concurrent.futures import ProcessPoolExecutor
+import json
+
+from packaging.version import Version
+import pytest
+
+from robottelo.utils.version import VersionCache
+
+
+def resolve_in_process(path, counter):
+    """Resolve a version from another process, counting the times the resolver runs"""
+
+    def resolver():
+        with open(counter, 'a') as f:
+            f.write('resolved\n')
+        return Version('6.15.0')
+
+    return str(VersionCache(path).resolve('sat.example.com', 'sat_version', resolver))
+
+
+def test_resolve_once(tmp_path):
+    cache = VersionCache(tmp_path / 'versions.json')
+    calls = []
+
+    def resolver():
+        calls.append(1)
+        return Version('6.15.0')
+
+    assert cache.resolve('sat.example.com', 'sat_version', resolver) == Version('6.15.0')
+    assert cache.resolve('sat.example.com', 'sat_version', resolver) == Version('6.15.0')
+    assert VersionCache(tmp_path / 'versions.json').get('sat.example.com', 'sat_version') == (
+        Version('6.15.0')
+    )
+    assert len(calls) == 1
+    with pytest.raises(KeyError):
+        cache.get('other.example.com', 'sat_version')
+    with pytest.raises(KeyError):
+        cache.get('sat.example.com', 'rhel_version')
+
+
+def test_ttl(tmp_path, monkeypatch):
+    path = tmp_path / 'versions.json'
+    cache = VersionCache(path, ttl=60)
+    cache.set('sat.example.com', 'rhel_version', Version('9.2'))
+    contents = json.loads(path.read_text())
+    assert contents['sat.example.com']['rhel_version']['version'] == '9.2'
+    resolved = contents['sat.example.com']['rhel_version']['resolved']
+    monkeypatch.setattr('time.time', lambda: resolved + 59)
+    assert cache.get('sat.example.com', 'rhel_version') == Version('9.2')
+    monkeypatch.setattr('time.time', lambda: resolved + 60)
+    with pytest.raises(KeyError):
+        cache.get('sat.example.com', 'rhel_version')
+    # without ttl versions are kept forever
+    assert VersionCache(path, ttl=0).get('sat.example.com', 'rhel_version') == Version('9.2')
+
+
+def test_corrupted_file(tmp_path):
+    path = tmp_path / 'versions.json'
+    path.write_text('{"sat.example.com": ')
+    cache = VersionCache(path)
+    with pytest.raises(KeyError):
+        cache.get('sat.example.com', 'sat_version')
+    assert cache.resolve('sat.example.com', 'sat_version', lambda: Version('6.14')) == Version(
+        '6.14'
+    )
+
+
+def test_resolved_once_across_processes(tmp_path):
+    path = str(tmp_path / 'versions.json')
+    counter = tmp_path / 'counter'
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(resolve_in_process, [path] * 8, [str(counter)] * 8))
+    assert results == ['6.15.0'] * 8
+    assert counter.read_text() == 'resolved\n'